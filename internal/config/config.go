@@ -9,10 +9,16 @@ import (
 	"os/exec"
 	"path/filepath"
 	"regexp"
+	"strconv"
 	"strings"
 	"time"
 )
 
+var (
+	spaceLuaBlockPattern = regexp.MustCompile("(?s)```space-lua\\s*\\n(.*?)\\n```")
+	configSetPattern     = regexp.MustCompile(`config\.set\s*\(\s*["']([^"']+)["']\s*,\s*(.+?)\s*\)`)
+)
+
 // DenoRunner executes space-lua code using the Deno runtime.
 type DenoRunner struct {
 	denoPath   string
@@ -113,8 +119,7 @@ func ParseConfigPage(content string, useDeno bool, runner *DenoRunner) (map[stri
 
 // extractSpaceLuaBlocks extracts space-lua code blocks from markdown.
 func extractSpaceLuaBlocks(content string) []string {
-	pattern := regexp.MustCompile("(?s)```space-lua\\s*\\n(.*?)\\n```")
-	matches := pattern.FindAllStringSubmatch(content, -1)
+	matches := spaceLuaBlockPattern.FindAllStringSubmatch(content, -1)
 
 	var blocks []string
 	for _, m := range matches {
@@ -130,8 +135,7 @@ func parseConfigAST(luaCode string) (map[string]any, error) {
 
 	// Simple regex-based extraction for config.set("key", value)
 	// This handles basic cases but not computed values
-	pattern := regexp.MustCompile(`config\.set\s*\(\s*["']([^"']+)["']\s*,\s*(.+?)\s*\)`)
-	matches := pattern.FindAllStringSubmatch(luaCode, -1)
+	matches := configSetPattern.FindAllStringSubmatch(luaCode, -1)
 
 	for _, m := range matches {
 		key := m[1]
@@ -170,18 +174,16 @@ func parseValue(s string) any {
 		return s[1 : len(s)-1]
 	}
 
-	// Number (try int then float)
-	var intVal int
-	if _, err := fmt.Sscanf(s, "%d", &intVal); err == nil {
-		// Make sure it's actually just a number
-		if fmt.Sprintf("%d", intVal) == s {
-			return intVal
-		}
+	// Number (try int then float). The whole literal must parse, so an
+	// expression such as "10 * 60" is left unevaluated. ParseFloat also
+	// accepts "inf" and "nan", which in Lua are identifiers, not numbers.
+	if intVal, err := strconv.Atoi(s); err == nil && strconv.Itoa(intVal) == s {
+		return intVal
 	}
-
-	var floatVal float64
-	if _, err := fmt.Sscanf(s, "%f", &floatVal); err == nil {
-		return floatVal
+	if !strings.ContainsAny(s, "iInN") {
+		if floatVal, err := strconv.ParseFloat(s, 64); err == nil {
+			return floatVal
+		}
 	}
 
 	// Table (basic case: { key = value, ... })
@@ -49,6 +49,14 @@ func TestParseValueNumber(t *testing.T) {
 	}
 }
 
+func TestParseValueRejectsExpressions(t *testing.T) {
+	for _, input := range []string{"10 * 60", "1.5 + x", "inf", "-nan"} {
+		if result := parseValue(input); result != nil {
+			t.Errorf("parseValue(%q) = %v (%T), want nil", input, result, result)
+		}
+	}
+}
+
 func TestParseValueBoolean(t *testing.T) {
 	if parseValue("true") != true {
 		t.Error("parseValue('true') should return true")
@@ -298,18 +306,14 @@ config.set("editor.line_numbers", true)
 // ==================== WriteConfigJSON / LoadConfigJSON Tests ====================
 
 func TestWriteAndLoadConfigJSON(t *testing.T) {
-	tmpDir, err := os.MkdirTemp("", "test_config_")
-	if err != nil {
-		t.Fatalf("Failed to create temp dir: %v", err)
-	}
-	defer os.RemoveAll(tmpDir)
+	tmpDir := t.TempDir()
 
 	config := map[string]any{
 		"mcp.proposals.path_prefix": "_Proposals/",
 		"editor.theme":              "dark",
 	}
 
-	err = WriteConfigJSON(config, tmpDir)
+	err := WriteConfigJSON(config, tmpDir)
 	if err != nil {
 		t.Fatalf("WriteConfigJSON failed: %v", err)
 	}
@@ -325,29 +329,21 @@ func TestWriteAndLoadConfigJSON(t *testing.T) {
 }
 
 func TestLoadConfigJSONNonexistent(t *testing.T) {
-	tmpDir, err := os.MkdirTemp("", "test_config_")
-	if err != nil {
-		t.Fatalf("Failed to create temp dir: %v", err)
-	}
-	defer os.RemoveAll(tmpDir)
+	tmpDir := t.TempDir()
 
-	_, err = LoadConfigJSON(tmpDir)
+	_, err := LoadConfigJSON(tmpDir)
 	if err == nil {
 		t.Error("Expected error for nonexistent file")
 	}
 }
 
 func TestWriteConfigJSONCreatesParentDirs(t *testing.T) {
-	tmpDir, err := os.MkdirTemp("", "test_config_")
-	if err != nil {
-		t.Fatalf("Failed to create temp dir: %v", err)
-	}
-	defer os.RemoveAll(tmpDir)
+	tmpDir := t.TempDir()
 
 	dbPath := filepath.Join(tmpDir, "deeply", "nested", "path")
 
 	config := map[string]any{"key": "value"}
-	err = WriteConfigJSON(config, dbPath)
+	err := WriteConfigJSON(config, dbPath)
 	if err != nil {
 		t.Fatalf("WriteConfigJSON failed: %v", err)
 	}
@@ -452,9 +448,11 @@ func getTestDenoRunner(t *testing.T) *DenoRunner {
 
 // ==================== Deno Execution Tests ====================
 // These tests verify features that only work with actual Lua execution
-// via Deno, matching Python's TestDenoExecution class.
+// via Deno, matching Python's TestDenoExecution class. Each one starts a
+// Deno process, so they run in parallel.
 
 func TestDenoComputedValue(t *testing.T) {
+	t.Parallel()
 	runner := getTestDenoRunner(t)
 
 	config, err := runner.Execute(context.Background(), `
@@ -473,6 +471,7 @@ config.set("computed", x * 2)
 }
 
 func TestDenoLocalVariable(t *testing.T) {
+	t.Parallel()
 	runner := getTestDenoRunner(t)
 
 	config, err := runner.Execute(context.Background(), `
@@ -498,6 +497,7 @@ config.set("mcp.proposals.path_prefix", prefix)
 }
 
 func TestDenoStringConcatenation(t *testing.T) {
+	t.Parallel()
 	runner := getTestDenoRunner(t)
 
 	config, err := runner.Execute(context.Background(), `
@@ -515,6 +515,7 @@ config.set("feature", base .. suffix)
 }
 
 func TestDenoArithmeticOperations(t *testing.T) {
+	t.Parallel()
 	runner := getTestDenoRunner(t)
 
 	config, err := runner.Execute(context.Background(), `
@@ -543,6 +544,7 @@ config.set("subtraction", 100 - 42)
 }
 
 func TestDenoConditionalConfig(t *testing.T) {
+	t.Parallel()
 	runner := getTestDenoRunner(t)
 
 	config, err := runner.Execute(context.Background(), `
@@ -563,6 +565,7 @@ end
 }
 
 func TestDenoConditionalFalseBranch(t *testing.T) {
+	t.Parallel()
 	runner := getTestDenoRunner(t)
 
 	config, err := runner.Execute(context.Background(), `
@@ -583,6 +586,7 @@ end
 }
 
 func TestDenoFunctionDefinitionAndCall(t *testing.T) {
+	t.Parallel()
 	runner := getTestDenoRunner(t)
 
 	config, err := runner.Execute(context.Background(), `
@@ -616,6 +620,7 @@ config.set("logs.path", make_path("logs"))
 }
 
 func TestDenoTableConstruction(t *testing.T) {
+	t.Parallel()
 	runner := getTestDenoRunner(t)
 
 	config, err := runner.Execute(context.Background(), `
@@ -645,6 +650,7 @@ config.set("feature", settings)
 }
 
 func TestDenoParseConfigPageWithComputation(t *testing.T) {
+	t.Parallel()
 	runner := getTestDenoRunner(t)
 
 	content := "```space-lua\n" + `
@@ -664,6 +670,7 @@ config.set("computed", x * 2)
 }
 
 func TestDenoParseConfigPageCrossBlockReferences(t *testing.T) {
+	t.Parallel()
 	runner := getTestDenoRunner(t)
 
 	content := "```space-lua\n" + `
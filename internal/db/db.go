@@ -7,6 +7,7 @@ import (
 	"log/slog"
 	"os"
 	"path/filepath"
+	"sync/atomic"
 
 	lbug "github.com/LadybugDB/go-ladybug"
 )
@@ -22,6 +23,10 @@ type GraphDB struct {
 	readOnly         bool
 	enableEmbeddings bool
 	logger           *slog.Logger
+
+	// generation is bumped on every write so callers can tell when data
+	// they derived from earlier reads may be stale.
+	generation atomic.Uint64
 }
 
 // Config holds database configuration options.
@@ -196,8 +201,50 @@ func (g *GraphDB) initSchema() error {
 	return nil
 }
 
-// Execute runs a Cypher query and returns all results.
+// Execute runs a Cypher query and returns all results. Queries that may
+// modify data bump the generation, like ExecuteWrite.
 func (g *GraphDB) Execute(ctx context.Context, query string, params map[string]any) ([]Record, error) {
+	if !isReadOnlyQuery(query) {
+		defer g.generation.Add(1)
+	}
+	return g.execute(ctx, query, params)
+}
+
+// writeKeywords are the Cypher words that can appear in a query that
+// modifies data or schema, including inside procedure names such as
+// CREATE_FTS_INDEX.
+var writeKeywords = map[string]bool{
+	"CREATE": true, "MERGE": true, "SET": true, "DELETE": true,
+	"DETACH": true, "REMOVE": true, "DROP": true, "ALTER": true,
+	"COPY": true, "IMPORT": true, "INSTALL": true, "LOAD": true,
+	"ATTACH": true,
+}
+
+// isReadOnlyQuery reports whether query cannot modify data. It errs toward
+// false: a write keyword anywhere in the query, even inside a string
+// literal, makes it count as a write.
+func isReadOnlyQuery(query string) bool {
+	var word [7]byte // long enough for any write keyword
+	n := 0
+	for i := 0; i <= len(query); i++ {
+		if i < len(query) {
+			if c := query[i] &^ 0x20; c >= 'A' && c <= 'Z' {
+				if n < len(word) {
+					word[n] = c
+				}
+				n++
+				continue
+			}
+		}
+		if n > 0 && n <= len(word) && writeKeywords[string(word[:n])] {
+			return false
+		}
+		n = 0
+	}
+	return true
+}
+
+func (g *GraphDB) execute(ctx context.Context, query string, params map[string]any) ([]Record, error) {
 	var result *lbug.QueryResult
 	var err error
 
@@ -231,13 +278,14 @@ func (g *GraphDB) Execute(ctx context.Context, query string, params map[string]a
 			return nil, fmt.Errorf("convert row: %w", err)
 		}
 
-		// Convert lbug.Node and lbug.Relationship to maps for easier handling
-		convertedRow := make(Record)
+		// Convert lbug.Node and lbug.Relationship to maps for easier
+		// handling. The row map is freshly built per tuple, so values are
+		// replaced in place rather than copied into a second map.
 		for k, v := range row {
-			convertedRow[k] = convertLbugValue(v)
+			row[k] = convertLbugValue(v)
 		}
 
-		records = append(records, convertedRow)
+		records = append(records, Record(row))
 	}
 
 	return records, nil
@@ -248,7 +296,7 @@ func convertLbugValue(v any) any {
 	switch val := v.(type) {
 	case lbug.Node:
 		// Convert Node to map with properties + label
-		m := make(map[string]any)
+		m := make(map[string]any, len(val.Properties)+1)
 		for k, propVal := range val.Properties {
 			m[k] = convertLbugValue(propVal)
 		}
@@ -256,7 +304,7 @@ func convertLbugValue(v any) any {
 		return m
 	case lbug.Relationship:
 		// Convert Relationship to map with properties + label
-		m := make(map[string]any)
+		m := make(map[string]any, len(val.Properties)+1)
 		for k, propVal := range val.Properties {
 			m[k] = convertLbugValue(propVal)
 		}
@@ -276,10 +324,17 @@ func convertLbugValue(v any) any {
 
 // ExecuteWrite runs a Cypher query that modifies data.
 func (g *GraphDB) ExecuteWrite(ctx context.Context, query string, params map[string]any) error {
-	_, err := g.Execute(ctx, query, params)
+	defer g.generation.Add(1)
+	_, err := g.execute(ctx, query, params)
 	return err
 }
 
+// Generation returns a counter that changes whenever data is written
+// through ExecuteWrite or a modifying query through Execute.
+func (g *GraphDB) Generation() uint64 {
+	return g.generation.Load()
+}
+
 // Close closes the database connection.
 func (g *GraphDB) Close() error {
 	if g.conn != nil {
@@ -3,39 +3,83 @@ package db
 
 import (
 	"context"
+	"fmt"
+	"io"
+	"log/slog"
 	"os"
 	"path/filepath"
+	"sync"
 	"testing"
 
 	"github.com/boblangley/silverbullet-rag/internal/types"
 )
 
-// Helper function to create a temp db directory
-func createTempDB(t *testing.T) string {
-	t.Helper()
-	dir, err := os.MkdirTemp("", "test_db_")
-	if err != nil {
-		t.Fatalf("Failed to create temp dir: %v", err)
-	}
-	t.Cleanup(func() { os.RemoveAll(dir) })
-	return filepath.Join(dir, "test.lbug")
+// sharedTestDBs holds one database per embeddings setting, opened on first
+// use and reused by every test in the package.
+var sharedTestDBs struct {
+	mu  sync.Mutex
+	dir string
+	dbs map[bool]*GraphDB
 }
 
-// Helper to open a test database
+// openTestDB returns the shared test database for the embeddings setting,
+// cleared of any data left by earlier tests. Opening a database and
+// creating its schema costs far more than clearing one.
 func openTestDB(t *testing.T, enableEmbeddings bool) *GraphDB {
 	t.Helper()
-	dbPath := createTempDB(t)
+	shared := &sharedTestDBs
+	shared.mu.Lock()
+	defer shared.mu.Unlock()
+
+	if db, ok := shared.dbs[enableEmbeddings]; ok {
+		ctx := context.Background()
+		if err := db.ClearDatabase(ctx); err != nil {
+			t.Fatalf("Failed to clear database: %v", err)
+		}
+		// ClearDatabase only logs per-table failures; make sure nothing is
+		// left for this test to trip over
+		results, err := db.Execute(ctx, "MATCH (n) RETURN count(n) AS total", nil)
+		if err != nil {
+			t.Fatalf("Failed to count nodes: %v", err)
+		}
+		if total := results[0]["total"]; total != int64(0) {
+			t.Fatalf("Expected a cleared database, %v nodes remain", total)
+		}
+		return db
+	}
+
+	if shared.dir == "" {
+		dir, err := os.MkdirTemp("", "test_db_")
+		if err != nil {
+			t.Fatalf("Failed to create temp dir: %v", err)
+		}
+		shared.dir = dir
+		shared.dbs = make(map[bool]*GraphDB)
+	}
+
 	db, err := Open(Config{
-		Path:             dbPath,
+		Path:             filepath.Join(shared.dir, fmt.Sprintf("test_embeddings_%t.lbug", enableEmbeddings)),
 		EnableEmbeddings: enableEmbeddings,
+		Logger:           slog.New(slog.NewTextHandler(io.Discard, nil)),
 	})
 	if err != nil {
 		t.Fatalf("Failed to open database: %v", err)
 	}
-	t.Cleanup(func() { db.Close() })
+	shared.dbs[enableEmbeddings] = db
 	return db
 }
 
+func TestMain(m *testing.M) {
+	code := m.Run()
+	for _, db := range sharedTestDBs.dbs {
+		db.Close()
+	}
+	if sharedTestDBs.dir != "" {
+		os.RemoveAll(sharedTestDBs.dir)
+	}
+	os.Exit(code)
+}
+
 // ==================== Initialization Tests ====================
 
 func TestGraphDBInitialization(t *testing.T) {
@@ -162,6 +206,45 @@ func TestCypherQueryBasic(t *testing.T) {
 	}
 }
 
+func TestExecuteBumpsGenerationForWrites(t *testing.T) {
+	db := openTestDB(t, false)
+	ctx := context.Background()
+
+	before := db.Generation()
+	if _, err := db.Execute(ctx, "MATCH (c:Chunk) RETURN count(c) AS total", nil); err != nil {
+		t.Fatalf("Query failed: %v", err)
+	}
+	if db.Generation() != before {
+		t.Error("Expected a read-only query to leave the generation unchanged")
+	}
+
+	if _, err := db.Execute(ctx, "CREATE (t:Tag {name: 'written'})", nil); err != nil {
+		t.Fatalf("Query failed: %v", err)
+	}
+	if db.Generation() == before {
+		t.Error("Expected a write through Execute to bump the generation")
+	}
+}
+
+func TestIsReadOnlyQuery(t *testing.T) {
+	tests := map[string]bool{
+		"MATCH (c:Chunk) RETURN count(c) AS total":                   true,
+		"MATCH (c:Chunk) WHERE c.created_at > 1 RETURN c.offset":     true,
+		"CALL QUERY_FTS_INDEX('Chunk', 'idx', 'x') RETURN *":         true,
+		"match (n) detach delete n":                                  false,
+		"MATCH (n:Page) SET n.name = 'x'":                            false,
+		"MERGE (p:Page {name: 'a'})":                                 false,
+		"MATCH (n:Page) REMOVE n.name":                               false,
+		"CALL CREATE_FTS_INDEX('Chunk', 'idx', ['content'])":         false,
+		"MATCH (c:Chunk) WHERE c.content CONTAINS 'set' RETURN c.id": false,
+	}
+	for query, want := range tests {
+		if got := isReadOnlyQuery(query); got != want {
+			t.Errorf("isReadOnlyQuery(%q) = %v, want %v", query, got, want)
+		}
+	}
+}
+
 func TestCypherQueryWithParams(t *testing.T) {
 	db := openTestDB(t, false)
 	ctx := context.Background()
@@ -3,16 +3,24 @@ package embeddings
 
 import (
 	"bytes"
+	"cmp"
+	"container/list"
 	"context"
+	"crypto/sha256"
 	"encoding/json"
+	"errors"
 	"fmt"
+	"io"
+	"log/slog"
 	"net/http"
 	"os"
 	"path/filepath"
 	"regexp"
+	"slices"
 	"strings"
 	"sync"
 	"time"
+	"unicode/utf8"
 
 	"github.com/knights-analytics/hugot"
 	"github.com/knights-analytics/hugot/pipelines"
@@ -32,6 +40,41 @@ const (
 	LocalModelDim     = 384
 )
 
+// DefaultBatchSize is the number of texts sent to the provider per request.
+const DefaultBatchSize = 64
+
+// maxConcurrentRequests caps how many batch requests are sent to a remote
+// provider at once.
+const maxConcurrentRequests = 4
+
+// embeddingCacheSize is how many embeddings a Service keeps in memory, keyed
+// by the content they were generated from.
+const embeddingCacheSize = 1024
+
+// minTruncatedInputBytes is the size below which a text is never suspected
+// or shrunk when OpenAI rejects a request as over its 8191-token input
+// limit. Every token covers at least one byte, so a text this short always
+// fits.
+const minTruncatedInputBytes = 8191
+
+// errInputTooLong marks an OpenAI error for an input over the model's token
+// limit.
+var errInputTooLong = errors.New("input exceeds the model's token limit")
+
+// httpClient is shared by every Service so idle keep-alive connections to
+// the provider are reused across services rather than redialed per instance.
+var httpClient = &http.Client{
+	Timeout:   30 * time.Second,
+	Transport: newTransport(),
+}
+
+func newTransport() *http.Transport {
+	t := http.DefaultTransport.(*http.Transport).Clone()
+	t.MaxIdleConnsPerHost = 10
+	t.IdleConnTimeout = 60 * time.Second
+	return t
+}
+
 // Config holds embedding service configuration.
 type Config struct {
 	Provider  Provider
@@ -40,6 +83,8 @@ type Config struct {
 	BaseURL   string
 	CacheDir  string // Directory to cache local models
 	MaxLength int    // Max sequence length for local models
+	BatchSize int    // Texts per provider request (default DefaultBatchSize)
+	Logger    *slog.Logger
 }
 
 // Service generates text embeddings.
@@ -49,6 +94,8 @@ type Service struct {
 	session  *hugot.Session
 	pipeline *pipelines.FeatureExtractionPipeline
 	mu       sync.Mutex
+	cache    *embeddingCache
+	logger   *slog.Logger
 }
 
 // NewService creates a new embedding service.
@@ -59,10 +106,19 @@ func NewService(cfg Config) (*Service, error) {
 			cfg.Provider = ProviderOpenAI
 		}
 	}
+	if cfg.BatchSize <= 0 {
+		cfg.BatchSize = DefaultBatchSize
+	}
+	logger := cfg.Logger
+	if logger == nil {
+		logger = slog.Default()
+	}
 
 	svc := &Service{
 		config: cfg,
-		client: &http.Client{Timeout: 30 * time.Second},
+		client: httpClient,
+		cache:  newEmbeddingCache(embeddingCacheSize),
+		logger: logger,
 	}
 
 	switch cfg.Provider {
@@ -149,26 +205,162 @@ func (s *Service) Close() error {
 	return nil
 }
 
-// CleanContent removes SilverBullet syntax noise from text.
+// embeddingCache is a least-recently-used cache of embeddings keyed by the
+// SHA-256 of the text they were generated from. Cached slices are shared
+// with callers, who must not modify them. A nil cache stores nothing. It is
+// safe for concurrent use.
+type embeddingCache struct {
+	mu      sync.Mutex
+	maxSize int
+	order   *list.List // most recently used at the front
+	entries map[[sha256.Size]byte]*list.Element
+}
+
+type embeddingCacheEntry struct {
+	key       [sha256.Size]byte
+	embedding []float32
+}
+
+func newEmbeddingCache(maxSize int) *embeddingCache {
+	return &embeddingCache{
+		maxSize: maxSize,
+		order:   list.New(),
+		entries: make(map[[sha256.Size]byte]*list.Element),
+	}
+}
+
+// get returns the embedding stored for text and marks it most recently used.
+func (c *embeddingCache) get(text string) ([]float32, bool) {
+	if c == nil {
+		return nil, false
+	}
+	key := sha256.Sum256([]byte(text))
+
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	el, ok := c.entries[key]
+	if !ok {
+		return nil, false
+	}
+	c.order.MoveToFront(el)
+	return el.Value.(*embeddingCacheEntry).embedding, true
+}
+
+// put stores the embedding for text, evicting the least recently used entry
+// once the cache is full.
+func (c *embeddingCache) put(text string, embedding []float32) {
+	if c == nil {
+		return
+	}
+	key := sha256.Sum256([]byte(text))
+
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	if el, ok := c.entries[key]; ok {
+		el.Value.(*embeddingCacheEntry).embedding = embedding
+		c.order.MoveToFront(el)
+		return
+	}
+	c.entries[key] = c.order.PushFront(&embeddingCacheEntry{key: key, embedding: embedding})
+	if c.order.Len() > c.maxSize {
+		oldest := c.order.Back()
+		c.order.Remove(oldest)
+		delete(c.entries, oldest.Value.(*embeddingCacheEntry).key)
+	}
+}
+
+// Patterns used by CleanContent, compiled once.
+var (
+	frontmatterDelimPattern = regexp.MustCompile(`(?m)^---\s*$`)
+	// [[page|alias]] captures the alias in $2, [[page]] the page in $3
+	wikilinkPattern = regexp.MustCompile(`\[\[(?:([^\]|]+)\|([^\]]+)|([^\]]+))\]\]`)
+	tagPattern      = regexp.MustCompile(`#(\w+)`)
+	mentionPattern  = regexp.MustCompile(`@(\w+)`)
+)
+
+// CleanContent removes SilverBullet syntax noise from text. Each pattern is
+// only run when the text contains the literal it needs to match, which a
+// plain substring scan checks far more cheaply than the regexp engine.
 func CleanContent(text string) string {
 	// Remove front matter delimiters
-	text = regexp.MustCompile(`(?m)^---\s*$`).ReplaceAllString(text, "")
+	if strings.Contains(text, "---") {
+		text = frontmatterDelimPattern.ReplaceAllString(text, "")
+	}
 
 	// Convert wikilinks: [[page|alias]] -> alias, [[page]] -> page
-	text = regexp.MustCompile(`\[\[([^\]|]+)\|([^\]]+)\]\]`).ReplaceAllString(text, "$2")
-	text = regexp.MustCompile(`\[\[([^\]]+)\]\]`).ReplaceAllString(text, "$1")
+	if strings.Contains(text, "[[") {
+		text = wikilinkPattern.ReplaceAllString(text, "$2$3")
+	}
 
 	// Remove SilverBullet attributes
-	text = regexp.MustCompile(`#(\w+)`).ReplaceAllString(text, "$1")
-	text = regexp.MustCompile(`@(\w+)`).ReplaceAllString(text, "$1")
+	if strings.IndexByte(text, '#') >= 0 {
+		text = tagPattern.ReplaceAllString(text, "$1")
+	}
+	if strings.IndexByte(text, '@') >= 0 {
+		text = mentionPattern.ReplaceAllString(text, "$1")
+	}
 
 	// Normalize whitespace
-	text = regexp.MustCompile(`\n\s*\n\s*\n+`).ReplaceAllString(text, "\n\n")
-	text = regexp.MustCompile(` +`).ReplaceAllString(text, " ")
+	if strings.Count(text, "\n") >= 3 {
+		text = collapseBlankLines(text)
+	}
+	if strings.Contains(text, "  ") {
+		text = collapseSpaces(text)
+	}
 
 	return strings.TrimSpace(text)
 }
 
+// isSpace reports whether c is whitespace as matched by the regexp \s class.
+func isSpace(c byte) bool {
+	return c == ' ' || c == '\t' || c == '\n' || c == '\f' || c == '\r'
+}
+
+// collapseBlankLines replaces each whitespace run holding three or more
+// newlines, from its first newline to its last, with a single blank line.
+// It is equivalent to replacing `\n\s*\n\s*\n+` with "\n\n".
+func collapseBlankLines(text string) string {
+	var b strings.Builder
+	b.Grow(len(text))
+	for i := 0; i < len(text); {
+		if text[i] != '\n' {
+			b.WriteByte(text[i])
+			i++
+			continue
+		}
+		newlines, last, j := 0, i, i
+		for ; j < len(text) && isSpace(text[j]); j++ {
+			if text[j] == '\n' {
+				newlines++
+				last = j
+			}
+		}
+		if newlines >= 3 {
+			b.WriteString("\n\n")
+			i = last + 1
+		} else {
+			b.WriteString(text[i:j])
+			i = j
+		}
+	}
+	return b.String()
+}
+
+// collapseSpaces replaces each run of spaces with a single space.
+func collapseSpaces(text string) string {
+	var b strings.Builder
+	b.Grow(len(text))
+	for i := 0; i < len(text); i++ {
+		if text[i] == ' ' && i > 0 && text[i-1] == ' ' {
+			continue
+		}
+		b.WriteByte(text[i])
+	}
+	return b.String()
+}
+
 // GenerateEmbedding generates an embedding for a single text.
 func (s *Service) GenerateEmbedding(ctx context.Context, text string, clean bool) ([]float32, error) {
 	if clean {
@@ -179,11 +371,16 @@ func (s *Service) GenerateEmbedding(ctx context.Context, text string, clean bool
 		return make([]float32, s.GetDimension()), nil
 	}
 
+	if embedding, ok := s.cache.get(text); ok {
+		return embedding, nil
+	}
+
 	embeddings, err := s.generateEmbeddings(ctx, []string{text})
 	if err != nil {
 		return nil, err
 	}
 
+	s.cache.put(text, embeddings[0])
 	return embeddings[0], nil
 }
 
@@ -197,38 +394,59 @@ func (s *Service) GenerateEmbeddingsBatch(ctx context.Context, texts []string, c
 		texts = cleaned
 	}
 
-	// Track which texts are valid
-	validTexts := make([]string, 0, len(texts))
-	validIndices := make([]int, 0, len(texts))
+	// Empty texts get zero vectors and cached texts their stored embedding.
+	// Each remaining distinct text is sent to the provider once.
+	result := make([][]float32, len(texts))
+	dim := s.GetDimension()
+	empty := make([]bool, len(texts))
+	numEmpty := 0
 	for i, t := range texts {
-		if strings.TrimSpace(t) != "" {
-			validTexts = append(validTexts, t)
-			validIndices = append(validIndices, i)
+		if strings.TrimSpace(t) == "" {
+			empty[i] = true
+			numEmpty++
 		}
 	}
+	// One allocation backs every zero vector
+	zeros := make([]float32, dim*numEmpty)
 
-	if len(validTexts) == 0 {
-		result := make([][]float32, len(texts))
-		dim := s.GetDimension()
-		for i := range result {
-			result[i] = make([]float32, dim)
+	var pending []string
+	slots := make([]int, len(texts)) // index into pending, or -1
+	seen := make(map[string]int)
+	for i, t := range texts {
+		slots[i] = -1
+		if empty[i] {
+			result[i] = zeros[:dim:dim]
+			zeros = zeros[dim:]
+			continue
+		}
+		if embedding, ok := s.cache.get(t); ok {
+			result[i] = embedding
+			continue
+		}
+		j, ok := seen[t]
+		if !ok {
+			j = len(pending)
+			seen[t] = j
+			pending = append(pending, t)
 		}
+		slots[i] = j
+	}
+
+	if len(pending) == 0 {
 		return result, nil
 	}
 
-	validEmbeddings, err := s.generateEmbeddings(ctx, validTexts)
+	embeddings, err := s.generateEmbeddings(ctx, pending)
 	if err != nil {
 		return nil, err
 	}
-
-	// Build result with zero vectors for empty texts
-	result := make([][]float32, len(texts))
-	dim := s.GetDimension()
-	for i := range result {
-		result[i] = make([]float32, dim)
+	for j, t := range pending {
+		s.cache.put(t, embeddings[j])
 	}
-	for i, embedding := range validEmbeddings {
-		result[validIndices[i]] = embedding
+	for i, j := range slots {
+		if j >= 0 {
+			result[i] = embeddings[j]
+		}
 	}
 
 	return result, nil
@@ -272,7 +490,103 @@ func (s *Service) GetModel() string {
 	return s.config.Model
 }
 
+// generateEmbeddings embeds texts in batches of the configured size, so a
+// whole space can be embedded without exceeding provider request limits or
+// running the local model over every chunk at once. Texts are sent shortest
+// first so each batch holds texts of similar length: the local model pads
+// every text in a batch to the longest one.
 func (s *Service) generateEmbeddings(ctx context.Context, texts []string) ([][]float32, error) {
+	if len(texts) < 2 {
+		return s.generateBatches(ctx, texts)
+	}
+
+	order := make([]int, len(texts))
+	for i := range order {
+		order[i] = i
+	}
+	slices.SortStableFunc(order, func(a, b int) int {
+		return cmp.Compare(len(texts[a]), len(texts[b]))
+	})
+	sorted := make([]string, len(texts))
+	for i, j := range order {
+		sorted[i] = texts[j]
+	}
+
+	embeddings, err := s.generateBatches(ctx, sorted)
+	if err != nil {
+		return nil, err
+	}
+	result := make([][]float32, len(texts))
+	for i, j := range order {
+		result[j] = embeddings[i]
+	}
+	return result, nil
+}
+
+// generateBatches embeds texts in order, splitting them into batches of at
+// most BatchSize.
+func (s *Service) generateBatches(ctx context.Context, texts []string) ([][]float32, error) {
+	batchSize := s.config.BatchSize
+	if batchSize <= 0 || len(texts) <= batchSize {
+		return s.generateEmbeddingsBatch(ctx, texts)
+	}
+
+	// Provider requests are mostly network latency, so several are kept in
+	// flight at once. The local pipeline runs one batch at a time anyway.
+	workers := 1
+	if s.config.Provider == ProviderOpenAI {
+		workers = maxConcurrentRequests
+	}
+
+	ctx, cancel := context.WithCancel(ctx)
+	defer cancel()
+
+	batches := make([][][]float32, (len(texts)+batchSize-1)/batchSize)
+	sem := make(chan struct{}, workers)
+	var wg sync.WaitGroup
+	var errOnce sync.Once
+	var firstErr error
+	for b := range batches {
+		sem <- struct{}{}
+		if ctx.Err() != nil {
+			break // a batch failed; don't start more
+		}
+		start := b * batchSize
+		end := min(start+batchSize, len(texts))
+
+		wg.Add(1)
+		go func(b int, batch []string) {
+			defer func() {
+				<-sem
+				wg.Done()
+			}()
+			embeddings, err := s.generateEmbeddingsBatch(ctx, batch)
+			if err != nil {
+				errOnce.Do(func() {
+					firstErr = err
+					cancel()
+				})
+				return
+			}
+			batches[b] = embeddings
+		}(b, texts[start:end])
+	}
+	wg.Wait()
+	if firstErr != nil {
+		return nil, firstErr
+	}
+	if err := ctx.Err(); err != nil {
+		return nil, err
+	}
+
+	embeddings := make([][]float32, 0, len(texts))
+	for _, batch := range batches {
+		embeddings = append(embeddings, batch...)
+	}
+	return embeddings, nil
+}
+
+func (s *Service) generateEmbeddingsBatch(ctx context.Context, texts []string) ([][]float32, error) {
 	switch s.config.Provider {
 	case ProviderOpenAI:
 		return s.generateOpenAIEmbeddings(ctx, texts)
@@ -301,7 +615,65 @@ func (s *Service) generateLocalEmbeddings(ctx context.Context, texts []string) (
 	return batchResult.Embeddings, nil
 }
 
+// generateOpenAIEmbeddings sends texts to OpenAI as they are. If OpenAI
+// rejects the request as over the model's token limit, the texts that may be
+// too long are sent again one at a time, so only those that fail on their own
+// are truncated; there is no tokenizer to count tokens with up front.
 func (s *Service) generateOpenAIEmbeddings(ctx context.Context, texts []string) ([][]float32, error) {
+	embeddings, err := s.requestOpenAIEmbeddings(ctx, texts)
+	if !errors.Is(err, errInputTooLong) {
+		return embeddings, err
+	}
+
+	embeddings = make([][]float32, len(texts))
+	var short []string
+	var shortIdx []int
+	for i, text := range texts {
+		if len(text) <= minTruncatedInputBytes {
+			short = append(short, text)
+			shortIdx = append(shortIdx, i)
+			continue
+		}
+		embedding, err := s.embedLongInput(ctx, text)
+		if err != nil {
+			return nil, err
+		}
+		embeddings[i] = embedding
+	}
+
+	if len(short) > 0 {
+		shortEmbeddings, err := s.requestOpenAIEmbeddings(ctx, short)
+		if err != nil {
+			return nil, err
+		}
+		for j, i := range shortIdx {
+			embeddings[i] = shortEmbeddings[j]
+		}
+	}
+	return embeddings, nil
+}
+
+// embedLongInput embeds a single text, shrinking it until OpenAI accepts it
+// as within the model's token limit.
+func (s *Service) embedLongInput(ctx context.Context, text string) ([]float32, error) {
+	input := text
+	for {
+		embeddings, err := s.requestOpenAIEmbeddings(ctx, []string{input})
+		if err == nil {
+			if len(input) < len(text) {
+				s.logger.Warn("truncated embedding input over the model's token limit",
+					"model", s.config.Model, "bytes", len(text), "truncated_bytes", len(input))
+			}
+			return embeddings[0], nil
+		}
+		if !errors.Is(err, errInputTooLong) || len(input) <= minTruncatedInputBytes {
+			return nil, err
+		}
+		input = shrinkInput(input, minTruncatedInputBytes)
+	}
+}
+
+func (s *Service) requestOpenAIEmbeddings(ctx context.Context, texts []string) ([][]float32, error) {
 	reqBody := map[string]any{
 		"model": s.config.Model,
 		"input": texts,
@@ -323,15 +695,25 @@ func (s *Service) generateOpenAIEmbeddings(ctx context.Context, texts []string)
 	if err != nil {
 		return nil, fmt.Errorf("send request: %w", err)
 	}
-	defer resp.Body.Close()
+	defer func() {
+		// Drain what the decoder left unread so the connection can be reused
+		_, _ = io.Copy(io.Discard, resp.Body)
+		resp.Body.Close()
+	}()
 
 	if resp.StatusCode != http.StatusOK {
 		var errResp struct {
 			Error struct {
 				Message string `json:"message"`
+				Code    string `json:"code"`
 			} `json:"error"`
 		}
 		_ = json.NewDecoder(resp.Body).Decode(&errResp)
+		if resp.StatusCode == http.StatusBadRequest &&
+			(errResp.Error.Code == "context_length_exceeded" ||
+				strings.Contains(errResp.Error.Message, "maximum context length")) {
+			return nil, fmt.Errorf("OpenAI API error (%d): %s: %w", resp.StatusCode, errResp.Error.Message, errInputTooLong)
+		}
 		return nil, fmt.Errorf("OpenAI API error (%d): %s", resp.StatusCode, errResp.Error.Message)
 	}
 
@@ -353,3 +735,13 @@ func (s *Service) generateOpenAIEmbeddings(ctx context.Context, texts []string)
 
 	return embeddings, nil
 }
+
+// shrinkInput cuts text to three quarters of its length, but not below
+// minBytes, on a UTF-8 boundary.
+func shrinkInput(text string, minBytes int) string {
+	cut := max(len(text)*3/4, minBytes)
+	for cut > 0 && !utf8.RuneStart(text[cut]) {
+		cut--
+	}
+	return text[:cut]
+}
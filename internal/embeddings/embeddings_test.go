@@ -3,17 +3,35 @@ package embeddings
 
 import (
 	"bufio"
+	"bytes"
 	"context"
+	"encoding/json"
+	"fmt"
+	"log/slog"
 	"math"
+	"net/http"
+	"net/http/httptest"
 	"os"
+	"slices"
 	"strings"
+	"sync"
 	"testing"
+	"time"
 )
 
+// envFileOnce guards loadEnvFile so the .env file is read once per test
+// binary rather than once per test.
+var envFileOnce sync.Once
+
 // loadEnvFile loads environment variables from a .env file.
 func loadEnvFile(t *testing.T) {
 	t.Helper()
+	envFileOnce.Do(readEnvFile)
+}
 
+// readEnvFile sets variables from the first .env file found that are not
+// already set in the environment.
+func readEnvFile() {
 	// Try to find .env file in project root
 	envPaths := []string{
 		"../../.env",
@@ -60,78 +78,75 @@ func loadEnvFile(t *testing.T) {
 // ==================== Content Cleaning Tests ====================
 // These match the Python TestEmbeddingServiceLocal cleaning tests
 
-func TestCleanContentRemovesWikilinks(t *testing.T) {
-	text := "This has [[wikilink]] and [[page|alias]] references."
-	cleaned := CleanContent(text)
-
-	if strings.Contains(cleaned, "[[") {
-		t.Error("cleaned content should not contain [[")
-	}
-	if strings.Contains(cleaned, "]]") {
-		t.Error("cleaned content should not contain ]]")
-	}
-	if !strings.Contains(cleaned, "wikilink") {
-		t.Error("cleaned content should contain 'wikilink'")
-	}
-	if !strings.Contains(cleaned, "alias") {
-		t.Error("cleaned content should contain 'alias'")
-	}
-	if strings.Contains(cleaned, "page|alias") {
-		t.Error("cleaned content should not contain 'page|alias'")
-	}
-}
-
-func TestCleanContentRemovesTags(t *testing.T) {
-	text := "This has #tag and #another-tag references."
-	cleaned := CleanContent(text)
-
-	if strings.Contains(cleaned, "#tag") {
-		t.Error("cleaned content should not contain '#tag'")
-	}
-	if !strings.Contains(cleaned, "tag") {
-		t.Error("cleaned content should contain 'tag'")
-	}
-}
-
-func TestCleanContentRemovesMentions(t *testing.T) {
-	text := "Hello @user and @another."
-	cleaned := CleanContent(text)
-
-	if strings.Contains(cleaned, "@user") {
-		t.Error("cleaned content should not contain '@user'")
-	}
-	if !strings.Contains(cleaned, "user") {
-		t.Error("cleaned content should contain 'user'")
-	}
-	if !strings.Contains(cleaned, "another") {
-		t.Error("cleaned content should contain 'another'")
+func TestCleanContent(t *testing.T) {
+	tests := []struct {
+		name      string
+		text      string
+		forbidden []string
+		required  []string
+	}{
+		{
+			name:      "wikilinks",
+			text:      "This has [[wikilink]] and [[page|alias]] references.",
+			forbidden: []string{"[[", "]]", "page|alias"},
+			required:  []string{"wikilink", "alias"},
+		},
+		{
+			name:      "tags",
+			text:      "This has #tag and #another-tag references.",
+			forbidden: []string{"#tag"},
+			required:  []string{"tag"},
+		},
+		{
+			name:      "mentions",
+			text:      "Hello @user and @another.",
+			forbidden: []string{"@user"},
+			required:  []string{"user", "another"},
+		},
+		{
+			name:      "front matter",
+			text:      "---\ntitle: Test\n---\nContent here",
+			forbidden: []string{"---"},
+			required:  []string{"Content here"},
+		},
+		{
+			name:      "whitespace",
+			text:      "This  has    multiple   spaces\n\n\n\nand newlines",
+			forbidden: []string{"  ", "\n\n\n"},
+		},
 	}
-}
 
-func TestCleanContentRemovesFrontMatter(t *testing.T) {
-	text := `---
-title: Test
----
-Content here`
-	cleaned := CleanContent(text)
-
-	if strings.Contains(cleaned, "---") {
-		t.Error("cleaned content should not contain '---'")
-	}
-	if !strings.Contains(cleaned, "Content here") {
-		t.Error("cleaned content should contain 'Content here'")
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			cleaned := CleanContent(tt.text)
+			for _, s := range tt.forbidden {
+				if strings.Contains(cleaned, s) {
+					t.Errorf("cleaned content should not contain %q, got %q", s, cleaned)
+				}
+			}
+			for _, s := range tt.required {
+				if !strings.Contains(cleaned, s) {
+					t.Errorf("cleaned content should contain %q, got %q", s, cleaned)
+				}
+			}
+		})
 	}
 }
 
-func TestCleanContentNormalizesWhitespace(t *testing.T) {
-	text := "This  has    multiple   spaces\n\n\n\nand newlines"
-	cleaned := CleanContent(text)
-
-	if strings.Contains(cleaned, "  ") {
-		t.Error("cleaned content should not contain double spaces")
+func TestCollapseBlankLines(t *testing.T) {
+	tests := []struct {
+		in, want string
+	}{
+		{"a\n\nb", "a\n\nb"},
+		{"a\n\n\nb", "a\n\nb"},
+		{"a \n \t\n\r\n  b", "a \n\n  b"},
+		{"a\n \n\v\nb", "a\n \n\v\nb"},
+		{"\n\n\n\n", "\n\n"},
 	}
-	if strings.Contains(cleaned, "\n\n\n") {
-		t.Error("cleaned content should not contain triple newlines")
+	for _, tt := range tests {
+		if got := collapseBlankLines(tt.in); got != tt.want {
+			t.Errorf("collapseBlankLines(%q) = %q, want %q", tt.in, got, tt.want)
+		}
 	}
 }
 
@@ -236,6 +251,27 @@ func TestInitializationWithoutAPIKeyForOpenAI(t *testing.T) {
 // These tests require OPENAI_API_KEY environment variable
 // Match Python TestEmbeddingServiceOpenAI tests
 
+// openAIService returns an OpenAI embedding service using the key from the
+// environment or .env file, skipping the test when no key is set.
+func openAIService(t *testing.T) *Service {
+	t.Helper()
+	loadEnvFile(t)
+
+	apiKey := os.Getenv("OPENAI_API_KEY")
+	if apiKey == "" {
+		t.Skip("OPENAI_API_KEY not set, skipping integration test")
+	}
+
+	svc, err := NewService(Config{
+		Provider: ProviderOpenAI,
+		APIKey:   apiKey,
+	})
+	if err != nil {
+		t.Fatalf("Failed to create service: %v", err)
+	}
+	return svc
+}
+
 func TestGenerateEmbeddingOpenAI(t *testing.T) {
 	loadEnvFile(t)
 
@@ -279,20 +315,7 @@ func TestGenerateEmbeddingOpenAI(t *testing.T) {
 }
 
 func TestGenerateEmbeddingsBatchOpenAI(t *testing.T) {
-	loadEnvFile(t)
-
-	apiKey := os.Getenv("OPENAI_API_KEY")
-	if apiKey == "" {
-		t.Skip("OPENAI_API_KEY not set, skipping integration test")
-	}
-
-	svc, err := NewService(Config{
-		Provider: ProviderOpenAI,
-		APIKey:   apiKey,
-	})
-	if err != nil {
-		t.Fatalf("Failed to create service: %v", err)
-	}
+	svc := openAIService(t)
 
 	ctx := context.Background()
 
@@ -314,51 +337,471 @@ func TestGenerateEmbeddingsBatchOpenAI(t *testing.T) {
 	}
 }
 
-func TestGenerateEmbeddingWithCleaning(t *testing.T) {
-	loadEnvFile(t)
+// fakeEmbeddingJSON is a 1536-dimension embedding, encoded once and served
+// by fakeOpenAIService for every text it has no other embedding for.
+var fakeEmbeddingJSON = func() []byte {
+	embedding := make([]float32, 1536)
+	for i := range embedding {
+		embedding[i] = 0.1
+	}
+	data, _ := json.Marshal(embedding)
+	return data
+}()
+
+// fakeOpenAI configures the fake server behind fakeOpenAIService. Every
+// hook is optional and may be called concurrently.
+type fakeOpenAI struct {
+	batchSize int
+	// onRequest is passed each request's texts, and may block.
+	onRequest func(texts []string)
+	// reject returns an error message to fail a request with, as a 400
+	// response, or "" to answer it.
+	reject func(texts []string) string
+	// embed returns a text's JSON embedding; fakeEmbeddingJSON by default.
+	embed func(text string) string
+}
 
-	apiKey := os.Getenv("OPENAI_API_KEY")
-	if apiKey == "" {
-		t.Skip("OPENAI_API_KEY not set, skipping integration test")
-	}
+// fakeOpenAIService returns an OpenAI service backed by a fake server
+// configured by fake. Requests whose input is not a list of texts fail the
+// test.
+func fakeOpenAIService(t *testing.T, fake fakeOpenAI) *Service {
+	t.Helper()
+	api := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		var req struct {
+			Input []string `json:"input"`
+		}
+		if err := json.NewDecoder(r.Body).Decode(&req); err != nil {
+			t.Errorf("failed to decode request: %v", err)
+		}
+		if fake.onRequest != nil {
+			fake.onRequest(req.Input)
+		}
+
+		w.Header().Set("Content-Type", "application/json")
+		if fake.reject != nil {
+			if message := fake.reject(req.Input); message != "" {
+				w.WriteHeader(http.StatusBadRequest)
+				data, _ := json.Marshal(map[string]any{"error": map[string]any{"message": message}})
+				_, _ = w.Write(data)
+				return
+			}
+		}
+
+		var b bytes.Buffer
+		b.WriteString(`{"data": [`)
+		for i, text := range req.Input {
+			if i > 0 {
+				b.WriteByte(',')
+			}
+			embedding := fakeEmbeddingJSON
+			if fake.embed != nil {
+				embedding = []byte(fake.embed(text))
+			}
+			fmt.Fprintf(&b, `{"embedding": %s, "index": %d}`, embedding, i)
+		}
+		b.WriteString(`]}`)
+		_, _ = w.Write(b.Bytes())
+	}))
+	t.Cleanup(api.Close)
 
 	svc, err := NewService(Config{
-		Provider: ProviderOpenAI,
-		APIKey:   apiKey,
+		Provider:  ProviderOpenAI,
+		APIKey:    "test",
+		BaseURL:   api.URL,
+		BatchSize: fake.batchSize,
 	})
 	if err != nil {
 		t.Fatalf("Failed to create service: %v", err)
 	}
+	return svc
+}
+
+// requestRecorder records the size of every request a fake server receives.
+// It is safe for concurrent use.
+type requestRecorder struct {
+	mu    sync.Mutex
+	sizes []int
+}
+
+func (r *requestRecorder) record(texts []string) {
+	r.mu.Lock()
+	defer r.mu.Unlock()
+	r.sizes = append(r.sizes, len(texts))
+}
+
+// total returns the number of texts received across all requests.
+func (r *requestRecorder) total() int {
+	r.mu.Lock()
+	defer r.mu.Unlock()
+	n := 0
+	for _, size := range r.sizes {
+		n += size
+	}
+	return n
+}
+
+// concurrencyProbe holds each request until want are in flight at once, or
+// two seconds pass, and records the most seen in flight together.
+type concurrencyProbe struct {
+	want     int
+	mu       sync.Mutex
+	inFlight int
+	peak     int
+	full     chan struct{}
+	fullOnce sync.Once
+}
+
+func newConcurrencyProbe(want int) *concurrencyProbe {
+	return &concurrencyProbe{want: want, full: make(chan struct{})}
+}
+
+func (p *concurrencyProbe) hold([]string) {
+	p.mu.Lock()
+	p.inFlight++
+	p.peak = max(p.peak, p.inFlight)
+	if p.inFlight == p.want {
+		p.fullOnce.Do(func() { close(p.full) })
+	}
+	p.mu.Unlock()
+
+	select {
+	case <-p.full:
+	case <-time.After(2 * time.Second):
+	}
+
+	p.mu.Lock()
+	p.inFlight--
+	p.mu.Unlock()
+}
+
+func TestGenerateEmbeddingsBatchSkipsEmptyTextsOffline(t *testing.T) {
+	var requests requestRecorder
+	svc := fakeOpenAIService(t, fakeOpenAI{onRequest: requests.record})
+
+	embeddings, err := svc.GenerateEmbeddingsBatch(context.Background(), []string{"", "text 2", ""}, false)
+	if err != nil {
+		t.Fatalf("GenerateEmbeddingsBatch failed: %v", err)
+	}
+
+	if inputs := requests.total(); inputs != 1 {
+		t.Errorf("Expected only the non-empty text to be sent, got %d inputs", inputs)
+	}
+	if len(embeddings) != 3 {
+		t.Fatalf("Expected 3 embeddings, got %d", len(embeddings))
+	}
+	for _, i := range []int{0, 2} {
+		for _, v := range embeddings[i] {
+			if v != 0 {
+				t.Errorf("Embedding %d for empty text should be all zeros", i)
+				break
+			}
+		}
+	}
+	if len(embeddings[1]) != 1536 || embeddings[1][0] != 0.1 {
+		t.Errorf("Expected the served embedding for the non-empty text, got %d dimensions", len(embeddings[1]))
+	}
+}
+
+func TestGenerateEmbeddingIsCachedByContent(t *testing.T) {
+	var requests requestRecorder
+	svc := fakeOpenAIService(t, fakeOpenAI{onRequest: requests.record})
 
 	ctx := context.Background()
+	for i := 0; i < 2; i++ {
+		if _, err := svc.GenerateEmbedding(ctx, "hello world", false); err != nil {
+			t.Fatalf("GenerateEmbedding failed: %v", err)
+		}
+	}
+	if inputs := requests.total(); inputs != 1 {
+		t.Errorf("Expected one text sent for repeated content, got %d", inputs)
+	}
 
-	// Test with SilverBullet content that needs cleaning
-	content := "Content with [[wikilink]] and #tag"
-	embedding, err := svc.GenerateEmbedding(ctx, content, true)
+	// Cached and repeated texts are not sent again in a batch
+	embeddings, err := svc.GenerateEmbeddingsBatch(ctx, []string{"hello world", "new text", "new text"}, false)
+	if err != nil {
+		t.Fatalf("GenerateEmbeddingsBatch failed: %v", err)
+	}
+	if inputs := requests.total(); inputs != 2 {
+		t.Errorf("Expected only the one new text to be sent, got %d texts in total", inputs)
+	}
+	for i, embedding := range embeddings {
+		if len(embedding) != 1536 {
+			t.Errorf("Embedding %d: expected 1536 dimensions, got %d", i, len(embedding))
+		}
+	}
+}
+
+func TestEmbeddingCacheEvictsLeastRecentlyUsed(t *testing.T) {
+	cache := newEmbeddingCache(2)
+	cache.put("a", []float32{1})
+	cache.put("b", []float32{2})
+	cache.get("a")
+	cache.put("c", []float32{3})
+
+	if _, ok := cache.get("b"); ok {
+		t.Error("Least recently used entry should have been evicted")
+	}
+	for _, text := range []string{"a", "c"} {
+		if _, ok := cache.get(text); !ok {
+			t.Errorf("Entry %q should still be cached", text)
+		}
+	}
+}
+
+func TestGenerateEmbeddingsBatchSplitsRequests(t *testing.T) {
+	// Echo each text's number back as its embedding
+	var requests requestRecorder
+	svc := fakeOpenAIService(t, fakeOpenAI{
+		batchSize: 4,
+		onRequest: requests.record,
+		embed: func(text string) string {
+			return "[" + strings.TrimPrefix(text, "text ") + "]"
+		},
+	})
+
+	texts := make([]string, 10)
+	for i := range texts {
+		texts[i] = fmt.Sprintf("text %d", i)
+	}
+
+	embeddings, err := svc.GenerateEmbeddingsBatch(context.Background(), texts, false)
 	if err != nil {
+		t.Fatalf("GenerateEmbeddingsBatch failed: %v", err)
+	}
+
+	// Requests run concurrently, so they may arrive in any order
+	slices.Sort(requests.sizes)
+	if fmt.Sprint(requests.sizes) != "[2 4 4]" {
+		t.Errorf("Expected requests of 4, 4 and 2 texts, got %v", requests.sizes)
+	}
+	for i, embedding := range embeddings {
+		if len(embedding) != 1 || embedding[0] != float32(i) {
+			t.Errorf("Embedding %d out of order: %v", i, embedding)
+		}
+	}
+}
+
+func TestGenerateEmbeddingConcurrentCallsAreNotSerialized(t *testing.T) {
+	// Each request is held until every caller's request is in flight, which
+	// only happens if nothing serializes calls around the provider request.
+	const callers = 40
+	probe := newConcurrencyProbe(callers)
+	svc := fakeOpenAIService(t, fakeOpenAI{onRequest: probe.hold})
+
+	var wg sync.WaitGroup
+	errs := make([]error, callers)
+	for i := 0; i < callers; i++ {
+		wg.Add(1)
+		go func(i int) {
+			defer wg.Done()
+			_, errs[i] = svc.GenerateEmbedding(context.Background(), fmt.Sprintf("text %d", i), false)
+		}(i)
+	}
+	wg.Wait()
+
+	for i, err := range errs {
+		if err != nil {
+			t.Errorf("GenerateEmbedding %d failed: %v", i, err)
+		}
+	}
+	if probe.peak != callers {
+		t.Errorf("Expected %d requests in flight at once, got %d", callers, probe.peak)
+	}
+}
+
+func TestGenerateEmbeddingDoesNotTruncateInputWithinLimit(t *testing.T) {
+	var sent []string
+	svc := fakeOpenAIService(t, fakeOpenAI{onRequest: func(texts []string) { sent = texts }})
+
+	// About 20 KB of English, well under 8191 tokens
+	text := strings.Repeat("The quick brown fox jumps over the lazy dog. ", 450)
+	if _, err := svc.GenerateEmbedding(context.Background(), text, false); err != nil {
 		t.Fatalf("GenerateEmbedding failed: %v", err)
 	}
 
-	if len(embedding) != 1536 {
-		t.Errorf("Expected 1536 dimensions, got %d", len(embedding))
+	if len(sent) != 1 || sent[0] != text {
+		t.Errorf("Expected the %d byte text to be sent in full", len(text))
 	}
 }
 
-func TestGenerateEmbeddingEmptyText(t *testing.T) {
-	loadEnvFile(t)
+func TestGenerateEmbeddingsBatchTruncatesOnlyInputsOverTokenLimit(t *testing.T) {
+	// Reject any request with a text over the limit, counting four bytes
+	// per token
+	const maxTokens = 8191
+	var (
+		mu   sync.Mutex
+		sent [][]string
+	)
+	svc := fakeOpenAIService(t, fakeOpenAI{
+		onRequest: func(texts []string) {
+			mu.Lock()
+			defer mu.Unlock()
+			sent = append(sent, texts)
+		},
+		reject: func(texts []string) string {
+			for _, text := range texts {
+				if len(text)/4 > maxTokens {
+					return fmt.Sprintf("This model's maximum context length is %d tokens, however you requested %d tokens", maxTokens+1, len(text)/4)
+				}
+			}
+			return ""
+		},
+	})
+	var logs bytes.Buffer
+	svc.logger = slog.New(slog.NewTextHandler(&logs, nil))
+
+	// The valid long text is over the size that always fits, so it is
+	// suspected with the offender but must not be cut
+	tooLong := strings.Repeat("word ", 20000)
+	longValid := strings.Repeat("The quick brown fox jumps over the lazy dog. ", 450)
+	texts := []string{"short text", longValid, tooLong}
+	embeddings, err := svc.GenerateEmbeddingsBatch(context.Background(), texts, false)
+	if err != nil {
+		t.Fatalf("GenerateEmbeddingsBatch failed: %v", err)
+	}
+	for i, embedding := range embeddings {
+		if len(embedding) != 1536 {
+			t.Errorf("Embedding %d: expected 1536 dimensions, got %d", i, len(embedding))
+		}
+	}
 
-	apiKey := os.Getenv("OPENAI_API_KEY")
-	if apiKey == "" {
-		t.Skip("OPENAI_API_KEY not set, skipping integration test")
+	// Every text after the first, rejected request is sent alone
+	var truncated []string
+	seen := make(map[string]bool)
+	for _, request := range sent[1:] {
+		for _, text := range request {
+			seen[text] = true
+			if !slices.Contains(texts, text) {
+				truncated = append(truncated, text)
+			}
+		}
+	}
+	if !seen["short text"] || !seen[longValid] {
+		t.Error("Expected the texts within the limit to be sent unchanged")
+	}
+	if len(truncated) == 0 {
+		t.Fatal("Expected the text over the limit to be retried truncated")
 	}
+	for _, text := range truncated {
+		if !strings.HasPrefix(tooLong, text) {
+			t.Errorf("Expected only the text over the limit to be truncated, got %d bytes", len(text))
+		}
+	}
+	if last := truncated[len(truncated)-1]; len(last)/4 > maxTokens {
+		t.Errorf("Expected the text finally sent to fit, got %d bytes", len(last))
+	}
+	if strings.Count(logs.String(), "truncated embedding input") != 1 {
+		t.Errorf("Expected one truncation to be logged, got %q", logs.String())
+	}
+}
 
-	svc, err := NewService(Config{
-		Provider: ProviderOpenAI,
-		APIKey:   apiKey,
+func TestShrinkInput(t *testing.T) {
+	// Three quarters of "héllo wörld" ends inside "ö", so the cut backs up
+	if got := shrinkInput("héllo wörld", 5); got != "héllo w" {
+		t.Errorf("Expected a cut on a rune boundary, got %q", got)
+	}
+	if got := shrinkInput("héllo wörld", 10); got != "héllo wö" {
+		t.Errorf("Expected the cut not to go below the minimum, got %q", got)
+	}
+}
+
+func TestGenerateEmbeddingsBatchSendsTextsByLength(t *testing.T) {
+	// Echo each text's length back as its embedding
+	var sent []string
+	svc := fakeOpenAIService(t, fakeOpenAI{
+		onRequest: func(texts []string) { sent = texts },
+		embed: func(text string) string {
+			return fmt.Sprintf("[%d]", len(text))
+		},
 	})
+
+	texts := []string{"aaaaaaa", "b", "cc", "ddddddd"}
+	embeddings, err := svc.GenerateEmbeddingsBatch(context.Background(), texts, false)
 	if err != nil {
-		t.Fatalf("Failed to create service: %v", err)
+		t.Fatalf("GenerateEmbeddingsBatch failed: %v", err)
+	}
+
+	if fmt.Sprint(sent) != "[b cc aaaaaaa ddddddd]" {
+		t.Errorf("Expected texts sent shortest first, got %v", sent)
+	}
+	for i, text := range texts {
+		if len(embeddings[i]) != 1 || embeddings[i][0] != float32(len(text)) {
+			t.Errorf("Embedding %d should belong to %q, got %v", i, text, embeddings[i])
+		}
+	}
+}
+
+func TestGenerateEmbeddingsBatchPacksTextsIntoFewRequests(t *testing.T) {
+	// The fake server also fails the test if an input is not a list of texts
+	var requests requestRecorder
+	svc := fakeOpenAIService(t, fakeOpenAI{onRequest: requests.record})
+
+	texts := make([]string, 100)
+	for i := range texts {
+		texts[i] = fmt.Sprintf("chunk %d", i)
+	}
+
+	if _, err := svc.GenerateEmbeddingsBatch(context.Background(), texts, false); err != nil {
+		t.Fatalf("GenerateEmbeddingsBatch failed: %v", err)
+	}
+
+	wantRequests := (len(texts) + DefaultBatchSize - 1) / DefaultBatchSize
+	if len(requests.sizes) != wantRequests {
+		t.Errorf("Expected %d requests for %d texts, got %d", wantRequests, len(texts), len(requests.sizes))
 	}
+	for _, size := range requests.sizes {
+		if size <= 1 {
+			t.Errorf("Expected texts to be batched, got a request with %d", size)
+		}
+	}
+	if total := requests.total(); total != len(texts) {
+		t.Errorf("Expected %d texts sent in total, got %d", len(texts), total)
+	}
+}
+
+func TestGenerateEmbeddingsBatchSendsRequestsConcurrently(t *testing.T) {
+	// Each request is held until maxConcurrentRequests are in flight at
+	// once, which only happens if the batches are sent concurrently.
+	probe := newConcurrencyProbe(maxConcurrentRequests)
+	svc := fakeOpenAIService(t, fakeOpenAI{batchSize: 5, onRequest: probe.hold})
+
+	texts := make([]string, 40)
+	for i := range texts {
+		texts[i] = fmt.Sprintf("text %d", i)
+	}
+
+	embeddings, err := svc.GenerateEmbeddingsBatch(context.Background(), texts, false)
+	if err != nil {
+		t.Fatalf("GenerateEmbeddingsBatch failed: %v", err)
+	}
+
+	if len(embeddings) != len(texts) {
+		t.Fatalf("Expected %d embeddings, got %d", len(texts), len(embeddings))
+	}
+	if probe.peak != maxConcurrentRequests {
+		t.Errorf("Expected %d requests in flight at once, got %d", maxConcurrentRequests, probe.peak)
+	}
+}
+
+func TestGenerateEmbeddingWithCleaning(t *testing.T) {
+	svc := openAIService(t)
+
+	ctx := context.Background()
+
+	// Test with SilverBullet content that needs cleaning
+	content := "Content with [[wikilink]] and #tag"
+	embedding, err := svc.GenerateEmbedding(ctx, content, true)
+	if err != nil {
+		t.Fatalf("GenerateEmbedding failed: %v", err)
+	}
+
+	if len(embedding) != 1536 {
+		t.Errorf("Expected 1536 dimensions, got %d", len(embedding))
+	}
+}
+
+func TestGenerateEmbeddingEmptyText(t *testing.T) {
+	svc := openAIService(t)
 
 	ctx := context.Background()
 
@@ -381,20 +824,7 @@ func TestGenerateEmbeddingEmptyText(t *testing.T) {
 }
 
 func TestGenerateEmbeddingsBatchWithEmptyTexts(t *testing.T) {
-	loadEnvFile(t)
-
-	apiKey := os.Getenv("OPENAI_API_KEY")
-	if apiKey == "" {
-		t.Skip("OPENAI_API_KEY not set, skipping integration test")
-	}
-
-	svc, err := NewService(Config{
-		Provider: ProviderOpenAI,
-		APIKey:   apiKey,
-	})
-	if err != nil {
-		t.Fatalf("Failed to create service: %v", err)
-	}
+	svc := openAIService(t)
 
 	ctx := context.Background()
 
@@ -440,20 +870,7 @@ func TestGenerateEmbeddingsBatchWithEmptyTexts(t *testing.T) {
 }
 
 func TestGenerateEmbeddingsBatchAllEmpty(t *testing.T) {
-	loadEnvFile(t)
-
-	apiKey := os.Getenv("OPENAI_API_KEY")
-	if apiKey == "" {
-		t.Skip("OPENAI_API_KEY not set, skipping integration test")
-	}
-
-	svc, err := NewService(Config{
-		Provider: ProviderOpenAI,
-		APIKey:   apiKey,
-	})
-	if err != nil {
-		t.Fatalf("Failed to create service: %v", err)
-	}
+	svc := openAIService(t)
 
 	ctx := context.Background()
 
@@ -485,20 +902,7 @@ func TestGenerateEmbeddingsBatchAllEmpty(t *testing.T) {
 // Additional tests beyond Python coverage
 
 func TestEmbeddingSimilarity(t *testing.T) {
-	loadEnvFile(t)
-
-	apiKey := os.Getenv("OPENAI_API_KEY")
-	if apiKey == "" {
-		t.Skip("OPENAI_API_KEY not set, skipping integration test")
-	}
-
-	svc, err := NewService(Config{
-		Provider: ProviderOpenAI,
-		APIKey:   apiKey,
-	})
-	if err != nil {
-		t.Fatalf("Failed to create service: %v", err)
-	}
+	svc := openAIService(t)
 
 	ctx := context.Background()
 
@@ -555,12 +959,77 @@ func cosineSimilarity(a, b []float32) float64 {
 // ==================== Local Embedding Tests ====================
 // These match Python TestEmbeddingServiceLocal tests
 
-func TestInitializationWithLocalProvider(t *testing.T) {
-	svc, err := NewService(Config{Provider: ProviderLocal})
-	if err != nil {
-		t.Fatalf("Failed to create local service: %v", err)
+// sharedLocalService holds a local embedding service. Loading the model
+// dominates these tests, so it is created on first use and shared.
+var sharedLocalService struct {
+	once sync.Once
+	svc  *Service
+	err  error
+}
+
+// localService returns the shared local embedding service.
+func localService(t *testing.T) *Service {
+	t.Helper()
+	shared := &sharedLocalService
+	shared.once.Do(func() {
+		shared.svc, shared.err = NewService(Config{Provider: ProviderLocal})
+	})
+	if shared.err != nil {
+		t.Fatalf("Failed to create local service: %v", shared.err)
+	}
+	return shared.svc
+}
+
+// localBatchTexts are embedded together once by localBatchEmbeddings so
+// tests that only inspect batch output share a single model run.
+var localBatchTexts = []string{
+	"text 1",
+	"text 2",
+	"text 3",
+	"The quick brown fox jumps over the lazy dog",
+	"A fast brown fox leaps over a sleeping dog",
+	"Quantum physics and particle acceleration",
+}
+
+var sharedLocalBatch struct {
+	once   sync.Once
+	embeds map[string][]float32
+	err    error
+}
+
+// localBatchEmbeddings returns the embeddings of localBatchTexts keyed by
+// text, generated with one GenerateEmbeddingsBatch call.
+func localBatchEmbeddings(t *testing.T) map[string][]float32 {
+	t.Helper()
+	svc := localService(t)
+	shared := &sharedLocalBatch
+	shared.once.Do(func() {
+		var embeds [][]float32
+		embeds, shared.err = svc.GenerateEmbeddingsBatch(context.Background(), localBatchTexts, false)
+		if shared.err != nil {
+			return
+		}
+		shared.embeds = make(map[string][]float32, len(localBatchTexts))
+		for i, text := range localBatchTexts {
+			shared.embeds[text] = embeds[i]
+		}
+	})
+	if shared.err != nil {
+		t.Fatalf("GenerateEmbeddingsBatch failed: %v", shared.err)
+	}
+	return shared.embeds
+}
+
+func TestMain(m *testing.M) {
+	code := m.Run()
+	if sharedLocalService.svc != nil {
+		sharedLocalService.svc.Close()
 	}
-	defer svc.Close()
+	os.Exit(code)
+}
+
+func TestInitializationWithLocalProvider(t *testing.T) {
+	svc := localService(t)
 
 	if svc.GetProvider() != ProviderLocal {
 		t.Errorf("Expected provider 'local', got '%s'", svc.GetProvider())
@@ -580,11 +1049,7 @@ func TestGetEmbeddingDimensionLocal(t *testing.T) {
 }
 
 func TestGenerateEmbeddingLocal(t *testing.T) {
-	svc, err := NewService(Config{Provider: ProviderLocal})
-	if err != nil {
-		t.Fatalf("Failed to create local service: %v", err)
-	}
-	defer svc.Close()
+	svc := localService(t)
 
 	ctx := context.Background()
 	embedding, err := svc.GenerateEmbedding(ctx, "test content", false)
@@ -610,11 +1075,7 @@ func TestGenerateEmbeddingLocal(t *testing.T) {
 }
 
 func TestGenerateEmbeddingLocalWithCleaning(t *testing.T) {
-	svc, err := NewService(Config{Provider: ProviderLocal})
-	if err != nil {
-		t.Fatalf("Failed to create local service: %v", err)
-	}
-	defer svc.Close()
+	svc := localService(t)
 
 	ctx := context.Background()
 	content := "Content with [[wikilink]] and #tag"
@@ -629,11 +1090,7 @@ func TestGenerateEmbeddingLocalWithCleaning(t *testing.T) {
 }
 
 func TestGenerateEmbeddingLocalEmptyText(t *testing.T) {
-	svc, err := NewService(Config{Provider: ProviderLocal})
-	if err != nil {
-		t.Fatalf("Failed to create local service: %v", err)
-	}
-	defer svc.Close()
+	svc := localService(t)
 
 	ctx := context.Background()
 	embedding, err := svc.GenerateEmbedding(ctx, "", false)
@@ -655,36 +1112,21 @@ func TestGenerateEmbeddingLocalEmptyText(t *testing.T) {
 }
 
 func TestGenerateEmbeddingsBatchLocal(t *testing.T) {
-	svc, err := NewService(Config{Provider: ProviderLocal})
-	if err != nil {
-		t.Fatalf("Failed to create local service: %v", err)
-	}
-	defer svc.Close()
+	cache := localBatchEmbeddings(t)
 
-	ctx := context.Background()
-	texts := []string{"text 1", "text 2", "text 3"}
-	embeddings, err := svc.GenerateEmbeddingsBatch(ctx, texts, false)
-	if err != nil {
-		t.Fatalf("GenerateEmbeddingsBatch failed: %v", err)
+	if len(cache) != len(localBatchTexts) {
+		t.Errorf("Expected %d embeddings, got %d", len(localBatchTexts), len(cache))
 	}
 
-	if len(embeddings) != 3 {
-		t.Errorf("Expected 3 embeddings, got %d", len(embeddings))
-	}
-
-	for i, emb := range embeddings {
-		if len(emb) != 384 {
-			t.Errorf("Embedding %d: expected 384 dimensions, got %d", i, len(emb))
+	for _, text := range localBatchTexts {
+		if emb := cache[text]; len(emb) != 384 {
+			t.Errorf("Embedding %q: expected 384 dimensions, got %d", text, len(emb))
 		}
 	}
 }
 
 func TestGenerateEmbeddingsBatchLocalWithEmpty(t *testing.T) {
-	svc, err := NewService(Config{Provider: ProviderLocal})
-	if err != nil {
-		t.Fatalf("Failed to create local service: %v", err)
-	}
-	defer svc.Close()
+	svc := localService(t)
 
 	ctx := context.Background()
 	texts := []string{"", "text 2", ""}
@@ -725,29 +1167,16 @@ func TestGenerateEmbeddingsBatchLocalWithEmpty(t *testing.T) {
 }
 
 func TestLocalEmbeddingSimilarity(t *testing.T) {
-	svc, err := NewService(Config{Provider: ProviderLocal})
-	if err != nil {
-		t.Fatalf("Failed to create local service: %v", err)
-	}
-	defer svc.Close()
+	cache := localBatchEmbeddings(t)
 
-	ctx := context.Background()
-
-	// Generate embeddings for semantically similar and different texts
-	texts := []string{
-		"The quick brown fox jumps over the lazy dog",
-		"A fast brown fox leaps over a sleeping dog",
-		"Quantum physics and particle acceleration",
-	}
-
-	embeddings, err := svc.GenerateEmbeddingsBatch(ctx, texts, false)
-	if err != nil {
-		t.Fatalf("GenerateEmbeddingsBatch failed: %v", err)
-	}
+	// Embeddings for semantically similar and different texts
+	fox := cache["The quick brown fox jumps over the lazy dog"]
+	similar := cache["A fast brown fox leaps over a sleeping dog"]
+	different := cache["Quantum physics and particle acceleration"]
 
 	// Calculate cosine similarity between pairs
-	sim01 := cosineSimilarity(embeddings[0], embeddings[1])
-	sim02 := cosineSimilarity(embeddings[0], embeddings[2])
+	sim01 := cosineSimilarity(fox, similar)
+	sim02 := cosineSimilarity(fox, different)
 
 	t.Logf("Local: Similarity between similar texts: %.4f", sim01)
 	t.Logf("Local: Similarity between different texts: %.4f", sim02)
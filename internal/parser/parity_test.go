@@ -5,11 +5,21 @@ import (
 	"encoding/json"
 	"os"
 	"path/filepath"
+	"slices"
 	"sort"
 	"strings"
+	"sync"
 	"testing"
+
+	"github.com/boblangley/silverbullet-rag/internal/types"
 )
 
+// e2eSpaceChunks parses the e2e test space once for all parity tests.
+var e2eSpaceChunks = sync.OnceValues(func() ([]types.Chunk, error) {
+	testSpace := filepath.Join("..", "..", "test-data", "e2e-space")
+	return NewSpaceParser(testSpace).ParseSpace(testSpace)
+})
+
 // normalizedChunk is a simplified chunk structure for comparison.
 type normalizedChunk struct {
 	Header     string   `json:"header"`
@@ -22,6 +32,10 @@ type normalizedChunk struct {
 
 // TestParserParityWithGolden compares Go parser output against Python golden file.
 func TestParserParityWithGolden(t *testing.T) {
+	if testing.Short() {
+		t.Skip("skipping e2e space parity test in short mode")
+	}
+
 	// Find test space
 	testSpace := filepath.Join("..", "..", "test-data", "e2e-space")
 	if _, err := os.Stat(testSpace); os.IsNotExist(err) {
@@ -35,8 +49,7 @@ func TestParserParityWithGolden(t *testing.T) {
 	}
 
 	// Parse with Go
-	parser := NewSpaceParser(testSpace)
-	goChunks, err := parser.ParseSpace(testSpace)
+	goChunks, err := e2eSpaceChunks()
 	if err != nil {
 		t.Fatalf("Go parser failed: %v", err)
 	}
@@ -47,8 +60,8 @@ func TestParserParityWithGolden(t *testing.T) {
 		nc := normalizedChunk{
 			Header:     chunk.Header,
 			Content:    strings.TrimSpace(chunk.Content),
-			Tags:       chunk.Tags,
-			Links:      chunk.Links,
+			Tags:       slices.Clone(chunk.Tags),
+			Links:      slices.Clone(chunk.Links),
 			FolderPath: strings.ReplaceAll(chunk.FolderPath, "\\", "/"),
 		}
 
@@ -63,7 +76,8 @@ func TestParserParityWithGolden(t *testing.T) {
 		}
 		nc.FilePath = fp
 
-		// Ensure sorted
+		// Ensure sorted; the slices are copies since the parsed chunks
+		// are shared between tests
 		sort.Strings(nc.Tags)
 		sort.Strings(nc.Links)
 
@@ -219,6 +233,10 @@ func TestParserParityWithGolden(t *testing.T) {
 
 // TestParserParityContentComparison compares content between Go and Python.
 func TestParserParityContentComparison(t *testing.T) {
+	if testing.Short() {
+		t.Skip("skipping e2e space parity test in short mode")
+	}
+
 	testSpace := filepath.Join("..", "..", "test-data", "e2e-space")
 	if _, err := os.Stat(testSpace); os.IsNotExist(err) {
 		t.Skip("Test space not found")
@@ -230,8 +248,7 @@ func TestParserParityContentComparison(t *testing.T) {
 	}
 
 	// Parse with Go
-	parser := NewSpaceParser(testSpace)
-	goChunks, err := parser.ParseSpace(testSpace)
+	goChunks, err := e2eSpaceChunks()
 	if err != nil {
 		t.Fatalf("Go parser failed: %v", err)
 	}
@@ -2,13 +2,19 @@
 package parser
 
 import (
+	"container/list"
+	"io"
 	"os"
 	"path/filepath"
 	"regexp"
+	"runtime"
 	"strings"
+	"sync"
+	"time"
 
 	"github.com/yuin/goldmark"
 	"github.com/yuin/goldmark/ast"
+	gmparser "github.com/yuin/goldmark/parser"
 	"github.com/yuin/goldmark/text"
 	"gopkg.in/yaml.v3"
 
@@ -25,32 +31,140 @@ var (
 	// We filter out matches preceded by ! in code
 	inlineAttrPattern = regexp.MustCompile(`(^|[^!])\[([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*([^\]]+)\]`)
 	dataBlockPattern  = regexp.MustCompile("(?s)```#(\\w+)\\s*\\n(.*?)\\n```")
+	headerPattern     = regexp.MustCompile(`^(#+)\s+(.+)$`)
 )
 
+// parallelParseThreshold is the number of files below which ParseSpace
+// parses sequentially.
+const parallelParseThreshold = 8
+
+// frontmatterCacheSize caps how many files' frontmatter is kept in memory.
+const frontmatterCacheSize = 4096
+
 // SpaceParser parses SilverBullet markdown files.
 type SpaceParser struct {
-	md               goldmark.Markdown
+	md               gmparser.Parser
 	spaceRoot        string
 	contentCache     map[string]string
-	frontmatterCache map[string]map[string]any
+	frontmatterCache *frontmatterCache
+}
+
+// frontmatterEntry is cached frontmatter along with the modification time of
+// the file it was read from, so edits invalidate it.
+type frontmatterEntry struct {
+	path    string
+	fm      map[string]any
+	modTime time.Time
+}
+
+// frontmatterCache is a bounded, least-recently-used cache of frontmatter
+// keyed by file path. It is safe for concurrent use.
+type frontmatterCache struct {
+	mu      sync.Mutex
+	maxSize int
+	order   *list.List // most recently used at the front
+	entries map[string]*list.Element
+}
+
+func newFrontmatterCache(maxSize int) *frontmatterCache {
+	return &frontmatterCache{
+		maxSize: maxSize,
+		order:   list.New(),
+		entries: make(map[string]*list.Element),
+	}
+}
+
+// get returns the cached frontmatter for path if it was read from a file
+// with the given modification time.
+func (c *frontmatterCache) get(path string, modTime time.Time) (map[string]any, bool) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	el, ok := c.entries[path]
+	if !ok {
+		return nil, false
+	}
+	e := el.Value.(*frontmatterEntry)
+	if !e.modTime.Equal(modTime) {
+		return nil, false
+	}
+	c.order.MoveToFront(el)
+	return e.fm, true
+}
+
+// put stores frontmatter for path, evicting the least recently used entry
+// once the cache is full.
+func (c *frontmatterCache) put(path string, fm map[string]any, modTime time.Time) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	if el, ok := c.entries[path]; ok {
+		e := el.Value.(*frontmatterEntry)
+		e.fm, e.modTime = fm, modTime
+		c.order.MoveToFront(el)
+		return
+	}
+
+	c.entries[path] = c.order.PushFront(&frontmatterEntry{path: path, fm: fm, modTime: modTime})
+	if c.order.Len() > c.maxSize {
+		oldest := c.order.Back()
+		c.order.Remove(oldest)
+		delete(c.entries, oldest.Value.(*frontmatterEntry).path)
+	}
+}
+
+// len returns the number of cached entries.
+func (c *frontmatterCache) len() int {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	return c.order.Len()
 }
 
 // NewSpaceParser creates a new parser.
 func NewSpaceParser(spaceRoot string) *SpaceParser {
 	return &SpaceParser{
-		md:               goldmark.New(),
+		md:               goldmark.DefaultParser(),
 		spaceRoot:        spaceRoot,
 		contentCache:     make(map[string]string),
-		frontmatterCache: make(map[string]map[string]any),
+		frontmatterCache: newFrontmatterCache(frontmatterCacheSize),
 	}
 }
 
-// ParseSpace parses all markdown files in a directory.
-func (p *SpaceParser) ParseSpace(dirPath string) ([]types.Chunk, error) {
-	p.spaceRoot = dirPath
-	var chunks []types.Chunk
+// spaceScan is the result of a single walk over a space directory. It feeds
+// ParseSpace, GetFolderPaths and GetFolderIndexPages so the tree is only
+// traversed once during indexing.
+type spaceScan struct {
+	root     string
+	files    []string                       // parseable markdown files, in walk order
+	relFiles []string                       // files relative to root
+	folders  []string                       // folder paths relative to root
+	mdNames  map[string]map[string]struct{} // relative directory -> .md file names it contains
+}
+
+// scanSpace walks dirPath once, collecting markdown files and folders.
+func (p *SpaceParser) scanSpace(dirPath string) (*spaceScan, error) {
+	scan := &spaceScan{
+		root:    dirPath,
+		mdNames: make(map[string]map[string]struct{}),
+	}
+
+	// WalkDir yields the cleaned root joined with each relative path, so
+	// relative paths can be sliced off rather than computed with filepath.Rel.
+	prefix := filepath.Clean(dirPath)
+	switch {
+	case prefix == ".":
+		prefix = ""
+	case !strings.HasSuffix(prefix, string(filepath.Separator)):
+		prefix += string(filepath.Separator)
+	}
+	relative := func(path string) string {
+		if strings.HasPrefix(path, prefix) {
+			return path[len(prefix):]
+		}
+		rel, _ := filepath.Rel(dirPath, path)
+		return rel
+	}
 
-	// First pass: cache all file contents
 	err := filepath.WalkDir(dirPath, func(path string, d os.DirEntry, err error) error {
 		if err != nil {
 			return err
@@ -60,76 +174,178 @@ func (p *SpaceParser) ParseSpace(dirPath string) ([]types.Chunk, error) {
 			if p.shouldSkipDirectory(path) {
 				return filepath.SkipDir
 			}
+			if path != dirPath {
+				scan.folders = append(scan.folders, relative(path))
+			}
 			return nil
 		}
 
-		if !strings.HasSuffix(path, ".md") || p.shouldSkipFile(path) {
+		name := d.Name()
+		if !strings.HasSuffix(name, ".md") {
 			return nil
 		}
 
-		content, err := os.ReadFile(path)
-		if err != nil {
-			return nil // Skip files we can't read
+		relPath := relative(path)
+		relDir := "."
+		if i := strings.LastIndexByte(relPath, filepath.Separator); i >= 0 {
+			relDir = relPath[:i]
 		}
+		names, ok := scan.mdNames[relDir]
+		if !ok {
+			names = make(map[string]struct{})
+			scan.mdNames[relDir] = names
+		}
+		names[name] = struct{}{}
 
-		relPath, _ := filepath.Rel(dirPath, path)
-		pageName := strings.TrimSuffix(relPath, ".md")
-		p.contentCache[pageName] = string(content)
-		p.frontmatterCache[path] = p.extractFrontmatter(string(content))
-
+		if !p.shouldSkipFile(path) {
+			scan.files = append(scan.files, path)
+			scan.relFiles = append(scan.relFiles, relPath)
+		}
 		return nil
 	})
 	if err != nil {
 		return nil, err
 	}
 
-	// Second pass: parse files
-	err = filepath.WalkDir(dirPath, func(path string, d os.DirEntry, err error) error {
+	return scan, nil
+}
+
+// SpaceFolders describes the folders of a space.
+type SpaceFolders struct {
+	Paths      []string          // folder paths relative to the space root
+	IndexPages map[string]string // folder path -> its index page, if any
+}
+
+// ParseSpace parses all markdown files in a directory.
+func (p *SpaceParser) ParseSpace(dirPath string) ([]types.Chunk, error) {
+	scan, err := p.scanSpace(dirPath)
+	if err != nil {
+		return nil, err
+	}
+	return p.parseScan(scan), nil
+}
+
+// ParseSpaceWithFolders parses all markdown files in a directory like
+// ParseSpace, and also returns the space's folders, found in the same walk
+// of the directory.
+func (p *SpaceParser) ParseSpaceWithFolders(dirPath string) ([]types.Chunk, SpaceFolders, error) {
+	scan, err := p.scanSpace(dirPath)
+	if err != nil {
+		return nil, SpaceFolders{}, err
+	}
+	folders := SpaceFolders{Paths: scan.folderPaths(), IndexPages: scan.folderIndexPages()}
+	return p.parseScan(scan), folders, nil
+}
+
+// parseScan parses the markdown files found by a scan of the space.
+func (p *SpaceParser) parseScan(scan *spaceScan) []types.Chunk {
+	p.spaceRoot = scan.root
+
+	files := scan.files
+	contents := make([]string, len(files))
+	modTimes := make([]time.Time, len(files))
+	frontmatters := make([]map[string]any, len(files))
+	loaded := make([]bool, len(files))
+
+	// First pass: read files and extract frontmatter
+	forEachFile(len(files), func(i int) {
+		content, modTime, err := readFile(files[i])
 		if err != nil {
-			return err
+			return // Skip files we can't read
 		}
+		contents[i] = content
+		modTimes[i] = modTime
+		frontmatters[i] = p.extractFrontmatter(content)
+		loaded[i] = true
+	})
 
-		if d.IsDir() {
-			if p.shouldSkipDirectory(path) {
-				return filepath.SkipDir
-			}
-			return nil
+	// Populate the caches before parsing so transclusions can resolve
+	for i, path := range files {
+		if !loaded[i] {
+			continue
 		}
+		pageName := strings.TrimSuffix(scan.relFiles[i], ".md")
+		p.contentCache[pageName] = contents[i]
+		p.frontmatterCache.put(path, frontmatters[i], modTimes[i])
+	}
 
-		if !strings.HasSuffix(path, ".md") || p.shouldSkipFile(path) {
-			return nil
+	// Second pass: parse files. The caches are only read from here on, so
+	// files can be parsed concurrently; results are kept in walk order.
+	fileChunks := make([][]types.Chunk, len(files))
+	forEachFile(len(files), func(i int) {
+		if !loaded[i] {
+			return
 		}
-
-		relPath, _ := filepath.Rel(dirPath, path)
-		pageName := strings.TrimSuffix(relPath, ".md")
-		content := p.contentCache[pageName]
+		relPath := scan.relFiles[i]
 
 		folderPath := ""
-		if dir := filepath.Dir(relPath); dir != "." {
-			folderPath = dir
+		if j := strings.LastIndexByte(relPath, filepath.Separator); j >= 0 {
+			folderPath = relPath[:j]
 		}
 
-		frontmatter := p.frontmatterCache[path]
-		fileChunks := p.parseFile(path, content, folderPath, frontmatter)
-		chunks = append(chunks, fileChunks...)
-
-		return nil
+		fileChunks[i] = p.parseFile(files[i], contents[i], folderPath, frontmatters[i])
 	})
 
-	return chunks, err
+	// Concatenate into a slice sized up front, releasing each file's chunks
+	// as they are copied so peak memory stays close to a single copy.
+	total := 0
+	for _, fc := range fileChunks {
+		total += len(fc)
+	}
+	chunks := make([]types.Chunk, 0, total)
+	for i, fc := range fileChunks {
+		chunks = append(chunks, fc...)
+		fileChunks[i] = nil
+	}
+
+	return chunks
 }
 
-// ParseFile parses a single markdown file.
-func (p *SpaceParser) ParseFile(filePath string) ([]types.Chunk, error) {
-	content, err := os.ReadFile(filePath)
-	if err != nil {
-		return nil, err
+// forEachFile calls fn for every index in [0, n). Larger spaces are spread
+// across GOMAXPROCS workers; small ones run inline since goroutine setup
+// would outweigh the work.
+func forEachFile(n int, fn func(i int)) {
+	workers := runtime.GOMAXPROCS(0)
+	if n < parallelParseThreshold || workers < 2 {
+		for i := 0; i < n; i++ {
+			fn(i)
+		}
+		return
+	}
+	if workers > n {
+		workers = n
+	}
+
+	indexes := make(chan int)
+	var wg sync.WaitGroup
+	for w := 0; w < workers; w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for i := range indexes {
+				fn(i)
+			}
+		}()
+	}
+	for i := 0; i < n; i++ {
+		indexes <- i
 	}
+	close(indexes)
+	wg.Wait()
+}
 
+// ParseFile parses a single markdown file.
+func (p *SpaceParser) ParseFile(filePath string) ([]types.Chunk, error) {
 	if p.shouldSkipFile(filePath) {
 		return nil, nil
 	}
 
+	data, err := os.ReadFile(filePath)
+	if err != nil {
+		return nil, err
+	}
+	content := string(data)
+
 	folderPath := ""
 	if p.spaceRoot != "" {
 		if relPath, err := filepath.Rel(p.spaceRoot, filePath); err == nil {
@@ -139,8 +355,8 @@ func (p *SpaceParser) ParseFile(filePath string) ([]types.Chunk, error) {
 		}
 	}
 
-	frontmatter := p.extractFrontmatter(string(content))
-	return p.parseFile(filePath, string(content), folderPath, frontmatter), nil
+	frontmatter := p.extractFrontmatter(content)
+	return p.parseFile(filePath, content, folderPath, frontmatter), nil
 }
 
 func (p *SpaceParser) parseFile(filePath, content, folderPath string, frontmatter map[string]any) []types.Chunk {
@@ -155,11 +371,48 @@ func (p *SpaceParser) parseFile(filePath, content, folderPath string, frontmatte
 
 	// Parse markdown
 	reader := text.NewReader([]byte(rawContent))
-	doc := p.md.Parser().Parse(reader)
+	doc := p.md.Parse(reader)
 
+	// Transclusions are a property of the whole page, so scan for them once
+	// rather than once per chunk
+	transclusions := p.extractTransclusions(rawContent)
+
+	source := reader.Source()
 	var chunks []types.Chunk
 	currentHeader := filepath.Base(strings.TrimSuffix(filePath, ".md"))
-	var currentContent []string
+
+	// Chunk text is accumulated directly from the source segments; parts are
+	// separated by newlines as they are written rather than joined at flush.
+	var currentContent strings.Builder
+	parts := 0
+	startPart := func() {
+		if parts > 0 {
+			currentContent.WriteByte('\n')
+		}
+		parts++
+	}
+	flushChunk := func() {
+		if parts == 0 {
+			return
+		}
+		text := strings.TrimSpace(currentContent.String())
+		if text != "" {
+			chunk := p.createChunk(filePath, currentHeader, text, folderPath, frontmatter, transclusions)
+			chunks = append(chunks, chunk)
+		}
+		currentContent.Reset()
+		parts = 0
+	}
+	writeLines := func(lines *text.Segments) {
+		if lines.Len() == 0 {
+			return
+		}
+		startPart()
+		for i := 0; i < lines.Len(); i++ {
+			line := lines.At(i)
+			currentContent.Write(line.Value(source))
+		}
+	}
 
 	// Walk the AST to find headings and content
 	_ = ast.Walk(doc, func(n ast.Node, entering bool) (ast.WalkStatus, error) {
@@ -171,66 +424,39 @@ func (p *SpaceParser) parseFile(filePath, content, folderPath string, frontmatte
 		case *ast.Heading:
 			if node.Level == 2 {
 				// Save previous chunk
-				if len(currentContent) > 0 {
-					text := strings.TrimSpace(strings.Join(currentContent, "\n"))
-					if text != "" {
-						chunk := p.createChunk(filePath, currentHeader, text, folderPath, frontmatter, rawContent)
-						chunks = append(chunks, chunk)
-					}
-					currentContent = nil
-				}
+				flushChunk()
 				// Get heading text
 				if node.Lines().Len() > 0 {
 					line := node.Lines().At(0)
-					currentHeader = string(line.Value(reader.Source()))
+					currentHeader = string(line.Value(source))
 				}
 			}
 		case *ast.Text:
-			currentContent = append(currentContent, string(node.Segment.Value(reader.Source())))
+			startPart()
+			currentContent.Write(node.Segment.Value(source))
 		case *ast.String:
-			currentContent = append(currentContent, string(node.Value))
+			startPart()
+			currentContent.Write(node.Value)
 		case *ast.FencedCodeBlock:
 			// Include fenced code block content (important for CONFIG.md and documentation)
 			// Skip data blocks (```#tagname) as they are handled separately
 			info := ""
 			if node.Info != nil {
-				info = string(node.Info.Segment.Value(reader.Source()))
+				info = string(node.Info.Segment.Value(source))
 			}
 			if !strings.HasPrefix(info, "#") {
-				var codeLines []string
-				lines := node.Lines()
-				for i := 0; i < lines.Len(); i++ {
-					line := lines.At(i)
-					codeLines = append(codeLines, string(line.Value(reader.Source())))
-				}
-				if len(codeLines) > 0 {
-					currentContent = append(currentContent, strings.Join(codeLines, ""))
-				}
+				writeLines(node.Lines())
 			}
 		case *ast.CodeBlock:
 			// Include indented code blocks
-			var codeLines []string
-			lines := node.Lines()
-			for i := 0; i < lines.Len(); i++ {
-				line := lines.At(i)
-				codeLines = append(codeLines, string(line.Value(reader.Source())))
-			}
-			if len(codeLines) > 0 {
-				currentContent = append(currentContent, strings.Join(codeLines, ""))
-			}
+			writeLines(node.Lines())
 		}
 
 		return ast.WalkContinue, nil
 	})
 
 	// Save last chunk
-	if len(currentContent) > 0 {
-		text := strings.TrimSpace(strings.Join(currentContent, "\n"))
-		if text != "" {
-			chunk := p.createChunk(filePath, currentHeader, text, folderPath, frontmatter, rawContent)
-			chunks = append(chunks, chunk)
-		}
-	}
+	flushChunk()
 
 	// If no chunks but we have data blocks, create an empty chunk
 	if len(chunks) == 0 && len(dataBlocks) > 0 {
@@ -254,10 +480,9 @@ func (p *SpaceParser) parseFile(filePath, content, folderPath string, frontmatte
 	return chunks
 }
 
-func (p *SpaceParser) createChunk(filePath, header, content, folderPath string, frontmatter map[string]any, rawContent string) types.Chunk {
+func (p *SpaceParser) createChunk(filePath, header, content, folderPath string, frontmatter map[string]any, transclusions []types.Transclusion) types.Chunk {
 	links := p.extractLinks(content)
 	tags := p.extractTags(content, frontmatter)
-	transclusions := p.extractTransclusions(rawContent)
 	inlineAttrs := p.extractInlineAttributes(content)
 
 	return types.Chunk{
@@ -275,11 +500,21 @@ func (p *SpaceParser) createChunk(filePath, header, content, folderPath string,
 }
 
 func (p *SpaceParser) extractFrontmatter(content string) map[string]any {
+	// Cheap prefix check so pages without frontmatter never reach the regex
+	if !strings.HasPrefix(content, "---") {
+		return nil
+	}
+
 	match := frontmatterPattern.FindStringSubmatch(content)
 	if match == nil {
 		return nil
 	}
 
+	// An empty block decodes to nothing; don't spin up the YAML decoder for it
+	if strings.TrimSpace(match[1]) == "" {
+		return nil
+	}
+
 	var fm map[string]any
 	if err := yaml.Unmarshal([]byte(match[1]), &fm); err != nil {
 		return nil
@@ -288,7 +523,16 @@ func (p *SpaceParser) extractFrontmatter(content string) map[string]any {
 }
 
 func (p *SpaceParser) stripFrontmatter(content string) string {
-	return frontmatterPattern.ReplaceAllString(content, "")
+	if !strings.HasPrefix(content, "---") {
+		return content
+	}
+
+	// The pattern is anchored to the start, so at most one match is removed
+	loc := frontmatterPattern.FindStringIndex(content)
+	if loc == nil {
+		return content
+	}
+	return content[loc[1]:]
 }
 
 func (p *SpaceParser) extractLinks(content string) []string {
@@ -306,7 +550,8 @@ func (p *SpaceParser) extractLinks(content string) []string {
 func (p *SpaceParser) extractTags(content string, frontmatter map[string]any) []string {
 	// Extract from content
 	matches := tagPattern.FindAllStringSubmatch(content, -1)
-	tagSet := make(map[string]struct{})
+	fmTags := p.getFrontmatterTags(frontmatter)
+	tagSet := make(map[string]struct{}, len(matches)+len(fmTags))
 	var tags []string
 
 	for _, m := range matches {
@@ -317,7 +562,10 @@ func (p *SpaceParser) extractTags(content string, frontmatter map[string]any) []
 	}
 
 	// Add frontmatter tags
-	for _, t := range p.getFrontmatterTags(frontmatter) {
+	for _, t := range fmTags {
+		if t == "" {
+			continue
+		}
 		if _, exists := tagSet[t]; !exists {
 			tagSet[t] = struct{}{}
 			tags = append(tags, t)
@@ -450,7 +698,6 @@ func (p *SpaceParser) extractSection(content, header string) string {
 	var sectionLines []string
 	inSection := false
 	sectionLevel := 0
-	headerPattern := regexp.MustCompile(`^(#+)\s+(.+)$`)
 
 	for _, line := range lines {
 		m := headerPattern.FindStringSubmatch(line)
@@ -514,90 +761,121 @@ func (p *SpaceParser) shouldSkipDirectory(path string) bool {
 
 // GetFolderPaths returns all folder paths in the space.
 func (p *SpaceParser) GetFolderPaths(dirPath string) ([]string, error) {
-	folderSet := make(map[string]struct{})
-
-	err := filepath.WalkDir(dirPath, func(path string, d os.DirEntry, err error) error {
-		if err != nil {
-			return err
-		}
-
-		if d.IsDir() {
-			if p.shouldSkipDirectory(path) {
-				return filepath.SkipDir
-			}
-
-			relPath, err := filepath.Rel(dirPath, path)
-			if err != nil || relPath == "." {
-				return nil
-			}
-
-			folderSet[relPath] = struct{}{}
-			return nil
-		}
-
-		return nil
-	})
+	scan, err := p.scanSpace(dirPath)
 	if err != nil {
 		return nil, err
 	}
-
-	var folders []string
-	for f := range folderSet {
-		folders = append(folders, f)
-	}
-	return folders, nil
+	return scan.folderPaths(), nil
 }
 
 // GetFolderIndexPages returns a mapping of folder paths to their index pages.
 func (p *SpaceParser) GetFolderIndexPages(dirPath string) (map[string]string, error) {
-	indexMap := make(map[string]string)
-
-	err := filepath.WalkDir(dirPath, func(path string, d os.DirEntry, err error) error {
-		if err != nil {
-			return err
-		}
-
-		if !d.IsDir() {
-			return nil
-		}
+	scan, err := p.scanSpace(dirPath)
+	if err != nil {
+		return nil, err
+	}
+	return scan.folderIndexPages(), nil
+}
 
-		if p.shouldSkipDirectory(path) {
-			return filepath.SkipDir
-		}
+// folderPaths returns the folder paths found by the scan.
+func (scan *spaceScan) folderPaths() []string {
+	folders := make([]string, len(scan.folders))
+	copy(folders, scan.folders)
+	return folders
+}
 
-		relPath, err := filepath.Rel(dirPath, path)
-		if err != nil || relPath == "." {
-			return nil
+// folderIndexPages maps each folder found by the scan to its index page: a
+// sibling .md file with the folder's name.
+func (scan *spaceScan) folderIndexPages() map[string]string {
+	indexMap := make(map[string]string)
+	for _, relPath := range scan.folders {
+		// Check for sibling .md file using the names collected during the walk
+		parentRel, name := ".", relPath
+		if i := strings.LastIndexByte(relPath, filepath.Separator); i >= 0 {
+			parentRel, name = relPath[:i], relPath[i+1:]
 		}
-
-		// Check for sibling .md file
-		parentDir := filepath.Dir(path)
-		indexFile := filepath.Join(parentDir, filepath.Base(path)+".md")
-		if _, err := os.Stat(indexFile); err == nil {
-			relIndex, _ := filepath.Rel(dirPath, indexFile)
-			indexMap[relPath] = relIndex
+		if _, ok := scan.mdNames[parentRel][name+".md"]; ok {
+			indexMap[relPath] = relPath + ".md"
 		}
-
-		return nil
-	})
-
-	return indexMap, err
+	}
+	return indexMap
 }
 
+// frontmatterHeadSize is how much of a file ReadFrontmatterHead reads up
+// front.
+// Frontmatter sits at the top of a page, so the body is usually not needed.
+const frontmatterHeadSize = 8192
+
 // GetFrontmatter returns the frontmatter for a file.
 func (p *SpaceParser) GetFrontmatter(filePath string) (map[string]any, error) {
-	// Check cache first
-	if fm, ok := p.frontmatterCache[filePath]; ok {
+	info, err := os.Stat(filePath)
+	if err != nil {
+		return nil, err
+	}
+
+	// Check cache first; entries from before the last edit are re-read
+	if fm, ok := p.frontmatterCache.get(filePath, info.ModTime()); ok {
 		return fm, nil
 	}
 
-	// Read and parse
-	content, err := os.ReadFile(filePath)
+	head, err := ReadFrontmatterHead(filePath)
 	if err != nil {
 		return nil, err
 	}
 
-	fm := p.extractFrontmatter(string(content))
-	p.frontmatterCache[filePath] = fm
+	fm := p.extractFrontmatter(head)
+	p.frontmatterCache.put(filePath, fm, info.ModTime())
 	return fm, nil
 }
+
+// readFile reads a whole file as a string along with its modification time.
+func readFile(path string) (string, time.Time, error) {
+	f, err := os.Open(path)
+	if err != nil {
+		return "", time.Time{}, err
+	}
+	defer f.Close()
+
+	info, err := f.Stat()
+	if err != nil {
+		return "", time.Time{}, err
+	}
+
+	var b strings.Builder
+	b.Grow(int(info.Size()))
+	if _, err := io.Copy(&b, f); err != nil {
+		return "", time.Time{}, err
+	}
+	return b.String(), info.ModTime(), nil
+}
+
+// ReadFrontmatterHead reads the start of a file, enough to hold its
+// frontmatter. The whole file is read only when a frontmatter block is
+// still open at the end of the first frontmatterHeadSize bytes.
+func ReadFrontmatterHead(path string) (string, error) {
+	f, err := os.Open(path)
+	if err != nil {
+		return "", err
+	}
+	defer f.Close()
+
+	buf := make([]byte, frontmatterHeadSize)
+	n, err := io.ReadFull(f, buf)
+	if err == io.EOF || err == io.ErrUnexpectedEOF {
+		return string(buf[:n]), nil
+	}
+	if err != nil {
+		return "", err
+	}
+
+	head := string(buf)
+	if !strings.HasPrefix(head, "---") || frontmatterPattern.MatchString(head) {
+		return head, nil
+	}
+
+	rest, err := io.ReadAll(f)
+	if err != nil {
+		return "", err
+	}
+	return head + string(rest), nil
+}
@@ -4,17 +4,15 @@ package parser
 import (
 	"os"
 	"path/filepath"
+	"strings"
 	"testing"
+	"time"
 )
 
 // Helper function to create a temp space directory
 func createTempSpace(t *testing.T) string {
 	t.Helper()
-	dir, err := os.MkdirTemp("", "test_space_")
-	if err != nil {
-		t.Fatalf("Failed to create temp dir: %v", err)
-	}
-	t.Cleanup(func() { os.RemoveAll(dir) })
+	dir := t.TempDir()
 	return dir
 }
 
@@ -449,6 +447,26 @@ func TestExtractTagsWithFrontmatter(t *testing.T) {
 	}
 }
 
+func TestExtractTagsDeduplicatesFrontmatter(t *testing.T) {
+	parser := NewSpaceParser("")
+	content := "Content with #shared and #inline"
+	frontmatter := map[string]any{
+		"tags": []interface{}{"shared", "", "extra", "extra"},
+	}
+
+	tags := parser.extractTags(content, frontmatter)
+
+	expected := []string{"shared", "inline", "extra"}
+	if len(tags) != len(expected) {
+		t.Fatalf("Expected %v, got %v", expected, tags)
+	}
+	for i, tag := range expected {
+		if tags[i] != tag {
+			t.Errorf("Expected tag %d to be %q, got %q", i, tag, tags[i])
+		}
+	}
+}
+
 // ==================== Frontmatter Tests ====================
 
 func TestExtractFrontmatter(t *testing.T) {
@@ -504,6 +522,98 @@ Body content.
 	}
 }
 
+func TestFrontmatterAbsent(t *testing.T) {
+	parser := NewSpaceParser("")
+	content := "# Title\n\n---\nnot: frontmatter\n---\n"
+
+	if fm := parser.extractFrontmatter(content); fm != nil {
+		t.Errorf("Expected nil frontmatter, got %v", fm)
+	}
+	if stripped := parser.stripFrontmatter(content); stripped != content {
+		t.Errorf("Content without frontmatter should be unchanged, got %q", stripped)
+	}
+}
+
+func TestGetFrontmatterRefreshesAfterEdit(t *testing.T) {
+	tmpDir := createTempSpace(t)
+	path := writeMarkdownFile(t, tmpDir, "Project.md", "---\ngithub: owner/old\n---\n# Project\n")
+
+	parser := NewSpaceParser(tmpDir)
+	if _, err := parser.ParseSpace(tmpDir); err != nil {
+		t.Fatalf("ParseSpace failed: %v", err)
+	}
+
+	fm, err := parser.GetFrontmatter(path)
+	if err != nil {
+		t.Fatalf("GetFrontmatter failed: %v", err)
+	}
+	if fm["github"] != "owner/old" {
+		t.Errorf("Expected github 'owner/old', got '%v'", fm["github"])
+	}
+
+	// Rewrite with a long body and a distinct modification time
+	body := strings.Repeat("Body line that is not frontmatter.\n", 1000)
+	writeMarkdownFile(t, tmpDir, "Project.md", "---\ngithub: owner/new\n---\n"+body)
+	later := time.Now().Add(time.Minute)
+	if err := os.Chtimes(path, later, later); err != nil {
+		t.Fatalf("Chtimes failed: %v", err)
+	}
+
+	fm, err = parser.GetFrontmatter(path)
+	if err != nil {
+		t.Fatalf("GetFrontmatter failed: %v", err)
+	}
+	if fm["github"] != "owner/new" {
+		t.Errorf("Expected github 'owner/new' after edit, got '%v'", fm["github"])
+	}
+}
+
+func TestGetFrontmatterLongerThanHead(t *testing.T) {
+	tmpDir := createTempSpace(t)
+	description := strings.Repeat("x", frontmatterHeadSize)
+	path := writeMarkdownFile(t, tmpDir, "Long.md", "---\ndescription: "+description+"\ngithub: owner/repo\n---\n# Long\n")
+
+	parser := NewSpaceParser(tmpDir)
+	fm, err := parser.GetFrontmatter(path)
+	if err != nil {
+		t.Fatalf("GetFrontmatter failed: %v", err)
+	}
+	if fm["github"] != "owner/repo" {
+		t.Errorf("Expected github 'owner/repo', got '%v'", fm["github"])
+	}
+}
+
+func TestReadFrontmatterHead(t *testing.T) {
+	tmpDir := createTempSpace(t)
+
+	frontmatter := "---\ntype: proposal\ntitle: Big Page\nstatus: pending\n---\n"
+	body := strings.Repeat("proposed page content\n", 1000)
+	largeBody := writeMarkdownFile(t, tmpDir, "LargeBody.md", frontmatter+body)
+
+	head, err := ReadFrontmatterHead(largeBody)
+	if err != nil {
+		t.Fatalf("ReadFrontmatterHead failed: %v", err)
+	}
+	if len(head) != frontmatterHeadSize {
+		t.Errorf("Expected only %d bytes to be read, got %d", frontmatterHeadSize, len(head))
+	}
+	if !strings.HasPrefix(head, frontmatter) {
+		t.Error("Expected the head to hold the frontmatter")
+	}
+
+	// Frontmatter longer than the head forces a full read
+	longFrontmatter := "---\ndescription: " + strings.Repeat("x", frontmatterHeadSize) + "\nstatus: accepted\n---\nbody"
+	longPath := writeMarkdownFile(t, tmpDir, "LongFrontmatter.md", longFrontmatter)
+
+	head, err = ReadFrontmatterHead(longPath)
+	if err != nil {
+		t.Fatalf("ReadFrontmatterHead failed: %v", err)
+	}
+	if head != longFrontmatter {
+		t.Error("Expected the whole file when frontmatter exceeds the head size")
+	}
+}
+
 // ==================== Folder Path Tests ====================
 
 func TestParserExtractsFolderPaths(t *testing.T) {
@@ -567,6 +677,63 @@ func TestParserExcludesHiddenDirectories(t *testing.T) {
 	}
 }
 
+func TestParserFindsFolderIndexPages(t *testing.T) {
+	tmpDir := createTempSpace(t)
+
+	writeMarkdownFile(t, tmpDir, "Projects.md", "# Projects")
+	writeMarkdownFile(t, tmpDir, "Projects/Project1.md", "# Project 1")
+	writeMarkdownFile(t, tmpDir, "Projects/Project1/notes.md", "# Notes")
+	writeMarkdownFile(t, tmpDir, "Area/Health.md", "# Health")
+
+	parser := NewSpaceParser(tmpDir)
+	indexPages, err := parser.GetFolderIndexPages(tmpDir)
+	if err != nil {
+		t.Fatalf("GetFolderIndexPages failed: %v", err)
+	}
+
+	if indexPages["Projects"] != "Projects.md" {
+		t.Errorf("Expected Projects index 'Projects.md', got %q", indexPages["Projects"])
+	}
+	if indexPages["Projects/Project1"] != filepath.Join("Projects", "Project1.md") {
+		t.Errorf("Expected Projects/Project1 index 'Projects/Project1.md', got %q", indexPages["Projects/Project1"])
+	}
+	if _, ok := indexPages["Area"]; ok {
+		t.Errorf("Area has no index page, got %q", indexPages["Area"])
+	}
+}
+
+func TestParseSpaceWithFolders(t *testing.T) {
+	tmpDir := createTempSpace(t)
+
+	writeMarkdownFile(t, tmpDir, "Projects.md", "# Projects")
+	writeMarkdownFile(t, tmpDir, "Projects/Project1/notes.md", "# Notes")
+
+	parser := NewSpaceParser(tmpDir)
+	chunks, folders, err := parser.ParseSpaceWithFolders(tmpDir)
+	if err != nil {
+		t.Fatalf("ParseSpaceWithFolders failed: %v", err)
+	}
+	if len(chunks) == 0 {
+		t.Error("Expected chunks from the space")
+	}
+	if !containsString(folders.Paths, "Projects") || !containsString(folders.Paths, filepath.Join("Projects", "Project1")) {
+		t.Errorf("Expected both folders, got %v", folders.Paths)
+	}
+	if folders.IndexPages["Projects"] != "Projects.md" {
+		t.Errorf("Expected Projects index 'Projects.md', got %q", folders.IndexPages["Projects"])
+	}
+
+	// Folder lookups after parsing see the space as it is now
+	writeMarkdownFile(t, tmpDir, "Area/Health.md", "# Health")
+	paths, err := parser.GetFolderPaths(tmpDir)
+	if err != nil {
+		t.Fatalf("GetFolderPaths failed: %v", err)
+	}
+	if !containsString(paths, "Area") {
+		t.Errorf("Expected a folder added after parsing to be found, got %v", paths)
+	}
+}
+
 func TestParserChunksHaveFolderPath(t *testing.T) {
 	tmpDir := createTempSpace(t)
 
@@ -725,6 +892,63 @@ func TestSkipProposalFiles(t *testing.T) {
 	}
 }
 
+// ==================== Parallel Parse Tests ====================
+
+func TestParseSpaceKeepsWalkOrderAcrossWorkers(t *testing.T) {
+	tmpDir := createTempSpace(t)
+
+	// Enough pages to take the concurrent path, one transcluding another
+	names := []string{"a", "b", "c", "d", "e", "f", "g", "h", "i", "j", "k", "l"}
+	for _, name := range names {
+		writeMarkdownFile(t, tmpDir, name+".md", "Page "+name+" body.")
+	}
+	writeMarkdownFile(t, tmpDir, "z.md", "Embeds ![[a]] here")
+
+	parser := NewSpaceParser(tmpDir)
+	chunks, err := parser.ParseSpace(tmpDir)
+	if err != nil {
+		t.Fatalf("ParseSpace failed: %v", err)
+	}
+
+	if len(chunks) != len(names)+1 {
+		t.Fatalf("Expected %d chunks, got %d", len(names)+1, len(chunks))
+	}
+	for i, name := range names {
+		if filepath.Base(chunks[i].FilePath) != name+".md" {
+			t.Errorf("Expected chunk %d from %s.md, got %s", i, name, chunks[i].FilePath)
+		}
+	}
+	if !contains(chunks[len(names)].Content, "Page a body.") {
+		t.Errorf("Expected transclusion to resolve, got: %s", chunks[len(names)].Content)
+	}
+}
+
+func TestFrontmatterCacheEvictsLeastRecentlyUsed(t *testing.T) {
+	c := newFrontmatterCache(2)
+	mod := time.Unix(1700000000, 0)
+
+	c.put("a.md", map[string]any{"title": "A"}, mod)
+	c.put("b.md", map[string]any{"title": "B"}, mod)
+	// Touch a.md so b.md becomes the eviction candidate
+	if _, ok := c.get("a.md", mod); !ok {
+		t.Fatal("Expected a.md to be cached")
+	}
+	c.put("c.md", map[string]any{"title": "C"}, mod)
+
+	if c.len() != 2 {
+		t.Errorf("Expected cache to hold 2 entries, got %d", c.len())
+	}
+	if _, ok := c.get("b.md", mod); ok {
+		t.Error("Expected b.md to be evicted")
+	}
+	if fm, ok := c.get("a.md", mod); !ok || fm["title"] != "A" {
+		t.Errorf("Expected a.md to survive eviction, got %v", fm)
+	}
+	if _, ok := c.get("c.md", mod.Add(time.Second)); ok {
+		t.Error("Expected a modification time mismatch to miss")
+	}
+}
+
 // ==================== Helpers ====================
 
 func contains(s, substr string) bool {
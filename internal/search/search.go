@@ -2,11 +2,17 @@
 package search
 
 import (
+	"container/heap"
+	"container/list"
 	"context"
 	"fmt"
 	"math"
+	"slices"
 	"sort"
+	"strconv"
 	"strings"
+	"sync"
+	"time"
 
 	"github.com/boblangley/silverbullet-rag/internal/db"
 	"github.com/boblangley/silverbullet-rag/internal/embeddings"
@@ -21,10 +27,19 @@ const (
 	FusionWeighted FusionMethod = "weighted"
 )
 
+const (
+	// resultCacheSize is the number of distinct searches whose results are kept.
+	resultCacheSize = 256
+	// resultCacheTTL bounds how long cached results are served. Writes through
+	// the database invalidate them sooner.
+	resultCacheTTL = time.Minute
+)
+
 // HybridSearch combines keyword and semantic search.
 type HybridSearch struct {
 	db        *db.GraphDB
 	embedding *embeddings.Service
+	cache     *resultCache
 }
 
 // NewHybridSearch creates a new hybrid search instance.
@@ -32,6 +47,7 @@ func NewHybridSearch(db *db.GraphDB, embedding *embeddings.Service) *HybridSearc
 	return &HybridSearch{
 		db:        db,
 		embedding: embedding,
+		cache:     newResultCache(resultCacheSize, resultCacheTTL),
 	}
 }
 
@@ -83,28 +99,88 @@ func (h *HybridSearch) Search(ctx context.Context, query string, opts SearchOpti
 		}
 	}
 
+	// Filters are sets: dedupe them once so the Cypher IN lists stay short
+	// and the same filters given in a different order share a cache entry.
+	opts.FilterTags = uniqueSorted(opts.FilterTags)
+	opts.FilterPages = uniqueSorted(opts.FilterPages)
+
+	// Serve repeated searches from the cache until the database changes.
+	// The generation is read before searching so a write that lands
+	// mid-search leaves the stored entry already stale.
+	var key string
+	var generation uint64
+	if h.cache != nil {
+		key = cacheKey(query, opts)
+		generation = h.db.Generation()
+		if results, ok := h.cache.get(key, generation); ok {
+			return results, nil
+		}
+	}
+
+	results, complete, err := h.search(ctx, query, opts)
+	if err != nil {
+		return nil, err
+	}
+
+	// Keyword-only fallbacks are not cached so a transient embedding
+	// failure does not outlive the search it happened in
+	if h.cache != nil && complete {
+		h.cache.put(key, generation, results)
+	}
+	return results, nil
+}
+
+// queryEmbeddingResult carries an embedding computed in the background.
+type queryEmbeddingResult struct {
+	embedding []float32
+	err       error
+}
+
+// search runs keyword and semantic search and fuses the results. complete
+// is false when the semantic search was wanted but failed, leaving only
+// keyword results.
+func (h *HybridSearch) search(ctx context.Context, query string, opts SearchOptions) ([]types.SearchResult, bool, error) {
+	// Embed the query while the keyword search runs: the embedding call is
+	// independent of it and usually the slower of the two. The embedding
+	// service caches embeddings by content, so repeated queries reuse one.
+	var embedded chan queryEmbeddingResult
+	if h.db.EnableEmbeddings() && h.embedding != nil {
+		embedded = make(chan queryEmbeddingResult, 1)
+		go func() {
+			embedding, err := h.embedding.GenerateEmbedding(ctx, query, true)
+			embedded <- queryEmbeddingResult{embedding, err}
+		}()
+	}
+
 	// Perform keyword search
 	keywordResults, err := h.keywordSearch(ctx, query, opts)
 	if err != nil {
-		return nil, fmt.Errorf("keyword search: %w", err)
+		return nil, false, fmt.Errorf("keyword search: %w", err)
 	}
 
 	// Perform semantic search if embeddings enabled
 	var semanticResults []scoredChunk
-	if h.db.EnableEmbeddings() && h.embedding != nil {
-		semanticResults, err = h.semanticSearch(ctx, query, opts)
+	complete := true
+	if embedded != nil {
+		// Fall back to keyword-only if either step fails
+		r := <-embedded
+		if r.err == nil {
+			semanticResults, err = h.semanticSearch(ctx, r.embedding, opts)
+		} else {
+			err = r.err
+		}
 		if err != nil {
-			// Fall back to keyword-only
 			semanticResults = nil
+			complete = false
 		}
 	}
 
 	// If only one type has results, return those
 	if len(semanticResults) == 0 {
-		return formatResults(keywordResults, true, false), nil
+		return formatResults(keywordResults, true, false), complete, nil
 	}
 	if len(keywordResults) == 0 {
-		return formatResults(semanticResults, false, true), nil
+		return formatResults(semanticResults, false, true), complete, nil
 	}
 
 	// Fuse results
@@ -115,20 +191,152 @@ func (h *HybridSearch) Search(ctx context.Context, query string, opts SearchOpti
 		fused = h.weightedFusion(keywordResults, semanticResults, opts)
 	}
 
-	// Apply post-fusion filtering
-	if len(opts.FilterTags) > 0 {
-		fused = h.filterByTags(ctx, fused, opts.FilterTags)
-	}
-	if len(opts.FilterPages) > 0 {
-		fused = filterByPages(fused, opts.FilterPages)
-	}
-
 	// Limit results
 	if len(fused) > opts.Limit {
 		fused = fused[:opts.Limit]
 	}
 
-	return fused, nil
+	return fused, complete, nil
+}
+
+// uniqueSorted returns the distinct values in sorted order without
+// modifying values. It returns nil when values is empty.
+func uniqueSorted(values []string) []string {
+	if len(values) == 0 {
+		return nil
+	}
+	out := slices.Clone(values)
+	slices.Sort(out)
+	return slices.Compact(out)
+}
+
+// cacheKey identifies a search by its query and normalized options.
+func cacheKey(query string, opts SearchOptions) string {
+	var b strings.Builder
+	b.WriteString(query)
+	b.WriteByte(0)
+	b.WriteString(strconv.Itoa(opts.Limit))
+	b.WriteByte(0)
+	b.WriteString(strings.Join(opts.FilterTags, "\x1f"))
+	b.WriteByte(0)
+	b.WriteString(strings.Join(opts.FilterPages, "\x1f"))
+	b.WriteByte(0)
+	b.WriteString(opts.Scope)
+	b.WriteByte(0)
+	b.WriteString(string(opts.FusionMethod))
+	b.WriteByte(0)
+	b.WriteString(strconv.FormatFloat(opts.SemanticWeight, 'g', -1, 64))
+	b.WriteByte(0)
+	b.WriteString(strconv.FormatFloat(opts.KeywordWeight, 'g', -1, 64))
+	return b.String()
+}
+
+// lru is a least-recently-used cache keyed by string. It is safe for
+// concurrent use.
+type lru[V any] struct {
+	mu      sync.Mutex
+	maxSize int
+	order   *list.List // most recently used at the front
+	entries map[string]*list.Element
+}
+
+type lruEntry[V any] struct {
+	key   string
+	value V
+}
+
+func newLRU[V any](maxSize int) *lru[V] {
+	return &lru[V]{
+		maxSize: maxSize,
+		order:   list.New(),
+		entries: make(map[string]*list.Element),
+	}
+}
+
+// get returns the value stored for key and marks it most recently used.
+func (c *lru[V]) get(key string) (V, bool) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	el, ok := c.entries[key]
+	if !ok {
+		var zero V
+		return zero, false
+	}
+	c.order.MoveToFront(el)
+	return el.Value.(*lruEntry[V]).value, true
+}
+
+// put stores value for key, evicting the least recently used entry once
+// the cache is full.
+func (c *lru[V]) put(key string, value V) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	if el, ok := c.entries[key]; ok {
+		el.Value.(*lruEntry[V]).value = value
+		c.order.MoveToFront(el)
+		return
+	}
+
+	c.entries[key] = c.order.PushFront(&lruEntry[V]{key: key, value: value})
+	if c.order.Len() > c.maxSize {
+		oldest := c.order.Back()
+		c.order.Remove(oldest)
+		delete(c.entries, oldest.Value.(*lruEntry[V]).key)
+	}
+}
+
+// remove drops key from the cache.
+func (c *lru[V]) remove(key string) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	if el, ok := c.entries[key]; ok {
+		c.order.Remove(el)
+		delete(c.entries, key)
+	}
+}
+
+// resultCache caches search results for a limited time. Entries are tagged
+// with the database generation they were computed at and are discarded once
+// it moves on.
+type resultCache struct {
+	ttl     time.Duration
+	entries *lru[resultCacheEntry]
+}
+
+type resultCacheEntry struct {
+	generation uint64
+	expires    time.Time
+	results    []types.SearchResult
+}
+
+func newResultCache(maxSize int, ttl time.Duration) *resultCache {
+	return &resultCache{ttl: ttl, entries: newLRU[resultCacheEntry](maxSize)}
+}
+
+// get returns a copy of the cached results for key if they were computed at
+// the given generation and have not expired.
+func (c *resultCache) get(key string, generation uint64) ([]types.SearchResult, bool) {
+	e, ok := c.entries.get(key)
+	if !ok {
+		return nil, false
+	}
+	if e.generation != generation || time.Now().After(e.expires) {
+		c.entries.remove(key)
+		return nil, false
+	}
+	return append([]types.SearchResult(nil), e.results...), true
+}
+
+// put stores a copy of results for key.
+func (c *resultCache) put(key string, generation uint64, results []types.SearchResult) {
+	c.entries.put(key, resultCacheEntry{
+		generation: generation,
+		expires:    time.Now().Add(c.ttl),
+		results:    append([]types.SearchResult(nil), results...),
+	})
 }
 
 type scoredChunk struct {
@@ -136,6 +344,14 @@ type scoredChunk struct {
 	score float64
 }
 
+// loweredChunk caches the lowercased fields keyword scoring matches against.
+type loweredChunk struct {
+	chunk    types.Chunk
+	content  string
+	header   string
+	filePath string
+}
+
 func (h *HybridSearch) keywordSearch(ctx context.Context, keyword string, opts SearchOptions) ([]scoredChunk, error) {
 	// Get total document count for IDF
 	var totalDocs int
@@ -177,6 +393,18 @@ func (h *HybridSearch) keywordSearch(ctx context.Context, keyword string, opts S
 		params["scope_prefix"] = opts.Scope + "/"
 	}
 
+	// Push tag and page filters into the query so only matching candidates
+	// are scored and fused
+	var filterWhere string
+	if len(opts.FilterTags) > 0 {
+		filterWhere += " AND EXISTS { MATCH (c)-[:TAGGED]->(t:Tag) WHERE t.name IN $tags }"
+		params["tags"] = opts.FilterTags
+	}
+	if len(opts.FilterPages) > 0 {
+		filterWhere += " AND c.file_path IN $pages"
+		params["pages"] = opts.FilterPages
+	}
+
 	// Build WHERE clause for terms
 	var whereClauses []string
 	for i, term := range queryTerms {
@@ -186,7 +414,7 @@ func (h *HybridSearch) keywordSearch(ctx context.Context, keyword string, opts S
 		params[paramName] = term
 	}
 
-	query := fmt.Sprintf("MATCH (c:Chunk)%s WHERE (%s)%s RETURN c", scopeMatch, strings.Join(whereClauses, " OR "), scopeWhere)
+	query := fmt.Sprintf("MATCH (c:Chunk)%s WHERE (%s)%s%s RETURN %s", scopeMatch, strings.Join(whereClauses, " OR "), scopeWhere, filterWhere, chunkColumns)
 	records, err := h.db.Execute(ctx, query, params)
 	if err != nil {
 		return nil, err
@@ -196,59 +424,67 @@ func (h *HybridSearch) keywordSearch(ctx context.Context, keyword string, opts S
 	k1 := 1.5
 	b := 0.75
 
-	// Calculate average document length
+	// Lowercase each chunk's searchable fields once; they are reused for
+	// every query term in both the document frequency and scoring passes.
 	var totalLen int
-	chunks := make([]types.Chunk, 0, len(records))
+	chunks := make([]loweredChunk, 0, len(records))
 	for _, rec := range records {
 		chunk := recordToChunk(rec)
-		chunks = append(chunks, chunk)
+		chunks = append(chunks, loweredChunk{
+			chunk:    chunk,
+			content:  strings.ToLower(chunk.Content),
+			header:   strings.ToLower(chunk.Header),
+			filePath: strings.ToLower(chunk.FilePath),
+		})
 		totalLen += len(chunk.Content)
 	}
 	avgDocLen := float64(totalLen) / float64(len(chunks))
 
-	// Calculate document frequencies
-	termDocFreqs := make(map[string]int)
-	for _, term := range queryTerms {
-		for _, chunk := range chunks {
-			content := strings.ToLower(chunk.Content + " " + chunk.Header + " " + chunk.FilePath)
-			if strings.Contains(content, term) {
-				termDocFreqs[term]++
+	// Count each term's weighted occurrences in each chunk once, into a
+	// flat chunk-by-term matrix. Document frequencies come from the same
+	// counts: a chunk contains a term exactly when its count is non-zero.
+	// Terms never contain whitespace, so counting each field separately
+	// matches searching them joined by spaces.
+	numTerms := len(queryTerms)
+	tfs := make([]float64, len(chunks)*numTerms)
+	docFreqs := make([]float64, numTerms)
+	for i, lc := range chunks {
+		row := tfs[i*numTerms : (i+1)*numTerms]
+		for j, term := range queryTerms {
+			tf := float64(strings.Count(lc.content, term))
+			tf += float64(strings.Count(lc.header, term)) * 2.0   // Header boost
+			tf += float64(strings.Count(lc.filePath, term)) * 1.5 // Path boost
+			row[j] = tf
+			if tf > 0 {
+				docFreqs[j]++
 			}
 		}
 	}
 
+	// IDF with smoothing, once per term
+	idfs := make([]float64, numTerms)
+	for j, df := range docFreqs {
+		if df == 0 {
+			df = 1
+		}
+		idfs[j] = math.Log((float64(totalDocs)-df+0.5)/(df+0.5) + 1.0)
+	}
+
 	// Score chunks
-	var results []scoredChunk
-	for _, chunk := range chunks {
-		content := strings.ToLower(chunk.Content)
-		header := strings.ToLower(chunk.Header)
-		filePath := strings.ToLower(chunk.FilePath)
-		docLen := float64(len(chunk.Content))
+	results := make([]scoredChunk, 0, len(chunks))
+	for i, lc := range chunks {
+		lengthNorm := k1 * (1 - b + b*float64(len(lc.chunk.Content))/avgDocLen)
 
 		var bm25Score float64
-		for _, term := range queryTerms {
-			tf := float64(strings.Count(content, term))
-			tf += float64(strings.Count(header, term)) * 2.0   // Header boost
-			tf += float64(strings.Count(filePath, term)) * 1.5 // Path boost
-
+		for j, tf := range tfs[i*numTerms : (i+1)*numTerms] {
 			if tf == 0 {
 				continue
 			}
-
-			df := float64(termDocFreqs[term])
-			if df == 0 {
-				df = 1
-			}
-
-			// IDF with smoothing
-			idf := math.Log((float64(totalDocs)-df+0.5)/(df+0.5) + 1.0)
-
 			// BM25 formula
-			normalizedTF := (tf * (k1 + 1)) / (tf + k1*(1-b+b*docLen/avgDocLen))
-			bm25Score += idf * normalizedTF
+			bm25Score += idfs[j] * ((tf * (k1 + 1)) / (tf + lengthNorm))
 		}
 
-		results = append(results, scoredChunk{chunk: chunk, score: bm25Score})
+		results = append(results, scoredChunk{chunk: lc.chunk, score: bm25Score})
 	}
 
 	// Sort by score descending
@@ -259,17 +495,7 @@ func (h *HybridSearch) keywordSearch(ctx context.Context, keyword string, opts S
 	return results, nil
 }
 
-func (h *HybridSearch) semanticSearch(ctx context.Context, query string, opts SearchOptions) ([]scoredChunk, error) {
-	if h.embedding == nil {
-		return nil, fmt.Errorf("embeddings not enabled")
-	}
-
-	// Generate query embedding
-	queryEmbedding, err := h.embedding.GenerateEmbedding(ctx, query, true)
-	if err != nil {
-		return nil, err
-	}
-
+func (h *HybridSearch) semanticSearch(ctx context.Context, queryEmbedding []float32, opts SearchOptions) ([]scoredChunk, error) {
 	// Build filter conditions
 	conditions := []string{"c.embedding IS NOT NULL"}
 	params := map[string]any{"limit": opts.Limit * 2}
@@ -300,10 +526,10 @@ func (h *HybridSearch) semanticSearch(ctx context.Context, query string, opts Se
 	cypherQuery := fmt.Sprintf(`
 		MATCH (c:Chunk)
 		WHERE %s
-		RETURN c, ARRAY_COSINE_SIMILARITY(c.embedding, %s) AS similarity
+		RETURN %s, ARRAY_COSINE_SIMILARITY(c.embedding, %s) AS similarity
 		ORDER BY similarity DESC
 		LIMIT $limit
-	`, strings.Join(conditions, " AND "), embeddingLiteral)
+	`, strings.Join(conditions, " AND "), chunkColumns, embeddingLiteral)
 
 	records, err := h.db.Execute(ctx, cypherQuery, params)
 	if err != nil {
@@ -326,66 +552,66 @@ func (h *HybridSearch) semanticSearch(ctx context.Context, query string, opts Se
 func (h *HybridSearch) reciprocalRankFusion(keyword, semantic []scoredChunk, limit int) []types.SearchResult {
 	const k = 60.0
 
-	rrfScores := make(map[string]float64)
-	chunkData := make(map[string]types.Chunk)
-
-	// Process keyword results
-	for rank, sc := range keyword {
-		rrfScores[sc.chunk.ID] += 1.0 / (k + float64(rank+1))
-		chunkData[sc.chunk.ID] = sc.chunk
+	// Accumulate scores into a dense slice in first-seen order; the map only
+	// resolves a chunk ID to its slot.
+	results := make([]types.SearchResult, 0, len(keyword)+len(semantic))
+	slots := make(map[string]int, len(keyword)+len(semantic))
+	accumulate := func(list []scoredChunk) {
+		for rank, sc := range list {
+			contribution := 1.0 / (k + float64(rank+1))
+			if i, ok := slots[sc.chunk.ID]; ok {
+				results[i].HybridScore += contribution
+				continue
+			}
+			slots[sc.chunk.ID] = len(results)
+			results = append(results, types.SearchResult{Chunk: sc.chunk, HybridScore: contribution})
+		}
 	}
+	accumulate(keyword)
+	accumulate(semantic)
 
-	// Process semantic results
-	for rank, sc := range semantic {
-		rrfScores[sc.chunk.ID] += 1.0 / (k + float64(rank+1))
-		if _, exists := chunkData[sc.chunk.ID]; !exists {
-			chunkData[sc.chunk.ID] = sc.chunk
-		}
+	if len(results) == 0 {
+		return results
 	}
 
-	// Normalize scores
-	if len(rrfScores) > 0 {
-		var maxScore, minScore float64 = 0, math.MaxFloat64
-		for _, s := range rrfScores {
-			if s > maxScore {
-				maxScore = s
-			}
-			if s < minScore {
-				minScore = s
-			}
-		}
-		scoreRange := maxScore - minScore
-		if scoreRange == 0 {
-			scoreRange = 1
+	// Min-max normalization preserves order, so select the top results on
+	// the raw sums and only rescale the ones that are returned.
+	var maxScore, minScore float64 = 0, math.MaxFloat64
+	for _, r := range results {
+		if r.HybridScore > maxScore {
+			maxScore = r.HybridScore
 		}
-		for id := range rrfScores {
-			rrfScores[id] = (rrfScores[id] - minScore) / scoreRange
+		if r.HybridScore < minScore {
+			minScore = r.HybridScore
 		}
 	}
-
-	// Build results
-	var results []types.SearchResult
-	for id, score := range rrfScores {
-		results = append(results, types.SearchResult{
-			Chunk:       chunkData[id],
-			HybridScore: score,
-		})
+	scoreRange := maxScore - minScore
+	if scoreRange == 0 {
+		scoreRange = 1
 	}
 
-	sort.Slice(results, func(i, j int) bool {
-		return results[i].HybridScore > results[j].HybridScore
-	})
-
-	if len(results) > limit {
-		results = results[:limit]
+	top := topResults(results, limit)
+	for i := range top {
+		top[i].HybridScore = (top[i].HybridScore - minScore) / scoreRange
 	}
-
-	return results
+	return top
 }
 
 func (h *HybridSearch) weightedFusion(keyword, semantic []scoredChunk, opts SearchOptions) []types.SearchResult {
+	// Index results by chunk ID once; keyword and semantic scores are then
+	// written straight into each chunk's slot.
+	results := make([]types.SearchResult, 0, len(keyword)+len(semantic))
+	slots := make(map[string]int, len(keyword)+len(semantic))
+	slotFor := func(chunk types.Chunk) int {
+		if i, ok := slots[chunk.ID]; ok {
+			return i
+		}
+		slots[chunk.ID] = len(results)
+		results = append(results, types.SearchResult{Chunk: chunk})
+		return len(results) - 1
+	}
+
 	// Normalize keyword scores
-	keywordScores := make(map[string]float64)
 	if len(keyword) > 0 {
 		var maxScore, minScore float64 = 0, math.MaxFloat64
 		for _, sc := range keyword {
@@ -401,90 +627,95 @@ func (h *HybridSearch) weightedFusion(keyword, semantic []scoredChunk, opts Sear
 			scoreRange = 1
 		}
 		for _, sc := range keyword {
-			keywordScores[sc.chunk.ID] = (sc.score - minScore) / scoreRange
+			results[slotFor(sc.chunk)].KeywordScore = (sc.score - minScore) / scoreRange
 		}
 	}
 
 	// Normalize semantic scores (use rank-based)
-	semanticScores := make(map[string]float64)
 	for rank, sc := range semantic {
-		semanticScores[sc.chunk.ID] = math.Exp(-0.1 * float64(rank+1))
+		results[slotFor(sc.chunk)].SemanticScore = rankDecay(rank)
 	}
 
-	// Collect all chunks
-	chunkData := make(map[string]types.Chunk)
-	for _, sc := range keyword {
-		chunkData[sc.chunk.ID] = sc.chunk
-	}
-	for _, sc := range semantic {
-		if _, exists := chunkData[sc.chunk.ID]; !exists {
-			chunkData[sc.chunk.ID] = sc.chunk
-		}
+	// Calculate weighted scores
+	for i := range results {
+		r := &results[i]
+		r.HybridScore = opts.KeywordWeight*r.KeywordScore + opts.SemanticWeight*r.SemanticScore
 	}
 
-	// Calculate weighted scores
-	var results []types.SearchResult
-	for id, chunk := range chunkData {
-		kwScore := keywordScores[id]
-		semScore := semanticScores[id]
-		hybridScore := opts.KeywordWeight*kwScore + opts.SemanticWeight*semScore
-
-		results = append(results, types.SearchResult{
-			Chunk:         chunk,
-			HybridScore:   hybridScore,
-			KeywordScore:  kwScore,
-			SemanticScore: semScore,
+	return topResults(results, opts.Limit)
+}
+
+// topResults returns the k highest-scoring results in descending order,
+// keeping ties in their original order. When k is smaller than the number
+// of candidates only a k-sized heap is maintained instead of sorting them
+// all. A non-positive k returns every result.
+func topResults(results []types.SearchResult, k int) []types.SearchResult {
+	if k <= 0 || k >= len(results) {
+		sort.SliceStable(results, func(i, j int) bool {
+			return results[i].HybridScore > results[j].HybridScore
 		})
+		return results
 	}
 
-	sort.Slice(results, func(i, j int) bool {
-		return results[i].HybridScore > results[j].HybridScore
-	})
+	h := &resultHeap{results: results, idx: make([]int, 0, k)}
+	for i := range results {
+		if len(h.idx) < k {
+			heap.Push(h, i)
+		} else if h.ranksAhead(i, h.idx[0]) {
+			h.idx[0] = i
+			heap.Fix(h, 0)
+		}
+	}
 
-	return results
+	// The heap yields the weakest result first, so fill from the back
+	top := make([]types.SearchResult, len(h.idx))
+	for n := len(top) - 1; n >= 0; n-- {
+		top[n] = results[heap.Pop(h).(int)]
+	}
+	return top
 }
 
-func (h *HybridSearch) filterByTags(ctx context.Context, results []types.SearchResult, tags []string) []types.SearchResult {
-	var filtered []types.SearchResult
-	for _, r := range results {
-		records, err := h.db.Execute(ctx, `
-			MATCH (c:Chunk {id: $chunk_id})-[:TAGGED]->(t:Tag)
-			RETURN t.name as tag
-		`, map[string]any{"chunk_id": r.Chunk.ID})
-		if err != nil {
-			continue
-		}
-
-		chunkTags := make(map[string]struct{})
-		for _, rec := range records {
-			if tag, ok := rec["tag"].(string); ok {
-				chunkTags[tag] = struct{}{}
-			}
-		}
+// resultHeap is a min-heap of result indexes with the weakest result on top.
+type resultHeap struct {
+	results []types.SearchResult
+	idx     []int
+}
 
-		for _, tag := range tags {
-			if _, exists := chunkTags[tag]; exists {
-				filtered = append(filtered, r)
-				break
-			}
-		}
+// ranksAhead reports whether result i ranks ahead of result j.
+func (h *resultHeap) ranksAhead(i, j int) bool {
+	if h.results[i].HybridScore != h.results[j].HybridScore {
+		return h.results[i].HybridScore > h.results[j].HybridScore
 	}
-	return filtered
+	return i < j
+}
+
+func (h *resultHeap) Len() int           { return len(h.idx) }
+func (h *resultHeap) Less(a, b int) bool { return h.ranksAhead(h.idx[b], h.idx[a]) }
+func (h *resultHeap) Swap(a, b int)      { h.idx[a], h.idx[b] = h.idx[b], h.idx[a] }
+func (h *resultHeap) Push(x any)         { h.idx = append(h.idx, x.(int)) }
+func (h *resultHeap) Pop() any {
+	n := len(h.idx)
+	i := h.idx[n-1]
+	h.idx = h.idx[:n-1]
+	return i
 }
 
-func filterByPages(results []types.SearchResult, pages []string) []types.SearchResult {
-	pageSet := make(map[string]struct{})
-	for _, p := range pages {
-		pageSet[p] = struct{}{}
+// rankDecayTable holds exp(-0.1 * (rank+1)) for the ranks semantic results
+// usually occupy, so scoring them is a table lookup.
+var rankDecayTable = func() [256]float64 {
+	var table [256]float64
+	for rank := range table {
+		table[rank] = math.Exp(-0.1 * float64(rank+1))
 	}
+	return table
+}()
 
-	var filtered []types.SearchResult
-	for _, r := range results {
-		if _, exists := pageSet[r.Chunk.FilePath]; exists {
-			filtered = append(filtered, r)
-		}
+// rankDecay returns the rank-based score for a zero-based result rank.
+func rankDecay(rank int) float64 {
+	if rank < len(rankDecayTable) {
+		return rankDecayTable[rank]
 	}
-	return filtered
+	return math.Exp(-0.1 * float64(rank+1))
 }
 
 func formatResults(chunks []scoredChunk, keywordOnly, semanticOnly bool) []types.SearchResult {
@@ -495,7 +726,7 @@ func formatResults(chunks []scoredChunk, keywordOnly, semanticOnly bool) []types
 			r.HybridScore = sc.score
 			r.KeywordScore = sc.score
 		} else if semanticOnly {
-			rankScore := math.Exp(-0.1 * float64(i+1))
+			rankScore := rankDecay(i)
 			r.HybridScore = rankScore
 			r.SemanticScore = rankScore
 		}
@@ -504,27 +735,28 @@ func formatResults(chunks []scoredChunk, keywordOnly, semanticOnly bool) []types
 	return results
 }
 
+// chunkColumns projects the chunk properties that search results carry.
+// Returning the whole node would also ship every chunk's embedding vector
+// out of the database only for it to be discarded.
+const chunkColumns = "c.id AS id, c.file_path AS file_path, c.header AS header, c.content AS content, c.folder_path AS folder_path"
+
+// recordToChunk builds a chunk from a record produced with chunkColumns.
 func recordToChunk(rec db.Record) types.Chunk {
 	chunk := types.Chunk{}
-
-	// The db package converts lbug.Node to map[string]any
-	if c, ok := rec["c"].(map[string]any); ok {
-		if v, ok := c["id"].(string); ok {
-			chunk.ID = v
-		}
-		if v, ok := c["file_path"].(string); ok {
-			chunk.FilePath = v
-		}
-		if v, ok := c["header"].(string); ok {
-			chunk.Header = v
-		}
-		if v, ok := c["content"].(string); ok {
-			chunk.Content = v
-		}
-		if v, ok := c["folder_path"].(string); ok {
-			chunk.FolderPath = v
-		}
+	if v, ok := rec["id"].(string); ok {
+		chunk.ID = v
+	}
+	if v, ok := rec["file_path"].(string); ok {
+		chunk.FilePath = v
+	}
+	if v, ok := rec["header"].(string); ok {
+		chunk.Header = v
+	}
+	if v, ok := rec["content"].(string); ok {
+		chunk.Content = v
+	}
+	if v, ok := rec["folder_path"].(string); ok {
+		chunk.FolderPath = v
 	}
-
 	return chunk
 }
@@ -7,6 +7,7 @@ import (
 	"os"
 	"path/filepath"
 	"strings"
+	"sync"
 	"testing"
 
 	"github.com/boblangley/silverbullet-rag/internal/db"
@@ -14,10 +15,19 @@ import (
 	"github.com/boblangley/silverbullet-rag/internal/types"
 )
 
+// envFileOnce guards loadEnvFile so the .env file is read once per test
+// binary rather than once per test.
+var envFileOnce sync.Once
+
 // loadEnvFile loads environment variables from a .env file.
 func loadEnvFile(t *testing.T) {
 	t.Helper()
+	envFileOnce.Do(readEnvFile)
+}
 
+// readEnvFile sets variables from the first .env file found that are not
+// already set in the environment.
+func readEnvFile() {
 	envPaths := []string{
 		"../../.env",
 		"../.env",
@@ -60,6 +70,24 @@ func loadEnvFile(t *testing.T) {
 	}
 }
 
+// embedChunks sets each chunk's embedding from its cleaned content, using a
+// single batched request rather than one request per chunk.
+func embedChunks(t *testing.T, svc *embeddings.Service, chunks []types.Chunk) {
+	t.Helper()
+
+	contents := make([]string, len(chunks))
+	for i, chunk := range chunks {
+		contents[i] = chunk.Content
+	}
+	embeds, err := svc.GenerateEmbeddingsBatch(context.Background(), contents, true)
+	if err != nil {
+		t.Fatalf("Failed to generate embeddings: %v", err)
+	}
+	for i := range chunks {
+		chunks[i].Embedding = embeds[i]
+	}
+}
+
 // ==================== Semantic Search Integration Tests ====================
 // These tests require OPENAI_API_KEY and test the full pipeline:
 // 1. Generate embeddings via OpenAI
@@ -68,6 +96,10 @@ func loadEnvFile(t *testing.T) {
 // 4. Verify results are ranked by semantic relevance
 
 func TestSemanticSearchWithEmbeddingsIntegration(t *testing.T) {
+	if testing.Short() {
+		t.Skip("skipping OpenAI integration test in short mode")
+	}
+
 	loadEnvFile(t)
 
 	apiKey := os.Getenv("OPENAI_API_KEY")
@@ -130,15 +162,11 @@ func TestSemanticSearchWithEmbeddingsIntegration(t *testing.T) {
 		},
 	}
 
-	// Generate embeddings for each chunk
+	// Generate embeddings for all chunks
 	t.Log("Generating embeddings for test chunks...")
-	for i := range chunks {
-		embedding, err := embeddingSvc.GenerateEmbedding(ctx, chunks[i].Content, true)
-		if err != nil {
-			t.Fatalf("Failed to generate embedding for chunk %d: %v", i, err)
-		}
-		chunks[i].Embedding = embedding
-		t.Logf("Generated embedding for %s (%d dimensions)", chunks[i].ID, len(embedding))
+	embedChunks(t, embeddingSvc, chunks)
+	for _, chunk := range chunks {
+		t.Logf("Generated embedding for %s (%d dimensions)", chunk.ID, len(chunk.Embedding))
 	}
 
 	// Index chunks with embeddings
@@ -234,6 +262,10 @@ func TestSemanticSearchWithEmbeddingsIntegration(t *testing.T) {
 }
 
 func TestHybridSearchFusionWithEmbeddingsIntegration(t *testing.T) {
+	if testing.Short() {
+		t.Skip("skipping OpenAI integration test in short mode")
+	}
+
 	loadEnvFile(t)
 
 	apiKey := os.Getenv("OPENAI_API_KEY")
@@ -280,13 +312,7 @@ func TestHybridSearchFusionWithEmbeddingsIntegration(t *testing.T) {
 	}
 
 	// Generate embeddings
-	for i := range chunks {
-		embedding, err := embeddingSvc.GenerateEmbedding(ctx, chunks[i].Content, true)
-		if err != nil {
-			t.Fatalf("Failed to generate embedding: %v", err)
-		}
-		chunks[i].Embedding = embedding
-	}
+	embedChunks(t, embeddingSvc, chunks)
 
 	if err := graphDB.IndexChunks(ctx, chunks); err != nil {
 		t.Fatalf("Failed to index chunks: %v", err)
@@ -364,6 +390,10 @@ func TestHybridSearchFusionWithEmbeddingsIntegration(t *testing.T) {
 }
 
 func TestSemanticSearchWithScopeIntegration(t *testing.T) {
+	if testing.Short() {
+		t.Skip("skipping OpenAI integration test in short mode")
+	}
+
 	loadEnvFile(t)
 
 	apiKey := os.Getenv("OPENAI_API_KEY")
@@ -415,13 +445,7 @@ func TestSemanticSearchWithScopeIntegration(t *testing.T) {
 		},
 	}
 
-	for i := range chunks {
-		embedding, err := embeddingSvc.GenerateEmbedding(ctx, chunks[i].Content, true)
-		if err != nil {
-			t.Fatalf("Failed to generate embedding: %v", err)
-		}
-		chunks[i].Embedding = embedding
-	}
+	embedChunks(t, embeddingSvc, chunks)
 
 	if err := graphDB.IndexChunks(ctx, chunks); err != nil {
 		t.Fatalf("Failed to index chunks: %v", err)
@@ -452,6 +476,10 @@ func TestSemanticSearchWithScopeIntegration(t *testing.T) {
 }
 
 func TestLadybugDBEmbeddingStorageIntegration(t *testing.T) {
+	if testing.Short() {
+		t.Skip("skipping OpenAI integration test in short mode")
+	}
+
 	loadEnvFile(t)
 
 	apiKey := os.Getenv("OPENAI_API_KEY")
@@ -3,22 +3,26 @@ package search
 
 import (
 	"context"
+	"fmt"
+	"math"
+	"net/http"
+	"net/http/httptest"
 	"os"
 	"path/filepath"
+	"sync"
+	"sync/atomic"
 	"testing"
+	"time"
 
 	"github.com/boblangley/silverbullet-rag/internal/db"
+	"github.com/boblangley/silverbullet-rag/internal/embeddings"
 	"github.com/boblangley/silverbullet-rag/internal/types"
 )
 
 // Helper function to create a temp db directory
 func createTempDB(t *testing.T) string {
 	t.Helper()
-	dir, err := os.MkdirTemp("", "test_db_")
-	if err != nil {
-		t.Fatalf("Failed to create temp dir: %v", err)
-	}
-	t.Cleanup(func() { os.RemoveAll(dir) })
+	dir := t.TempDir()
 	return filepath.Join(dir, "test.lbug")
 }
 
@@ -79,6 +83,48 @@ func createDiverseDocs() []types.Chunk {
 	}
 }
 
+// sharedDiverseDB holds a database with createDiverseDocs indexed. It is
+// built on first use and shared by the tests that only read from it.
+var sharedDiverseDB struct {
+	once sync.Once
+	dir  string
+	db   *db.GraphDB
+	err  error
+}
+
+// diverseDocsDB returns the shared read-only database of diverse docs.
+// Tests must not write to it.
+func diverseDocsDB(t *testing.T) *db.GraphDB {
+	t.Helper()
+	shared := &sharedDiverseDB
+	shared.once.Do(func() {
+		shared.dir, shared.err = os.MkdirTemp("", "test_db_")
+		if shared.err != nil {
+			return
+		}
+		shared.db, shared.err = db.Open(db.Config{Path: filepath.Join(shared.dir, "test.lbug")})
+		if shared.err != nil {
+			return
+		}
+		shared.err = shared.db.IndexChunks(context.Background(), createDiverseDocs())
+	})
+	if shared.err != nil {
+		t.Fatalf("Failed to build shared database: %v", shared.err)
+	}
+	return shared.db
+}
+
+func TestMain(m *testing.M) {
+	code := m.Run()
+	if sharedDiverseDB.db != nil {
+		sharedDiverseDB.db.Close()
+	}
+	if sharedDiverseDB.dir != "" {
+		os.RemoveAll(sharedDiverseDB.dir)
+	}
+	os.Exit(code)
+}
+
 // ==================== Initialization Tests ====================
 
 func TestHybridSearchInitialization(t *testing.T) {
@@ -101,13 +147,7 @@ func TestHybridSearchInitialization(t *testing.T) {
 
 func TestHybridSearchKeywordOnly(t *testing.T) {
 	ctx := context.Background()
-	graphDB := openTestDB(t, false)
-
-	chunks := createDiverseDocs()
-	err := graphDB.IndexChunks(ctx, chunks)
-	if err != nil {
-		t.Fatalf("IndexChunks failed: %v", err)
-	}
+	graphDB := diverseDocsDB(t)
 
 	hybridSearch := NewHybridSearch(graphDB, nil)
 
@@ -131,13 +171,7 @@ func TestHybridSearchKeywordOnly(t *testing.T) {
 
 func TestHybridSearchResultSorting(t *testing.T) {
 	ctx := context.Background()
-	graphDB := openTestDB(t, false)
-
-	chunks := createDiverseDocs()
-	err := graphDB.IndexChunks(ctx, chunks)
-	if err != nil {
-		t.Fatalf("IndexChunks failed: %v", err)
-	}
+	graphDB := diverseDocsDB(t)
 
 	hybridSearch := NewHybridSearch(graphDB, nil)
 
@@ -156,13 +190,7 @@ func TestHybridSearchResultSorting(t *testing.T) {
 
 func TestHybridSearchRRFFusion(t *testing.T) {
 	ctx := context.Background()
-	graphDB := openTestDB(t, false)
-
-	chunks := createDiverseDocs()
-	err := graphDB.IndexChunks(ctx, chunks)
-	if err != nil {
-		t.Fatalf("IndexChunks failed: %v", err)
-	}
+	graphDB := diverseDocsDB(t)
 
 	hybridSearch := NewHybridSearch(graphDB, nil)
 
@@ -187,15 +215,296 @@ func TestHybridSearchRRFFusion(t *testing.T) {
 	}
 }
 
-func TestHybridSearchWeightedFusion(t *testing.T) {
+func TestReciprocalRankFusionMergesSharedChunks(t *testing.T) {
+	chunk := func(id string) scoredChunk {
+		return scoredChunk{chunk: types.Chunk{ID: id}}
+	}
+	keyword := []scoredChunk{chunk("a"), chunk("b")}
+	semantic := []scoredChunk{chunk("b"), chunk("c")}
+
+	results := (&HybridSearch{}).reciprocalRankFusion(keyword, semantic, 10)
+
+	if len(results) != 3 {
+		t.Fatalf("Expected 3 fused results, got %d", len(results))
+	}
+	want := []string{"b", "a", "c"}
+	for i, id := range want {
+		if results[i].Chunk.ID != id {
+			t.Errorf("Result %d: expected %s, got %s", i, id, results[i].Chunk.ID)
+		}
+	}
+	if results[0].HybridScore != 1 || results[2].HybridScore != 0 {
+		t.Errorf("Expected scores normalized to [0, 1], got %f..%f", results[2].HybridScore, results[0].HybridScore)
+	}
+
+	if limited := (&HybridSearch{}).reciprocalRankFusion(keyword, semantic, 2); len(limited) != 2 {
+		t.Errorf("Expected limit to cap results at 2, got %d", len(limited))
+	}
+}
+
+func TestWeightedFusionCombinesScores(t *testing.T) {
+	keyword := []scoredChunk{
+		{chunk: types.Chunk{ID: "a"}, score: 4},
+		{chunk: types.Chunk{ID: "b"}, score: 2},
+	}
+	semantic := []scoredChunk{
+		{chunk: types.Chunk{ID: "b"}, score: 0.9},
+		{chunk: types.Chunk{ID: "c"}, score: 0.8},
+	}
+
+	results := (&HybridSearch{}).weightedFusion(keyword, semantic, SearchOptions{KeywordWeight: 0.5, SemanticWeight: 0.5})
+
+	if len(results) != 3 {
+		t.Fatalf("Expected 3 fused results, got %d", len(results))
+	}
+	byID := make(map[string]types.SearchResult)
+	for _, r := range results {
+		byID[r.Chunk.ID] = r
+	}
+	if byID["a"].KeywordScore != 1 || byID["a"].SemanticScore != 0 {
+		t.Errorf("Unexpected scores for a: %+v", byID["a"])
+	}
+	if byID["b"].KeywordScore != 0 || byID["b"].SemanticScore == 0 {
+		t.Errorf("Expected b to carry both keyword and semantic scores: %+v", byID["b"])
+	}
+	for i := 1; i < len(results); i++ {
+		if results[i].HybridScore > results[i-1].HybridScore {
+			t.Errorf("Results not sorted by hybrid score at %d", i)
+		}
+	}
+}
+
+func TestResultCacheInvalidation(t *testing.T) {
+	results := []types.SearchResult{{Chunk: types.Chunk{ID: "a"}, HybridScore: 1}}
+
+	c := newResultCache(2, time.Minute)
+	c.put("q1", 1, results)
+
+	got, ok := c.get("q1", 1)
+	if !ok || len(got) != 1 || got[0].Chunk.ID != "a" {
+		t.Fatalf("Expected cached results, got %v (hit=%v)", got, ok)
+	}
+	got[0].HybridScore = 0
+	if again, _ := c.get("q1", 1); again[0].HybridScore != 1 {
+		t.Error("Callers should not be able to modify cached results")
+	}
+
+	if _, ok := c.get("q1", 2); ok {
+		t.Error("Expected a newer database generation to miss")
+	}
+	if _, ok := c.get("q1", 1); ok {
+		t.Error("Expected the stale entry to be dropped")
+	}
+
+	c.put("q1", 1, results)
+	c.put("q2", 1, results)
+	c.put("q3", 1, results)
+	if _, ok := c.get("q1", 1); ok {
+		t.Error("Expected least recently used entry to be evicted")
+	}
+
+	expired := newResultCache(2, -time.Second)
+	expired.put("q1", 1, results)
+	if _, ok := expired.get("q1", 1); ok {
+		t.Error("Expected expired entry to miss")
+	}
+}
+
+func TestSearchCacheMissesAfterWriteThroughExecute(t *testing.T) {
 	ctx := context.Background()
 	graphDB := openTestDB(t, false)
+	if err := graphDB.IndexChunks(ctx, []types.Chunk{
+		{ID: "a.md#A", FilePath: "a.md", Header: "A", Content: "alpha notes"},
+	}); err != nil {
+		t.Fatalf("IndexChunks failed: %v", err)
+	}
 
-	chunks := createDiverseDocs()
-	err := graphDB.IndexChunks(ctx, chunks)
+	hybridSearch := NewHybridSearch(graphDB, nil)
+	results, err := hybridSearch.Search(ctx, "alpha", SearchOptions{Limit: 10})
+	if err != nil {
+		t.Fatalf("Search failed: %v", err)
+	}
+	if len(results) != 1 {
+		t.Fatalf("Expected 1 result, got %d", len(results))
+	}
+
+	// A raw Cypher write, as the query tools run them
+	if _, err := graphDB.Execute(ctx, "CREATE (c:Chunk {id: 'b.md#B', file_path: 'b.md', header: 'B', content: 'more alpha notes'})", nil); err != nil {
+		t.Fatalf("Execute failed: %v", err)
+	}
+
+	results, err = hybridSearch.Search(ctx, "alpha", SearchOptions{Limit: 10})
+	if err != nil {
+		t.Fatalf("Search failed: %v", err)
+	}
+	if len(results) != 2 {
+		t.Errorf("Expected the write to invalidate cached results, got %d results", len(results))
+	}
+}
+
+func TestSearchDoesNotCacheKeywordFallback(t *testing.T) {
+	// Fail the first embedding request, then succeed
+	var requests atomic.Int32
+	api := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if requests.Add(1) == 1 {
+			w.WriteHeader(http.StatusServiceUnavailable)
+			_, _ = w.Write([]byte(`{"error": {"message": "unavailable"}}`))
+			return
+		}
+		w.Header().Set("Content-Type", "application/json")
+		_, _ = w.Write([]byte(`{"data": [{"embedding": [0.1, 0.2, 0.3], "index": 0}]}`))
+	}))
+	defer api.Close()
+
+	svc, err := embeddings.NewService(embeddings.Config{
+		Provider: embeddings.ProviderOpenAI,
+		APIKey:   "test",
+		BaseURL:  api.URL,
+	})
+	if err != nil {
+		t.Fatalf("Failed to create embedding service: %v", err)
+	}
+
+	ctx := context.Background()
+	graphDB := openTestDB(t, true)
+	if err := graphDB.IndexChunks(ctx, []types.Chunk{
+		{ID: "a.md#A", FilePath: "a.md", Header: "A", Content: "alpha notes"},
+	}); err != nil {
+		t.Fatalf("IndexChunks failed: %v", err)
+	}
+
+	hybridSearch := NewHybridSearch(graphDB, svc)
+	for i := 0; i < 3; i++ {
+		if _, err := hybridSearch.Search(ctx, "alpha", SearchOptions{Limit: 10}); err != nil {
+			t.Fatalf("Search %d failed: %v", i, err)
+		}
+	}
+
+	// The failed search is retried; the successful one is then cached
+	if n := requests.Load(); n != 2 {
+		t.Errorf("Expected 2 embedding requests, got %d", n)
+	}
+}
+
+func TestCacheKeyDistinguishesOptions(t *testing.T) {
+	base := SearchOptions{Limit: 10, FusionMethod: FusionRRF}
+	variants := []SearchOptions{
+		{Limit: 5, FusionMethod: FusionRRF},
+		{Limit: 10, FusionMethod: FusionWeighted},
+		{Limit: 10, FusionMethod: FusionRRF, Scope: "Projects"},
+		{Limit: 10, FusionMethod: FusionRRF, FilterTags: []string{"a"}},
+		{Limit: 10, FusionMethod: FusionRRF, FilterPages: []string{"a"}},
+	}
+	seen := map[string]bool{cacheKey("query", base): true}
+	for _, opts := range variants {
+		key := cacheKey("query", opts)
+		if seen[key] {
+			t.Errorf("Options %+v share a cache key with an earlier search", opts)
+		}
+		seen[key] = true
+	}
+	if cacheKey("query", base) != cacheKey("query", base) {
+		t.Error("Expected identical searches to share a cache key")
+	}
+}
+
+func TestUniqueSorted(t *testing.T) {
+	if got := uniqueSorted(nil); got != nil {
+		t.Errorf("Expected nil for no filters, got %v", got)
+	}
+
+	pages := []string{"b.md", "a.md", "b.md"}
+	got := uniqueSorted(pages)
+	if len(got) != 2 || got[0] != "a.md" || got[1] != "b.md" {
+		t.Errorf("Expected [a.md b.md], got %v", got)
+	}
+	if pages[0] != "b.md" || pages[1] != "a.md" {
+		t.Errorf("Expected input to be left unchanged, got %v", pages)
+	}
+}
+
+func TestRepeatedQueryIsEmbeddedOnce(t *testing.T) {
+	var requests atomic.Int32
+	api := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		requests.Add(1)
+		w.Header().Set("Content-Type", "application/json")
+		_, _ = w.Write([]byte(`{"data": [{"embedding": [0.1, 0.2, 0.3], "index": 0}]}`))
+	}))
+	defer api.Close()
+
+	svc, err := embeddings.NewService(embeddings.Config{
+		Provider: embeddings.ProviderOpenAI,
+		APIKey:   "test",
+		BaseURL:  api.URL,
+	})
 	if err != nil {
+		t.Fatalf("Failed to create embedding service: %v", err)
+	}
+
+	ctx := context.Background()
+	graphDB := openTestDB(t, true)
+	if err := graphDB.IndexChunks(ctx, []types.Chunk{
+		{ID: "a.md#A", FilePath: "a.md", Header: "A", Content: "database design notes"},
+	}); err != nil {
 		t.Fatalf("IndexChunks failed: %v", err)
 	}
+	hybridSearch := NewHybridSearch(graphDB, svc)
+
+	// Different options miss the result cache but share the query
+	for _, limit := range []int{5, 10, 20} {
+		if _, err := hybridSearch.Search(ctx, "database design", SearchOptions{Limit: limit}); err != nil {
+			t.Fatalf("Search failed: %v", err)
+		}
+	}
+	if n := requests.Load(); n != 1 {
+		t.Errorf("Expected one embedding request for a repeated query, got %d", n)
+	}
+
+	if _, err := hybridSearch.Search(ctx, "graph storage", SearchOptions{Limit: 10}); err != nil {
+		t.Fatalf("Search failed: %v", err)
+	}
+	if n := requests.Load(); n != 2 {
+		t.Errorf("Expected a new query to be embedded, got %d requests", n)
+	}
+}
+
+func TestTopResultsMatchesFullSort(t *testing.T) {
+	scores := []float64{0.3, 0.9, 0.1, 0.9, 0.5, 0.7, 0.5, 0.2}
+	results := func() []types.SearchResult {
+		out := make([]types.SearchResult, len(scores))
+		for i, score := range scores {
+			out[i] = types.SearchResult{Chunk: types.Chunk{ID: fmt.Sprint(i)}, HybridScore: score}
+		}
+		return out
+	}
+
+	all := topResults(results(), 0)
+	for k := 1; k <= len(scores)+1; k++ {
+		top := topResults(results(), k)
+		want := min(k, len(scores))
+		if len(top) != want {
+			t.Fatalf("k=%d: expected %d results, got %d", k, want, len(top))
+		}
+		for i := range top {
+			if top[i].Chunk.ID != all[i].Chunk.ID {
+				t.Errorf("k=%d: result %d is %s, want %s", k, i, top[i].Chunk.ID, all[i].Chunk.ID)
+			}
+		}
+	}
+}
+
+func TestRankDecayMatchesExp(t *testing.T) {
+	for _, rank := range []int{0, 1, 9, 255, 256, 1000} {
+		want := math.Exp(-0.1 * float64(rank+1))
+		if got := rankDecay(rank); got != want {
+			t.Errorf("rankDecay(%d) = %v, want %v", rank, got, want)
+		}
+	}
+}
+
+func TestHybridSearchWeightedFusion(t *testing.T) {
+	ctx := context.Background()
+	graphDB := diverseDocsDB(t)
 
 	hybridSearch := NewHybridSearch(graphDB, nil)
 
@@ -228,13 +537,7 @@ func TestHybridSearchWeightedFusion(t *testing.T) {
 
 func TestHybridSearchWithTagFilter(t *testing.T) {
 	ctx := context.Background()
-	graphDB := openTestDB(t, false)
-
-	chunks := createDiverseDocs()
-	err := graphDB.IndexChunks(ctx, chunks)
-	if err != nil {
-		t.Fatalf("IndexChunks failed: %v", err)
-	}
+	graphDB := diverseDocsDB(t)
 
 	hybridSearch := NewHybridSearch(graphDB, nil)
 
@@ -278,19 +581,51 @@ func TestHybridSearchWithTagFilter(t *testing.T) {
 	}
 }
 
-func TestHybridSearchEmptyQuery(t *testing.T) {
+func TestHybridSearchKeywordOnlyAppliesFilters(t *testing.T) {
 	ctx := context.Background()
-	graphDB := openTestDB(t, false)
+	graphDB := diverseDocsDB(t)
 
-	chunks := createDiverseDocs()
-	err := graphDB.IndexChunks(ctx, chunks)
+	hybridSearch := NewHybridSearch(graphDB, nil)
+
+	// "database" matches several documents; the filters must narrow them
+	// down even though there are no semantic results to fuse with
+	results, err := hybridSearch.Search(ctx, "database", SearchOptions{
+		Limit:       10,
+		FilterPages: []string{"database_architecture.md"},
+	})
 	if err != nil {
-		t.Fatalf("IndexChunks failed: %v", err)
+		t.Fatalf("Search failed: %v", err)
+	}
+	if len(results) == 0 {
+		t.Fatal("Expected results for the filtered page")
+	}
+	for _, result := range results {
+		if result.Chunk.FilePath != "database_architecture.md" {
+			t.Errorf("Expected only database_architecture.md, got %s", result.Chunk.FilePath)
+		}
+	}
+
+	results, err = hybridSearch.Search(ctx, "database", SearchOptions{
+		Limit:      10,
+		FilterTags: []string{"food"},
+	})
+	if err != nil {
+		t.Fatalf("Search failed: %v", err)
+	}
+	for _, result := range results {
+		if result.Chunk.FilePath != "fruit_database.md" {
+			t.Errorf("Expected only chunks tagged food, got %s", result.Chunk.FilePath)
+		}
 	}
+}
+
+func TestHybridSearchEmptyQuery(t *testing.T) {
+	ctx := context.Background()
+	graphDB := diverseDocsDB(t)
 
 	hybridSearch := NewHybridSearch(graphDB, nil)
 
-	_, err = hybridSearch.Search(ctx, "", SearchOptions{Limit: 10})
+	_, err := hybridSearch.Search(ctx, "", SearchOptions{Limit: 10})
 	if err == nil {
 		t.Error("Empty query should return an error")
 	}
@@ -298,13 +633,7 @@ func TestHybridSearchEmptyQuery(t *testing.T) {
 
 func TestHybridSearchNoResults(t *testing.T) {
 	ctx := context.Background()
-	graphDB := openTestDB(t, false)
-
-	chunks := createDiverseDocs()
-	err := graphDB.IndexChunks(ctx, chunks)
-	if err != nil {
-		t.Fatalf("IndexChunks failed: %v", err)
-	}
+	graphDB := diverseDocsDB(t)
 
 	hybridSearch := NewHybridSearch(graphDB, nil)
 
@@ -323,13 +652,7 @@ func TestHybridSearchNoResults(t *testing.T) {
 
 func TestHybridSearchLimitParameter(t *testing.T) {
 	ctx := context.Background()
-	graphDB := openTestDB(t, false)
-
-	chunks := createDiverseDocs()
-	err := graphDB.IndexChunks(ctx, chunks)
-	if err != nil {
-		t.Fatalf("IndexChunks failed: %v", err)
-	}
+	graphDB := diverseDocsDB(t)
 
 	hybridSearch := NewHybridSearch(graphDB, nil)
 
@@ -353,13 +676,7 @@ func TestHybridSearchLimitParameter(t *testing.T) {
 
 func TestHybridSearchDeduplication(t *testing.T) {
 	ctx := context.Background()
-	graphDB := openTestDB(t, false)
-
-	chunks := createDiverseDocs()
-	err := graphDB.IndexChunks(ctx, chunks)
-	if err != nil {
-		t.Fatalf("IndexChunks failed: %v", err)
-	}
+	graphDB := diverseDocsDB(t)
 
 	hybridSearch := NewHybridSearch(graphDB, nil)
 
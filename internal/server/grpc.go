@@ -9,6 +9,7 @@ import (
 	"net"
 	"os"
 	"path/filepath"
+	"sort"
 	"strings"
 	"time"
 
@@ -297,7 +298,7 @@ func (s *GRPCServer) ProposeChange(ctx context.Context, req *pb.ProposeChangeReq
 	}
 
 	// Generate proposal content with proper metadata
-	createdAt := time.Now().Format(time.RFC3339)
+	createdAt := time.Now().UTC().Format(time.RFC3339)
 	proposalContent := fmt.Sprintf(`---
 type: proposal
 tags:
@@ -366,22 +367,28 @@ func (s *GRPCServer) ListProposals(ctx context.Context, req *pb.ListProposalsReq
 
 	proposalsDir := filepath.Join(s.spacePath, prefix)
 	var proposals []*pb.ProposalInfo
+	var createdAt []time.Time
 
-	err := filepath.Walk(proposalsDir, func(path string, info os.FileInfo, err error) error {
+	err := filepath.WalkDir(proposalsDir, func(path string, d os.DirEntry, err error) error {
 		if err != nil {
 			return nil // Ignore errors
 		}
-		if info.IsDir() || !strings.HasSuffix(path, ".proposal") {
+		if d.IsDir() || !strings.HasSuffix(path, ".proposal") {
 			return nil
 		}
 
-		content, err := os.ReadFile(path)
+		content, err := parser.ReadFrontmatterHead(path)
 		if err != nil {
 			return nil
 		}
 
+		// Skip parsing proposals that cannot match the status filter
+		if !proposalMayHaveStatus(content, status) {
+			return nil
+		}
+
 		// Parse frontmatter
-		proposal := parseProposalFrontmatter(string(content))
+		proposal := parseProposalFrontmatter(content)
 		if proposal == nil {
 			return nil
 		}
@@ -394,6 +401,7 @@ func (s *GRPCServer) ListProposals(ctx context.Context, req *pb.ListProposalsReq
 		relPath, _ := filepath.Rel(s.spacePath, path)
 		proposal.Path = relPath
 		proposals = append(proposals, proposal)
+		createdAt = append(createdAt, parseCreatedAt(proposal.CreatedAt))
 		return nil
 	})
 
@@ -401,6 +409,8 @@ func (s *GRPCServer) ListProposals(ctx context.Context, req *pb.ListProposalsReq
 		return &pb.ListProposalsResponse{Success: false, Error: err.Error()}, nil
 	}
 
+	sort.Stable(proposalsByCreated[*pb.ProposalInfo]{proposals: proposals, createdAt: createdAt})
+
 	return &pb.ListProposalsResponse{
 		Success:   true,
 		Count:     int32(len(proposals)),
@@ -449,6 +459,36 @@ func parseProposalFrontmatter(content string) *pb.ProposalInfo {
 	return proposal
 }
 
+// proposalMayHaveStatus is a cheap pre-check for the status filter: a
+// proposal can only have the requested status if the value appears in it.
+func proposalMayHaveStatus(content, status string) bool {
+	return status == "all" || strings.Contains(content, status)
+}
+
+// parseCreatedAt parses a proposal's created_at value. Missing or invalid
+// values give the zero time, which sorts after every real one.
+func parseCreatedAt(value string) time.Time {
+	t, err := time.Parse(time.RFC3339, value)
+	if err != nil {
+		return time.Time{}
+	}
+	return t
+}
+
+// proposalsByCreated sorts proposal entries newest first by creation times
+// parsed once while the entries were collected.
+type proposalsByCreated[T any] struct {
+	proposals []T
+	createdAt []time.Time
+}
+
+func (p proposalsByCreated[T]) Len() int           { return len(p.proposals) }
+func (p proposalsByCreated[T]) Less(i, j int) bool { return p.createdAt[i].After(p.createdAt[j]) }
+func (p proposalsByCreated[T]) Swap(i, j int) {
+	p.proposals[i], p.proposals[j] = p.proposals[j], p.proposals[i]
+	p.createdAt[i], p.createdAt[j] = p.createdAt[j], p.createdAt[i]
+}
+
 // WithdrawProposal deletes a pending proposal.
 func (s *GRPCServer) WithdrawProposal(ctx context.Context, req *pb.WithdrawProposalRequest) (*pb.WithdrawProposalResponse, error) {
 	// Check if proposals library is installed
@@ -616,8 +656,8 @@ func (s *GRPCServer) GetProjectContext(ctx context.Context, req *pb.GetProjectCo
 
 	// Search by GitHub remote
 	if req.GithubRemote != "" {
-		err := filepath.Walk(s.spacePath, func(path string, info os.FileInfo, err error) error {
-			if err != nil || info.IsDir() || !strings.HasSuffix(path, ".md") {
+		err := filepath.WalkDir(s.spacePath, func(path string, d os.DirEntry, err error) error {
+			if err != nil || d.IsDir() || !strings.HasSuffix(path, ".md") {
 				return nil
 			}
 
@@ -712,8 +752,8 @@ func (s *GRPCServer) GetProjectContext(ctx context.Context, req *pb.GetProjectCo
 		// Check for subdirectory matching project name
 		projectSubdir := filepath.Join(folder, strings.TrimSuffix(filepath.Base(projectFile), ".md"))
 		if info, err := os.Stat(projectSubdir); err == nil && info.IsDir() {
-			_ = filepath.Walk(projectSubdir, func(path string, info os.FileInfo, err error) error {
-				if err == nil && !info.IsDir() && strings.HasSuffix(path, ".md") {
+			_ = filepath.WalkDir(projectSubdir, func(path string, d os.DirEntry, err error) error {
+				if err == nil && !d.IsDir() && strings.HasSuffix(path, ".md") {
 					relPagePath, _ := filepath.Rel(s.spacePath, path)
 					relatedPages = append(relatedPages, &pb.RelatedPage{
 						Name: strings.TrimSuffix(filepath.Base(path), ".md"),
@@ -13,6 +13,7 @@ import (
 
 	"google.golang.org/grpc"
 	"google.golang.org/grpc/credentials/insecure"
+	"google.golang.org/grpc/test/bufconn"
 
 	"github.com/boblangley/silverbullet-rag/internal/db"
 	"github.com/boblangley/silverbullet-rag/internal/parser"
@@ -52,12 +53,8 @@ func setupTestGRPCServer(t *testing.T) (*GRPCServer, *db.GraphDB, string, string
 func startTestGRPCServer(t *testing.T, server *GRPCServer) (pb.RAGServiceClient, func()) {
 	t.Helper()
 
-	// Find an available port
-	lis, err := net.Listen("tcp", "127.0.0.1:0")
-	if err != nil {
-		t.Fatalf("Failed to listen: %v", err)
-	}
-	addr := lis.Addr().String()
+	// Serve over an in-memory listener so tests don't pay for TCP setup
+	lis := bufconn.Listen(1 << 20)
 
 	// Start server in background
 	go func() {
@@ -67,7 +64,12 @@ func startTestGRPCServer(t *testing.T, server *GRPCServer) (pb.RAGServiceClient,
 	}()
 
 	// Create client connection
-	conn, err := grpc.NewClient(addr, grpc.WithTransportCredentials(insecure.NewCredentials()))
+	conn, err := grpc.NewClient("passthrough:///bufnet",
+		grpc.WithContextDialer(func(ctx context.Context, _ string) (net.Conn, error) {
+			return lis.DialContext(ctx)
+		}),
+		grpc.WithTransportCredentials(insecure.NewCredentials()),
+	)
 	if err != nil {
 		t.Fatalf("Failed to connect: %v", err)
 	}
@@ -499,6 +501,91 @@ Test content`
 	}
 }
 
+func TestGRPCListProposalsNewestFirst(t *testing.T) {
+	tests := []struct {
+		name    string
+		created map[string]string // proposal title -> created_at, "" to omit it
+		want    []string
+	}{
+		{
+			name: "same offset",
+			created: map[string]string{
+				"A": "2024-01-01T10:00:00Z",
+				"B": "2024-03-01T10:00:00Z",
+				"C": "2024-02-01T10:00:00Z",
+			},
+			want: []string{"B", "C", "A"},
+		},
+		{
+			// Sorting these strings lexically would give X, Z, Y. Proposals
+			// without a valid created_at come last, in walk order.
+			name: "mixed offsets",
+			created: map[string]string{
+				"X": "2024-06-01T12:00:00+09:00", // 03:00 UTC
+				"Y": "2024-06-01T05:00:00Z",
+				"Z": "2024-06-01T08:00:00-05:00", // 13:00 UTC
+				"W": "",
+				"V": "yesterday",
+			},
+			want: []string{"Z", "Y", "X", "V", "W"},
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			grpcServer, _, spacePath, _ := setupTestGRPCServer(t)
+			client, cleanup := startTestGRPCServer(t, grpcServer)
+			defer cleanup()
+
+			ctx, cancel := context.WithTimeout(context.Background(), 5*time.Second)
+			defer cancel()
+
+			if err := os.MkdirAll(filepath.Join(spacePath, "Library", "Proposals"), 0755); err != nil {
+				t.Fatalf("Failed to create library dir: %v", err)
+			}
+			proposalDir := filepath.Join(spacePath, "_Proposals")
+			if err := os.MkdirAll(proposalDir, 0755); err != nil {
+				t.Fatalf("Failed to create proposals dir: %v", err)
+			}
+			for title, createdAt := range tt.created {
+				content := "---\ntitle: " + title + "\nstatus: pending\n"
+				if createdAt != "" {
+					content += "created_at: " + createdAt + "\n"
+				}
+				content += "---\nBody"
+				if err := os.WriteFile(filepath.Join(proposalDir, title+".proposal"), []byte(content), 0644); err != nil {
+					t.Fatalf("Failed to write proposal: %v", err)
+				}
+			}
+
+			resp, err := client.ListProposals(ctx, &pb.ListProposalsRequest{Status: "pending"})
+			if err != nil {
+				t.Fatalf("ListProposals RPC failed: %v", err)
+			}
+			var got []string
+			for _, p := range resp.Proposals {
+				got = append(got, p.Title)
+			}
+			if strings.Join(got, ",") != strings.Join(tt.want, ",") {
+				t.Errorf("Expected proposals in order %v, got %v", tt.want, got)
+			}
+		})
+	}
+}
+
+func TestProposalMayHaveStatus(t *testing.T) {
+	head := "---\ntype: proposal\ntitle: Big Page\nstatus: accepted\n---\nbody"
+	if p := parseProposalFrontmatter(head); p == nil || p.Title != "Big Page" || p.Status != "accepted" {
+		t.Errorf("Frontmatter should parse from the head, got %+v", p)
+	}
+	if !proposalMayHaveStatus(head, "accepted") || proposalMayHaveStatus(head, "rejected") {
+		t.Errorf("Status pre-check did not match the frontmatter status")
+	}
+	if !proposalMayHaveStatus(head, "all") {
+		t.Errorf("Status 'all' should always pass the pre-check")
+	}
+}
+
 func TestGRPCWithdrawProposal(t *testing.T) {
 	grpcServer, _, spacePath, _ := setupTestGRPCServer(t)
 	client, cleanup := startTestGRPCServer(t, grpcServer)
@@ -202,11 +202,18 @@ func TestHealthServerStartStop(t *testing.T) {
 		errCh <- h.Start()
 	}()
 
-	// Give it time to start
-	time.Sleep(100 * time.Millisecond)
-
-	// Make a request
-	resp, err := http.Get("http://127.0.0.1:" + itoa(port) + "/live")
+	// Poll until the server accepts connections rather than sleeping for a
+	// fixed time
+	url := "http://127.0.0.1:" + itoa(port) + "/live"
+	var resp *http.Response
+	deadline := time.Now().Add(5 * time.Second)
+	for {
+		resp, err = http.Get(url)
+		if err == nil || time.Now().After(deadline) {
+			break
+		}
+		time.Sleep(10 * time.Millisecond)
+	}
 	if err != nil {
 		t.Fatalf("failed to connect to health server: %v", err)
 	}
@@ -11,6 +11,7 @@ import (
 	"os"
 	"path/filepath"
 	"regexp"
+	"sort"
 	"strings"
 	"time"
 
@@ -23,6 +24,13 @@ import (
 	"github.com/boblangley/silverbullet-rag/internal/version"
 )
 
+var (
+	libraryVersionPattern   = regexp.MustCompile(`(?m)^version:\s*(.+)$`)
+	frontmatterClosePattern = regexp.MustCompile(`\n---\s*\n`)
+	installedVersionPattern = regexp.MustCompile(`(?m)^installed_version:.*\n`)
+	installedAtPattern      = regexp.MustCompile(`(?m)^installed_at:.*\n`)
+)
+
 // MCPServer provides the MCP interface to silverbullet-rag.
 type MCPServer struct {
 	server           *mcp.Server
@@ -399,8 +407,8 @@ func (m *MCPServer) registerGetProjectContext() {
 
 		// Search by GitHub remote
 		if input.GithubRemote != "" {
-			err := filepath.Walk(m.spacePath, func(path string, info os.FileInfo, err error) error {
-				if err != nil || info.IsDir() || !strings.HasSuffix(path, ".md") {
+			err := filepath.WalkDir(m.spacePath, func(path string, d os.DirEntry, err error) error {
+				if err != nil || d.IsDir() || !strings.HasSuffix(path, ".md") {
 					return nil
 				}
 				fm, _ := m.parser.GetFrontmatter(path)
@@ -486,11 +494,11 @@ func (m *MCPServer) registerGetProjectContext() {
 		projectName := strings.TrimSuffix(filepath.Base(projectFile), ".md")
 		subDir := filepath.Join(filepath.Dir(projectFile), projectName)
 		if info, err := os.Stat(subDir); err == nil && info.IsDir() {
-			_ = filepath.Walk(subDir, func(path string, info os.FileInfo, err error) error {
-				if err == nil && !info.IsDir() && strings.HasSuffix(path, ".md") {
+			_ = filepath.WalkDir(subDir, func(path string, d os.DirEntry, err error) error {
+				if err == nil && !d.IsDir() && strings.HasSuffix(path, ".md") {
 					rel, _ := filepath.Rel(m.spacePath, path)
 					relatedPages = append(relatedPages, map[string]string{
-						"name": strings.TrimSuffix(info.Name(), ".md"),
+						"name": strings.TrimSuffix(d.Name(), ".md"),
 						"path": rel,
 					})
 				}
@@ -573,16 +581,7 @@ func (m *MCPServer) registerProposeChange() {
 		isNewPage := os.IsNotExist(err)
 
 		// Get prefix from config (default _Proposals/)
-		prefix := "_Proposals/"
-		configPath := filepath.Join(m.dbPath, "space_config.json")
-		if data, err := os.ReadFile(configPath); err == nil {
-			var cfg map[string]any
-			if json.Unmarshal(data, &cfg) == nil {
-				if p, ok := cfg["proposals.pathPrefix"].(string); ok {
-					prefix = p
-				}
-			}
-		}
+		prefix := m.proposalsPrefix()
 
 		// Create proposal path
 		proposalPath := prefix + strings.TrimSuffix(input.TargetPage, ".md") + ".proposal"
@@ -593,13 +592,14 @@ title: %s
 target_page: %s
 status: pending
 is_new_page: %v
+created_at: %s
 ---
 ## Description
 %s
 
 ## Proposed Content
 %s
-`, input.Title, input.TargetPage, isNewPage, input.Description, input.Content)
+`, input.Title, input.TargetPage, isNewPage, time.Now().UTC().Format(time.RFC3339), input.Description, input.Content)
 
 		// Write proposal file
 		fullPath := filepath.Join(m.spacePath, proposalPath)
@@ -648,47 +648,49 @@ func (m *MCPServer) registerListProposals() {
 		}
 
 		// Get prefix
-		prefix := "_Proposals/"
-		configPath := filepath.Join(m.dbPath, "space_config.json")
-		if data, err := os.ReadFile(configPath); err == nil {
-			var cfg map[string]any
-			if json.Unmarshal(data, &cfg) == nil {
-				if p, ok := cfg["proposals.pathPrefix"].(string); ok {
-					prefix = p
-				}
-			}
-		}
+		prefix := m.proposalsPrefix()
 
 		proposalsDir := filepath.Join(m.spacePath, prefix)
 		var proposals []map[string]any
+		var createdAt []time.Time
 
-		_ = filepath.Walk(proposalsDir, func(path string, info os.FileInfo, err error) error {
-			if err != nil || info.IsDir() || !strings.HasSuffix(path, ".proposal") {
+		_ = filepath.WalkDir(proposalsDir, func(path string, d os.DirEntry, err error) error {
+			if err != nil || d.IsDir() || !strings.HasSuffix(path, ".proposal") {
 				return nil
 			}
 
-			content, err := os.ReadFile(path)
+			content, err := parser.ReadFrontmatterHead(path)
 			if err != nil {
 				return nil
 			}
 
+			// Skip parsing proposals that cannot match the status filter
+			if !proposalMayHaveStatus(content, status) {
+				return nil
+			}
+
 			// Parse frontmatter
-			fm := m.parseProposalFrontmatter(string(content))
+			fm := m.parseProposalFrontmatter(content)
 			proposalStatus, _ := fm["status"].(string)
 
 			if status == "all" || status == proposalStatus {
 				relPath, _ := filepath.Rel(m.spacePath, path)
+				created, _ := fm["created_at"].(string)
 				proposals = append(proposals, map[string]any{
 					"path":        relPath,
 					"title":       fm["title"],
 					"target_page": fm["target_page"],
 					"status":      proposalStatus,
 					"is_new_page": fm["is_new_page"],
+					"created_at":  created,
 				})
+				createdAt = append(createdAt, parseCreatedAt(created))
 			}
 			return nil
 		})
 
+		sort.Stable(proposalsByCreated[map[string]any]{proposals: proposals, createdAt: createdAt})
+
 		res, _ := toolResult(map[string]any{
 			"success":   true,
 			"count":     len(proposals),
@@ -751,6 +753,25 @@ func (m *MCPServer) registerWithdrawProposal() {
 	})
 }
 
+// proposalsPrefix returns the space path proposals are stored under, as
+// set by proposals.pathPrefix in the space config, or "_Proposals/".
+func (m *MCPServer) proposalsPrefix() string {
+	data, err := os.ReadFile(filepath.Join(m.dbPath, "space_config.json"))
+	if err != nil {
+		return "_Proposals/"
+	}
+
+	// Decode only the one key instead of materializing every config value
+	// into a map
+	var cfg struct {
+		PathPrefix *string `json:"proposals.pathPrefix"`
+	}
+	if json.Unmarshal(data, &cfg) != nil || cfg.PathPrefix == nil {
+		return "_Proposals/"
+	}
+	return *cfg.PathPrefix
+}
+
 func (m *MCPServer) parseProposalFrontmatter(content string) map[string]any {
 	result := make(map[string]any)
 	if !strings.HasPrefix(content, "---") {
@@ -918,16 +939,16 @@ func (m *MCPServer) registerUpdateLibrary() {
 	})
 }
 
-// getLibraryVersion extracts version from library frontmatter.
+// getLibraryVersion extracts version from library frontmatter. Only the
+// head of the file holding the frontmatter is read.
 func (m *MCPServer) getLibraryVersion(libraryPath string) string {
-	content, err := os.ReadFile(libraryPath)
+	content, err := parser.ReadFrontmatterHead(libraryPath)
 	if err != nil {
 		return ""
 	}
-	re := regexp.MustCompile(`(?m)^version:\s*(.+)$`)
-	match := re.FindSubmatch(content)
+	match := libraryVersionPattern.FindStringSubmatch(content)
 	if match != nil {
-		return strings.TrimSpace(string(match[1]))
+		return strings.TrimSpace(match[1])
 	}
 	return ""
 }
@@ -942,8 +963,7 @@ func (m *MCPServer) addInstallMetadata(content string, version string) string {
 	}
 
 	// Find the end of frontmatter
-	re := regexp.MustCompile(`\n---\s*\n`)
-	loc := re.FindStringIndex(content)
+	loc := frontmatterClosePattern.FindStringIndex(content)
 	if loc == nil {
 		return content
 	}
@@ -953,8 +973,8 @@ func (m *MCPServer) addInstallMetadata(content string, version string) string {
 	rest := content[loc[1]-1:]
 
 	// Remove existing install metadata if present
-	frontmatter = regexp.MustCompile(`(?m)^installed_version:.*\n`).ReplaceAllString(frontmatter, "")
-	frontmatter = regexp.MustCompile(`(?m)^installed_at:.*\n`).ReplaceAllString(frontmatter, "")
+	frontmatter = installedVersionPattern.ReplaceAllString(frontmatter, "")
+	frontmatter = installedAtPattern.ReplaceAllString(frontmatter, "")
 
 	// Add new metadata before the closing ---
 	newMetadata := fmt.Sprintf("installed_version: %s\ninstalled_at: %s\n", version, now)
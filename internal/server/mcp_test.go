@@ -17,25 +17,15 @@ import (
 
 // Helper functions
 
-func createTempDir(t *testing.T, prefix string) string {
-	t.Helper()
-	dir, err := os.MkdirTemp("", prefix)
-	if err != nil {
-		t.Fatalf("Failed to create temp dir: %v", err)
-	}
-	t.Cleanup(func() { os.RemoveAll(dir) })
-	return dir
-}
-
 func createTempDB(t *testing.T) string {
 	t.Helper()
-	dir := createTempDir(t, "test_db_")
+	dir := t.TempDir()
 	return filepath.Join(dir, "test.lbug")
 }
 
 func createTempSpace(t *testing.T) string {
 	t.Helper()
-	return createTempDir(t, "test_space_")
+	return t.TempDir()
 }
 
 func setupTestMCPServer(t *testing.T) (*MCPServer, string, string) {
@@ -356,21 +346,34 @@ func TestReadPageToolNotFound(t *testing.T) {
 	}
 }
 
-func TestReadPageToolPathTraversalProtection(t *testing.T) {
-	_, spacePath, _ := setupTestMCPServer(t)
-
-	// Simulate path traversal check
-	pageName := "../../../etc/passwd"
-	filePath := filepath.Join(spacePath, pageName)
-	absFilePath, _ := filepath.Abs(filePath)
+func TestToolPathTraversalProtection(t *testing.T) {
+	// The check only needs a space directory, so the cases share one and
+	// run in parallel without opening a database each.
+	spacePath := createTempSpace(t)
 	absSpacePath, _ := filepath.Abs(spacePath)
 
-	// Check if path is within space
-	isValid := len(absFilePath) >= len(absSpacePath) &&
-		absFilePath[:len(absSpacePath)] == absSpacePath
+	tests := []struct {
+		tool string
+		path string
+	}{
+		{"read_page", "../../../etc/passwd"},
+		{"propose_change", "../../../tmp/evil.md"},
+		{"withdraw_proposal", "../../../tmp/evil.proposal"},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.tool, func(t *testing.T) {
+			t.Parallel()
+
+			// Simulate path traversal check
+			absPath, _ := filepath.Abs(filepath.Join(spacePath, tt.path))
+			isValid := len(absPath) >= len(absSpacePath) &&
+				absPath[:len(absSpacePath)] == absSpacePath
 
-	if isValid {
-		t.Error("Path traversal should be detected and rejected")
+			if isValid {
+				t.Errorf("Path traversal in %s should be detected and rejected", tt.tool)
+			}
+		})
 	}
 }
 
@@ -411,23 +414,6 @@ Test description
 	_ = dbPath // silence unused variable warning
 }
 
-func TestProposeChangeToolPathTraversal(t *testing.T) {
-	_, spacePath, _ := setupTestMCPServer(t)
-
-	// Simulate path traversal check for propose_change
-	targetPage := "../../../tmp/evil.md"
-	filePath := filepath.Join(spacePath, targetPage)
-	absFilePath, _ := filepath.Abs(filePath)
-	absSpacePath, _ := filepath.Abs(spacePath)
-
-	isValid := len(absFilePath) >= len(absSpacePath) &&
-		absFilePath[:len(absSpacePath)] == absSpacePath
-
-	if isValid {
-		t.Error("Path traversal in propose_change should be detected and rejected")
-	}
-}
-
 // ==================== List Proposals Tool Tests ====================
 
 func TestListProposalsTool(t *testing.T) {
@@ -745,33 +731,37 @@ Content`,
 
 // ==================== Library Management Tests ====================
 
+// testLibraryFiles is the Proposals library source tree written by
+// setupTestMCPServerWithLibrary, keyed by path relative to the library root.
+var testLibraryFiles = map[string][]byte{
+	"Proposals.md": []byte(`# Proposals Library
+
+This is the Proposals library for SilverBullet.
+`),
+	filepath.Join("Proposals", "Commands.md"):  []byte("# Commands\n\nCommands here."),
+	filepath.Join("Proposals", "Functions.md"): []byte("# Functions\n\nFunctions here."),
+}
+
 func setupTestMCPServerWithLibrary(t *testing.T) (*MCPServer, string, string, string) {
 	t.Helper()
 	dbPath := createTempDB(t)
 	spacePath := createTempSpace(t)
-	libraryPath := createTempDir(t, "test_library_")
+	libraryPath := t.TempDir()
 
-	// Create library source file
-	proposalsContent := `# Proposals Library
-
-This is the Proposals library for SilverBullet.
-`
-	if err := os.WriteFile(filepath.Join(libraryPath, "Proposals.md"), []byte(proposalsContent), 0644); err != nil {
-		t.Fatalf("Failed to create library source: %v", err)
-	}
-
-	// Create Proposals subdirectory
-	proposalsDir := filepath.Join(libraryPath, "Proposals")
-	if err := os.MkdirAll(proposalsDir, 0755); err != nil {
-		t.Fatalf("Failed to create Proposals dir: %v", err)
+	// Create the library source tree
+	for name, content := range testLibraryFiles {
+		path := filepath.Join(libraryPath, name)
+		if err := os.MkdirAll(filepath.Dir(path), 0755); err != nil {
+			t.Fatalf("Failed to create library dir: %v", err)
+		}
+		if err := os.WriteFile(path, content, 0644); err != nil {
+			t.Fatalf("Failed to create %s: %v", name, err)
+		}
 	}
 
-	// Add some library files
-	if err := os.WriteFile(filepath.Join(proposalsDir, "Commands.md"), []byte("# Commands\n\nCommands here."), 0644); err != nil {
-		t.Fatalf("Failed to create Commands.md: %v", err)
-	}
-	if err := os.WriteFile(filepath.Join(proposalsDir, "Functions.md"), []byte("# Functions\n\nFunctions here."), 0644); err != nil {
-		t.Fatalf("Failed to create Functions.md: %v", err)
+	// copyLibraryFiles expects the space's Library folder to exist
+	if err := os.MkdirAll(filepath.Join(spacePath, "Library"), 0755); err != nil {
+		t.Fatalf("Failed to create Library dir: %v", err)
 	}
 
 	graphDB, err := db.Open(db.Config{
@@ -799,12 +789,6 @@ This is the Proposals library for SilverBullet.
 func TestCopyLibraryFiles(t *testing.T) {
 	mcpServer, spacePath, _, _ := setupTestMCPServerWithLibrary(t)
 
-	// Create Library directory first (copyLibraryFiles expects it to exist)
-	libraryDir := filepath.Join(spacePath, "Library")
-	if err := os.MkdirAll(libraryDir, 0755); err != nil {
-		t.Fatalf("Failed to create Library dir: %v", err)
-	}
-
 	// Copy library files
 	installedFiles, err := mcpServer.copyLibraryFiles("Proposals", false)
 	if err != nil {
@@ -831,12 +815,6 @@ func TestCopyLibraryFiles(t *testing.T) {
 func TestCopyLibraryFilesOverwrite(t *testing.T) {
 	mcpServer, spacePath, _, _ := setupTestMCPServerWithLibrary(t)
 
-	// Create Library directory first
-	libraryDir := filepath.Join(spacePath, "Library")
-	if err := os.MkdirAll(libraryDir, 0755); err != nil {
-		t.Fatalf("Failed to create Library dir: %v", err)
-	}
-
 	// First install
 	_, err := mcpServer.copyLibraryFiles("Proposals", false)
 	if err != nil {
@@ -1088,7 +1066,11 @@ func TestSearchWithPageFilter(t *testing.T) {
 // ==================== Proposal Prefix Config Tests ====================
 
 func TestProposalPrefixFromConfig(t *testing.T) {
-	_, spacePath, dbPath := setupTestMCPServer(t)
+	mcpServer, spacePath, dbPath := setupTestMCPServer(t)
+
+	if prefix := mcpServer.proposalsPrefix(); prefix != "_Proposals/" {
+		t.Errorf("Expected default prefix '_Proposals/', got %q", prefix)
+	}
 
 	// Create config file with custom prefix
 	configDir := filepath.Dir(dbPath)
@@ -1112,6 +1094,9 @@ func TestProposalPrefixFromConfig(t *testing.T) {
 	if !ok || prefix != "CustomProposals/" {
 		t.Errorf("Expected prefix 'CustomProposals/', got %q", prefix)
 	}
+	if prefix := mcpServer.proposalsPrefix(); prefix != "CustomProposals/" {
+		t.Errorf("Expected server to use prefix 'CustomProposals/', got %q", prefix)
+	}
 
 	_ = spacePath // silence unused variable
 }
@@ -1134,20 +1119,3 @@ func TestWithdrawNonProposalFile(t *testing.T) {
 	}
 	// Test passes because test.md doesn't have .proposal suffix
 }
-
-func TestWithdrawPathTraversal(t *testing.T) {
-	_, spacePath, _ := setupTestMCPServer(t)
-
-	// Simulate path traversal check
-	proposalPath := "../../../tmp/evil.proposal"
-	fullPath := filepath.Join(spacePath, proposalPath)
-	absPath, _ := filepath.Abs(fullPath)
-	absSpacePath, _ := filepath.Abs(spacePath)
-
-	// strings.HasPrefix is the security check
-	isValid := len(absPath) >= len(absSpacePath) && absPath[:len(absSpacePath)] == absSpacePath
-
-	if isValid {
-		t.Error("Path traversal in withdraw should be detected")
-	}
-}
@@ -2,9 +2,11 @@
 package watcher
 
 import (
+	"container/heap"
 	"context"
-	"crypto/md5"
 	"encoding/hex"
+	"encoding/json"
+	"hash/crc32"
 	"io"
 	"log/slog"
 	"os"
@@ -34,18 +36,53 @@ type Watcher struct {
 
 	watcher  *fsnotify.Watcher
 	debounce time.Duration
-	pending  map[string]time.Time
+	pending  map[string]time.Time // path -> when it becomes due
+	queue    debounceQueue        // due times in order; may hold superseded entries
+	wake     chan struct{}
 	mu       sync.Mutex
 
 	// Hash tracking to avoid reprocessing unchanged files
-	fileHashes map[string]string
+	fileHashes map[string]fileHash
 	hashMu     sync.RWMutex
 
 	// Concurrent processing tracking
 	currentlyProcessing map[string]bool
 	processingMu        sync.Mutex
+
+	// dbMu serializes the watcher's database writes across change workers
+	dbMu sync.Mutex
+	// saveMu keeps hash cache snapshots from being written out of order
+	saveMu sync.Mutex
+}
+
+const (
+	// changeWorkers is the number of file changes reindexed concurrently.
+	// Parsing and embedding run in parallel; database writes are serialized.
+	changeWorkers = 4
+	// changeQueueSize bounds how many due changes wait for a worker. Further
+	// changes stay coalesced in the debounce queue until there is room.
+	changeQueueSize = 256
+)
+
+// fileHash records a file's content hash along with the size and
+// modification time it was computed for. While those are unchanged the
+// file is assumed unchanged and is not rehashed.
+type fileHash struct {
+	ModTime int64  `json:"mtime_ns"`
+	Size    int64  `json:"size"`
+	Hash    string `json:"hash"`
 }
 
+// matches reports whether the recorded hash was taken from a file with
+// the given stat information.
+func (h fileHash) matches(info os.FileInfo) bool {
+	return h.ModTime == info.ModTime().UnixNano() && h.Size == info.Size()
+}
+
+// hashCacheFile is the name of the file, under the database directory,
+// that persists file hashes across restarts.
+const hashCacheFile = "file_hashes.json"
+
 // Config holds watcher configuration.
 type Config struct {
 	SpacePath  string
@@ -74,7 +111,7 @@ func New(cfg Config) (*Watcher, error) {
 		logger = slog.Default()
 	}
 
-	return &Watcher{
+	w := &Watcher{
 		spacePath:           cfg.SpacePath,
 		db:                  cfg.DB,
 		parser:              parser.NewSpaceParser(cfg.SpacePath),
@@ -85,9 +122,13 @@ func New(cfg Config) (*Watcher, error) {
 		watcher:             fsWatcher,
 		debounce:            debounce,
 		pending:             make(map[string]time.Time),
-		fileHashes:          make(map[string]string),
+		wake:                make(chan struct{}, 1),
+		fileHashes:          make(map[string]fileHash),
 		currentlyProcessing: make(map[string]bool),
-	}, nil
+	}
+	w.loadFileHashes()
+
+	return w, nil
 }
 
 // Start begins watching the space directory.
@@ -116,8 +157,12 @@ func (w *Watcher) Start(ctx context.Context) error {
 	// Start event processing
 	go w.processEvents(ctx)
 
-	// Start debounce processor
-	go w.processDebounced(ctx)
+	// Start change workers and the debounce processor feeding them
+	changes := make(chan string, changeQueueSize)
+	for i := 0; i < changeWorkers; i++ {
+		go w.processChanges(ctx, changes)
+	}
+	go w.processDebounced(ctx, changes)
 
 	return nil
 }
@@ -138,10 +183,14 @@ func (w *Watcher) processEvents(ctx context.Context) {
 				return
 			}
 
-			// Only handle markdown files
-			if !strings.HasSuffix(event.Name, ".md") {
-				// Handle new directories
-				if event.Op&fsnotify.Create != 0 {
+			// Attribute-only changes never alter content
+			if event.Op == fsnotify.Chmod {
+				continue
+			}
+
+			if !isIndexablePath(event.Name) {
+				// Watch new directories, skipping hidden ones as Start does
+				if event.Has(fsnotify.Create) && !strings.HasPrefix(filepath.Base(event.Name), ".") {
 					if info, err := os.Stat(event.Name); err == nil && info.IsDir() {
 						_ = w.watcher.Add(event.Name)
 					}
@@ -149,17 +198,8 @@ func (w *Watcher) processEvents(ctx context.Context) {
 				continue
 			}
 
-			// Skip proposal files
-			if strings.HasSuffix(event.Name, ".proposal") ||
-				strings.Contains(event.Name, "_Proposals") ||
-				strings.HasSuffix(event.Name, ".rejected.md") {
-				continue
-			}
-
 			// Queue for debounced processing
-			w.mu.Lock()
-			w.pending[event.Name] = time.Now()
-			w.mu.Unlock()
+			w.queueChange(event.Name, time.Now())
 
 		case err, ok := <-w.watcher.Errors:
 			if !ok {
@@ -170,40 +210,155 @@ func (w *Watcher) processEvents(ctx context.Context) {
 	}
 }
 
-func (w *Watcher) processDebounced(ctx context.Context) {
-	ticker := time.NewTicker(100 * time.Millisecond)
-	defer ticker.Stop()
+// isIndexablePath reports whether changes to path should be reindexed:
+// markdown files other than proposals.
+func isIndexablePath(path string) bool {
+	return strings.HasSuffix(path, ".md") &&
+		!strings.HasSuffix(path, ".rejected.md") &&
+		!strings.Contains(path, "_Proposals")
+}
 
-	for {
-		select {
-		case <-ctx.Done():
-			return
+// debounceItem is a queued file change and the time it becomes due.
+type debounceItem struct {
+	path string
+	due  time.Time
+}
 
-		case <-ticker.C:
-			w.mu.Lock()
-			now := time.Now()
-			var ready []string
+// debounceQueue is a min-heap of queued changes ordered by due time.
+type debounceQueue []debounceItem
+
+func (q debounceQueue) Len() int           { return len(q) }
+func (q debounceQueue) Less(i, j int) bool { return q[i].due.Before(q[j].due) }
+func (q debounceQueue) Swap(i, j int)      { q[i], q[j] = q[j], q[i] }
+func (q *debounceQueue) Push(x any)        { *q = append(*q, x.(debounceItem)) }
+func (q *debounceQueue) Pop() any {
+	old := *q
+	item := old[len(old)-1]
+	*q = old[:len(old)-1]
+	return item
+}
 
-			for path, queueTime := range w.pending {
-				if now.Sub(queueTime) >= w.debounce {
-					ready = append(ready, path)
-				}
-			}
+// queueChange schedules path for processing once it has been quiet for the
+// debounce interval. A later change to the same path pushes it back.
+func (w *Watcher) queueChange(path string, now time.Time) {
+	due := now.Add(w.debounce)
+
+	w.mu.Lock()
+	w.pending[path] = due
+	heap.Push(&w.queue, debounceItem{path: path, due: due})
+	w.mu.Unlock()
 
+	select {
+	case w.wake <- struct{}{}:
+	default:
+	}
+}
+
+// takeReady removes and returns the paths that are due at now, oldest first,
+// along with how long until the next one is due. wait is negative when
+// nothing is queued.
+func (w *Watcher) takeReady(now time.Time) (ready []string, wait time.Duration) {
+	w.mu.Lock()
+	defer w.mu.Unlock()
+
+	for len(w.queue) > 0 {
+		item := w.queue[0]
+		current := w.isCurrent(item)
+		if current && item.due.After(now) {
+			break
+		}
+		// Entries superseded by a later change to the same path are dropped
+		heap.Pop(&w.queue)
+		if current {
+			delete(w.pending, item.path)
+			ready = append(ready, item.path)
+		}
+	}
+
+	if len(w.queue) == 0 {
+		return ready, -1
+	}
+	return ready, w.queue[0].due.Sub(now)
+}
+
+// isCurrent reports whether item is the latest queued change for its path.
+func (w *Watcher) isCurrent(item debounceItem) bool {
+	due, ok := w.pending[item.path]
+	return ok && due.Equal(item.due)
+}
+
+// processDebounced hands queued changes to the change workers as they
+// become due. It sleeps until the earliest due time instead of polling, and
+// is woken early when a new change is queued.
+func (w *Watcher) processDebounced(ctx context.Context, changes chan<- string) {
+	for {
+		ready, wait := w.takeReady(time.Now())
+
+		// Dispatch ready files, then look again since more may have come
+		// due in the meantime
+		if len(ready) > 0 {
 			for _, path := range ready {
-				delete(w.pending, path)
+				select {
+				case changes <- path:
+				case <-ctx.Done():
+					return
+				}
 			}
-			w.mu.Unlock()
+			continue
+		}
 
-			// Process ready files
-			for _, path := range ready {
-				w.handleFileChange(ctx, path)
+		var timer *time.Timer
+		var due <-chan time.Time
+		if wait >= 0 {
+			timer = time.NewTimer(wait)
+			due = timer.C
+		}
+
+		select {
+		case <-ctx.Done():
+			if timer != nil {
+				timer.Stop()
 			}
+			return
+		case <-w.wake:
+		case <-due:
+		}
+
+		if timer != nil {
+			timer.Stop()
 		}
 	}
 }
 
-// computeFileHash computes MD5 hash of file contents.
+// processChanges reindexes files received from processDebounced.
+func (w *Watcher) processChanges(ctx context.Context, changes <-chan string) {
+	for {
+		select {
+		case <-ctx.Done():
+			return
+		case path := <-changes:
+			w.handleFileChange(ctx, path)
+		}
+	}
+}
+
+// hashBufferSize is the read size used when streaming files into the hash.
+const hashBufferSize = 64 * 1024
+
+// hashBuffers holds read buffers reused across computeFileHash calls.
+var hashBuffers = sync.Pool{
+	New: func() any {
+		buf := make([]byte, hashBufferSize)
+		return &buf
+	},
+}
+
+// crc32cTable is the Castagnoli table used to hash file contents.
+var crc32cTable = crc32.MakeTable(crc32.Castagnoli)
+
+// computeFileHash computes the CRC-32C checksum of file contents. The hash
+// only detects changes, so it needs no cryptographic strength; CRC-32C is
+// hardware accelerated on amd64 and arm64 and much cheaper than MD5.
 func (w *Watcher) computeFileHash(filePath string) (string, error) {
 	f, err := os.Open(filePath)
 	if err != nil {
@@ -211,43 +366,96 @@ func (w *Watcher) computeFileHash(filePath string) (string, error) {
 	}
 	defer f.Close()
 
-	h := md5.New()
-	if _, err := io.Copy(h, f); err != nil {
-		return "", err
+	// Stream the file through a pooled buffer. io.Copy would allocate a
+	// fresh buffer per call, since *os.File's WriteTo falls back to it.
+	bufp := hashBuffers.Get().(*[]byte)
+	defer hashBuffers.Put(bufp)
+	buf := *bufp
+
+	h := crc32.New(crc32cTable)
+	for {
+		n, err := f.Read(buf)
+		h.Write(buf[:n])
+		if err == io.EOF {
+			break
+		}
+		if err != nil {
+			return "", err
+		}
 	}
 
 	return hex.EncodeToString(h.Sum(nil)), nil
 }
 
-// hasContentChanged checks if file content has changed since last index.
-func (w *Watcher) hasContentChanged(filePath string) bool {
-	currentHash, err := w.computeFileHash(filePath)
+// statFileHash stats a file and returns its hash record. The stored hash is
+// reused when size and modification time are unchanged; otherwise the file
+// is hashed.
+func (w *Watcher) statFileHash(filePath string) (fileHash, error) {
+	info, err := os.Stat(filePath)
 	if err != nil {
-		// If we can't compute hash, assume changed
-		return true
+		return fileHash{}, err
 	}
 
 	w.hashMu.RLock()
-	storedHash, exists := w.fileHashes[filePath]
+	stored, exists := w.fileHashes[filePath]
 	w.hashMu.RUnlock()
 
-	if !exists {
-		return true
+	if exists && stored.matches(info) {
+		return stored, nil
 	}
 
-	return currentHash != storedHash
+	hash, err := w.computeFileHash(filePath)
+	if err != nil {
+		return fileHash{}, err
+	}
+	return fileHash{ModTime: info.ModTime().UnixNano(), Size: info.Size(), Hash: hash}, nil
 }
 
-// updateFileHash stores the current hash for a file.
-func (w *Watcher) updateFileHash(filePath string) {
+// hasContentChanged checks if file content has changed since last index.
+// It also returns the file's current hash record so the caller can store
+// it once the change is indexed without hashing the file a second time.
+// The record is empty if the file could not be read.
+func (w *Watcher) hasContentChanged(filePath string) (fileHash, bool) {
+	info, err := os.Stat(filePath)
+	if err != nil {
+		// If we can't stat the file, assume changed
+		return fileHash{}, true
+	}
+
+	w.hashMu.RLock()
+	stored, exists := w.fileHashes[filePath]
+	w.hashMu.RUnlock()
+
+	if exists && stored.matches(info) {
+		return stored, false
+	}
+
 	hash, err := w.computeFileHash(filePath)
 	if err != nil {
-		return
+		// If we can't compute hash, assume changed
+		return fileHash{}, true
+	}
+	current := fileHash{ModTime: info.ModTime().UnixNano(), Size: info.Size(), Hash: hash}
+	return current, !exists || hash != stored.Hash
+}
+
+// updateFileHash stores the hash record for a file. A record already
+// computed for this change is stored as is; an empty one means the file is
+// hashed now.
+func (w *Watcher) updateFileHash(filePath string, current fileHash) {
+	if current.Hash == "" {
+		var err error
+		current, err = w.statFileHash(filePath)
+		if err != nil {
+			return
+		}
 	}
 
 	w.hashMu.Lock()
-	w.fileHashes[filePath] = hash
+	w.fileHashes[filePath] = current
 	w.hashMu.Unlock()
+
+	w.saveFileHashes()
 }
 
 // clearFileHash removes the stored hash for a file.
@@ -255,6 +463,116 @@ func (w *Watcher) clearFileHash(filePath string) {
 	w.hashMu.Lock()
 	delete(w.fileHashes, filePath)
 	w.hashMu.Unlock()
+
+	w.saveFileHashes()
+}
+
+// loadFileHashes restores hashes persisted by a previous run. A missing or
+// unreadable cache just means every file is hashed again.
+// MD5 hashes written by earlier versions are kept: they still serve files
+// whose size and modification time are unchanged, and never equal a
+// CRC-32C hash, so a file touched since is reindexed once.
+func (w *Watcher) loadFileHashes() {
+	if w.dbPath == "" {
+		return
+	}
+
+	data, err := os.ReadFile(filepath.Join(w.dbPath, hashCacheFile))
+	if err != nil {
+		return
+	}
+
+	hashes := make(map[string]fileHash)
+	if err := json.Unmarshal(data, &hashes); err != nil {
+		w.logger.Warn("ignoring unreadable file hash cache", "error", err)
+		return
+	}
+
+	w.hashMu.Lock()
+	w.fileHashes = hashes
+	w.hashMu.Unlock()
+}
+
+// saveFileHashes persists the current hashes. The cache is written to a
+// temporary file and renamed into place so readers never see a partial file.
+func (w *Watcher) saveFileHashes() {
+	if w.dbPath == "" {
+		return
+	}
+
+	w.saveMu.Lock()
+	defer w.saveMu.Unlock()
+
+	w.hashMu.RLock()
+	data, err := json.Marshal(w.fileHashes)
+	w.hashMu.RUnlock()
+	if err != nil {
+		w.logger.Error("failed to encode file hash cache", "error", err)
+		return
+	}
+
+	if err := os.MkdirAll(w.dbPath, 0755); err != nil {
+		w.logger.Error("failed to create database directory", "error", err)
+		return
+	}
+
+	tmp, err := os.CreateTemp(w.dbPath, hashCacheFile+".*.tmp")
+	if err != nil {
+		w.logger.Error("failed to write file hash cache", "error", err)
+		return
+	}
+	_, writeErr := tmp.Write(data)
+	closeErr := tmp.Close()
+	if writeErr == nil {
+		writeErr = closeErr
+	}
+	if writeErr == nil {
+		writeErr = os.Rename(tmp.Name(), filepath.Join(w.dbPath, hashCacheFile))
+	}
+	if writeErr != nil {
+		os.Remove(tmp.Name())
+		w.logger.Error("failed to write file hash cache", "error", writeErr)
+	}
+}
+
+// hashWorkers bounds how many files hashFiles reads concurrently.
+const hashWorkers = 8
+
+// hashFiles returns hash records for the given files, hashing them in
+// parallel. Files that cannot be read are left out.
+func (w *Watcher) hashFiles(files []string) map[string]fileHash {
+	results := make([]fileHash, len(files))
+	errs := make([]error, len(files))
+
+	workers := hashWorkers
+	if workers > len(files) {
+		workers = len(files)
+	}
+
+	indexes := make(chan int)
+	var wg sync.WaitGroup
+	for i := 0; i < workers; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for j := range indexes {
+				results[j], errs[j] = w.statFileHash(files[j])
+			}
+		}()
+	}
+	for j := range files {
+		indexes <- j
+	}
+	close(indexes)
+	wg.Wait()
+
+	hashes := make(map[string]fileHash, len(files))
+	for j, path := range files {
+		if errs[j] == nil {
+			hashes[path] = results[j]
+		}
+	}
+	return hashes
 }
 
 // markProcessing marks a file as currently being processed.
@@ -281,7 +599,10 @@ func (w *Watcher) unmarkProcessing(filePath string) {
 func (w *Watcher) handleFileChange(ctx context.Context, filePath string) {
 	// Check if already being processed (prevent concurrent processing of same file)
 	if !w.markProcessing(filePath) {
-		w.logger.Debug("file already being processed, skipping", "path", filePath)
+		// Another worker is mid-way through an older version; try again
+		// once it is done rather than dropping this change
+		w.logger.Debug("file already being processed, requeueing", "path", filePath)
+		w.queueChange(filePath, time.Now())
 		return
 	}
 	defer w.unmarkProcessing(filePath)
@@ -302,35 +623,33 @@ func (w *Watcher) handleFileChange(ctx context.Context, filePath string) {
 
 	// If file was deleted, remove chunks and hash
 	if !fileExists {
-		if err := w.db.DeleteChunksByFile(ctx, filePath); err != nil {
-			w.logger.Error("failed to delete chunks", "path", filePath, "error", err)
-		}
+		w.deleteChunks(ctx, filePath)
 		w.clearFileHash(filePath)
 		w.logger.Info("file deleted, chunks removed", "path", filePath)
 		return
 	}
 
-	// Check if content has actually changed
-	if !w.hasContentChanged(filePath) {
+	// Check if content has actually changed. The hash is taken before
+	// parsing, so an edit that lands while indexing still shows up as a
+	// change next time.
+	current, changed := w.hasContentChanged(filePath)
+	if !changed {
 		w.logger.Debug("file content unchanged, skipping", "path", filePath)
 		return
 	}
 
-	// Delete existing chunks for this file
-	if err := w.db.DeleteChunksByFile(ctx, filePath); err != nil {
-		w.logger.Error("failed to delete chunks", "path", filePath, "error", err)
-	}
-
 	// Parse the file
 	chunks, err := w.parser.ParseFile(filePath)
 	if err != nil {
 		w.logger.Error("failed to parse file", "path", filePath, "error", err)
+		w.deleteChunks(ctx, filePath)
 		return
 	}
 
 	if len(chunks) == 0 {
 		// Update hash even if no chunks (file may be empty or non-indexable)
-		w.updateFileHash(filePath)
+		w.deleteChunks(ctx, filePath)
+		w.updateFileHash(filePath, current)
 		return
 	}
 
@@ -351,19 +670,45 @@ func (w *Watcher) handleFileChange(ctx context.Context, filePath string) {
 		}
 	}
 
-	// Index chunks
-	if err := w.db.IndexChunks(ctx, chunks); err != nil {
+	// Replace the file's existing chunks. This happens after parsing and
+	// embedding so the old chunks stay searchable while those run.
+	w.dbMu.Lock()
+	if err := w.db.DeleteChunksByFile(ctx, filePath); err != nil {
+		w.logger.Error("failed to delete chunks", "path", filePath, "error", err)
+	}
+	err = w.db.IndexChunks(ctx, chunks)
+	w.dbMu.Unlock()
+	if err != nil {
 		w.logger.Error("failed to index chunks", "path", filePath, "error", err)
 		return
 	}
 
 	// Update file hash after successful indexing
-	w.updateFileHash(filePath)
+	w.updateFileHash(filePath, current)
 
 	w.logger.Info("reindexed file", "path", filePath, "chunks", len(chunks))
 }
 
+// deleteChunks removes a file's chunks from the database.
+func (w *Watcher) deleteChunks(ctx context.Context, filePath string) {
+	w.dbMu.Lock()
+	defer w.dbMu.Unlock()
+
+	if err := w.db.DeleteChunksByFile(ctx, filePath); err != nil {
+		w.logger.Error("failed to delete chunks", "path", filePath, "error", err)
+	}
+}
+
+// handleConfigChange re-evaluates CONFIG.md and writes the resulting space
+// config. Evaluation runs the page's space-lua through Deno, so it is
+// skipped when the page's content hash shows it has not changed.
 func (w *Watcher) handleConfigChange(ctx context.Context, filePath string) {
+	current, changed := w.hasContentChanged(filePath)
+	if !changed {
+		w.logger.Debug("CONFIG.md unchanged, skipping", "path", filePath)
+		return
+	}
+
 	content, err := os.ReadFile(filePath)
 	if err != nil {
 		w.logger.Error("failed to read CONFIG.md", "error", err)
@@ -380,6 +725,7 @@ func (w *Watcher) handleConfigChange(ctx context.Context, filePath string) {
 		w.logger.Error("failed to write config JSON", "error", err)
 		return
 	}
+	w.updateFileHash(filePath, current)
 
 	w.logger.Info("updated space config", "keys", len(cfg))
 }
@@ -394,8 +740,8 @@ func (w *Watcher) InitialIndex(ctx context.Context, rebuild bool) (int, error) {
 		}
 	}
 
-	// Parse the space
-	chunks, err := w.parser.ParseSpace(w.spacePath)
+	// Parse the space, collecting its folders in the same walk
+	chunks, folders, err := w.parser.ParseSpaceWithFolders(w.spacePath)
 	if err != nil {
 		return 0, err
 	}
@@ -403,21 +749,11 @@ func (w *Watcher) InitialIndex(ctx context.Context, rebuild bool) (int, error) {
 	w.logger.Info("parsed space", "chunks", len(chunks))
 
 	// Index folders
-	folderPaths, err := w.parser.GetFolderPaths(w.spacePath)
-	if err != nil {
+	if err := w.db.IndexFolders(ctx, folders.Paths, folders.IndexPages); err != nil {
 		return 0, err
 	}
 
-	indexPages, err := w.parser.GetFolderIndexPages(w.spacePath)
-	if err != nil {
-		return 0, err
-	}
-
-	if err := w.db.IndexFolders(ctx, folderPaths, indexPages); err != nil {
-		return 0, err
-	}
-
-	w.logger.Info("indexed folders", "count", len(folderPaths))
+	w.logger.Info("indexed folders", "count", len(folders.Paths))
 
 	// Generate embeddings
 	if w.db.EnableEmbeddings() && w.embedding != nil {
@@ -441,18 +777,22 @@ func (w *Watcher) InitialIndex(ctx context.Context, rebuild bool) (int, error) {
 		return 0, err
 	}
 
-	// Populate file hash cache for all indexed files
-	w.hashMu.Lock()
+	// Populate file hash cache for all indexed files. Files whose size and
+	// modification time match the persisted cache are not rehashed, and
+	// entries for files no longer in the space are dropped.
 	seenFiles := make(map[string]bool)
+	var files []string
 	for _, chunk := range chunks {
 		if !seenFiles[chunk.FilePath] {
 			seenFiles[chunk.FilePath] = true
-			if hash, err := w.computeFileHash(chunk.FilePath); err == nil {
-				w.fileHashes[chunk.FilePath] = hash
-			}
+			files = append(files, chunk.FilePath)
 		}
 	}
+	hashes := w.hashFiles(files)
+	w.hashMu.Lock()
+	w.fileHashes = hashes
 	w.hashMu.Unlock()
+	w.saveFileHashes()
 
 	w.logger.Info("cached file hashes", "count", len(seenFiles))
 
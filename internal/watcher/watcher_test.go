@@ -2,8 +2,13 @@ package watcher
 
 import (
 	"context"
+	"encoding/hex"
+	"encoding/json"
+	"hash/crc32"
+	"log/slog"
 	"os"
 	"path/filepath"
+	"strings"
 	"testing"
 	"time"
 
@@ -12,11 +17,7 @@ import (
 
 func createTempDB(t *testing.T) (*db.GraphDB, string) {
 	t.Helper()
-	tmpDir, err := os.MkdirTemp("", "watcher-test-db-*")
-	if err != nil {
-		t.Fatalf("failed to create temp dir: %v", err)
-	}
-	t.Cleanup(func() { os.RemoveAll(tmpDir) })
+	tmpDir := t.TempDir()
 
 	dbPath := filepath.Join(tmpDir, "test.db")
 	graphDB, err := db.Open(db.Config{
@@ -34,11 +35,7 @@ func createTempDB(t *testing.T) (*db.GraphDB, string) {
 
 func createTempSpace(t *testing.T) string {
 	t.Helper()
-	tmpDir, err := os.MkdirTemp("", "watcher-test-space-*")
-	if err != nil {
-		t.Fatalf("failed to create temp dir: %v", err)
-	}
-	t.Cleanup(func() { os.RemoveAll(tmpDir) })
+	tmpDir := t.TempDir()
 
 	// Create some test markdown files
 	testFile := filepath.Join(tmpDir, "test.md")
@@ -120,15 +117,16 @@ func TestWatcherStartStop(t *testing.T) {
 		t.Fatalf("Start() failed: %v", err)
 	}
 
-	// Give it a moment to start
-	time.Sleep(50 * time.Millisecond)
-
 	if err := w.Stop(); err != nil {
 		t.Errorf("Stop() failed: %v", err)
 	}
 }
 
 func TestInitialIndex(t *testing.T) {
+	if testing.Short() {
+		t.Skip("skipping full index test in short mode")
+	}
+
 	graphDB, dbPath := createTempDB(t)
 	spacePath := createTempSpace(t)
 
@@ -154,6 +152,10 @@ func TestInitialIndex(t *testing.T) {
 }
 
 func TestInitialIndexWithRebuild(t *testing.T) {
+	if testing.Short() {
+		t.Skip("skipping full index test in short mode")
+	}
+
 	graphDB, dbPath := createTempDB(t)
 	spacePath := createTempSpace(t)
 
@@ -193,7 +195,231 @@ func TestFileChangeDetection(t *testing.T) {
 	t.Skip("Skipping file change detection test due to CGO concurrency issues")
 }
 
+func TestComputeFileHashSpansBuffers(t *testing.T) {
+	spacePath := createTempSpace(t)
+
+	// Larger than one read buffer so the hash is fed in several pieces
+	content := strings.Repeat("# Heading\n\nSome body text.\n", 10000)
+	path := filepath.Join(spacePath, "large.md")
+	if err := os.WriteFile(path, []byte(content), 0644); err != nil {
+		t.Fatalf("failed to write file: %v", err)
+	}
+
+	got, err := (&Watcher{}).computeFileHash(path)
+	if err != nil {
+		t.Fatalf("computeFileHash failed: %v", err)
+	}
+
+	sum := crc32.New(crc32.MakeTable(crc32.Castagnoli))
+	sum.Write([]byte(content))
+	if want := hex.EncodeToString(sum.Sum(nil)); got != want {
+		t.Errorf("hash mismatch: got %s, want %s", got, want)
+	}
+}
+
+func TestFileHashCachePersistsAndSkipsUnchangedFiles(t *testing.T) {
+	spacePath := createTempSpace(t)
+	dbPath := t.TempDir()
+	path := filepath.Join(spacePath, "test.md")
+
+	w := &Watcher{dbPath: dbPath, logger: slog.Default(), fileHashes: make(map[string]fileHash)}
+	w.updateFileHash(path, fileHash{})
+
+	// A fresh watcher picks the hashes up from disk
+	restarted := &Watcher{dbPath: dbPath, logger: slog.Default(), fileHashes: make(map[string]fileHash)}
+	restarted.loadFileHashes()
+	stored, ok := restarted.fileHashes[path]
+	if !ok {
+		t.Fatal("expected persisted hash to be loaded")
+	}
+	if _, changed := restarted.hasContentChanged(path); changed {
+		t.Error("expected unchanged file to be reported unchanged")
+	}
+
+	// Matching size and mtime short-circuit hashing entirely
+	stored.Hash = "stale"
+	restarted.fileHashes[path] = stored
+	if _, changed := restarted.hasContentChanged(path); changed {
+		t.Error("expected stat match to skip rehashing")
+	}
+
+	if err := os.WriteFile(path, []byte("# Edited\n\nLonger content than before, so the size changes.\n"), 0644); err != nil {
+		t.Fatalf("failed to edit file: %v", err)
+	}
+	if _, changed := restarted.hasContentChanged(path); !changed {
+		t.Error("expected edited file to be reported changed")
+	}
+}
+
+func TestLoadFileHashesKeepsMD5Hashes(t *testing.T) {
+	spacePath := createTempSpace(t)
+	dbPath := t.TempDir()
+	path := filepath.Join(spacePath, "test.md")
+	info, err := os.Stat(path)
+	if err != nil {
+		t.Fatalf("failed to stat file: %v", err)
+	}
+
+	// A cache entry written by a version that hashed with MD5
+	cache, err := json.Marshal(map[string]fileHash{path: {
+		ModTime: info.ModTime().UnixNano(),
+		Size:    info.Size(),
+		Hash:    "0cc175b9c0f1b6a831c399e269772661",
+	}})
+	if err != nil {
+		t.Fatalf("failed to encode hash cache: %v", err)
+	}
+	if err := os.WriteFile(filepath.Join(dbPath, hashCacheFile), cache, 0644); err != nil {
+		t.Fatalf("failed to write hash cache: %v", err)
+	}
+
+	w := &Watcher{dbPath: dbPath, logger: slog.Default(), fileHashes: make(map[string]fileHash)}
+	w.loadFileHashes()
+	if _, changed := w.hasContentChanged(path); changed {
+		t.Error("expected an unchanged file with an MD5 hash not to be reindexed")
+	}
+
+	// Once the file is touched its hash is recomputed and can never match
+	later := info.ModTime().Add(time.Second)
+	if err := os.Chtimes(path, later, later); err != nil {
+		t.Fatalf("failed to touch file: %v", err)
+	}
+	if _, changed := w.hasContentChanged(path); !changed {
+		t.Error("expected a touched file with an MD5 hash to be reindexed")
+	}
+}
+
+func TestHasContentChangedSameSizeEdit(t *testing.T) {
+	spacePath := createTempSpace(t)
+	path := filepath.Join(spacePath, "note.md")
+	if err := os.WriteFile(path, []byte("# Title\n\ncolour\n"), 0644); err != nil {
+		t.Fatalf("failed to write file: %v", err)
+	}
+
+	w := &Watcher{fileHashes: make(map[string]fileHash)}
+	w.updateFileHash(path, fileHash{})
+
+	// Same length, different bytes, later modification time
+	if err := os.WriteFile(path, []byte("# Title\n\ncolor!\n"), 0644); err != nil {
+		t.Fatalf("failed to edit file: %v", err)
+	}
+	later := time.Now().Add(time.Second)
+	if err := os.Chtimes(path, later, later); err != nil {
+		t.Fatalf("failed to set mtime: %v", err)
+	}
+
+	current, changed := w.hasContentChanged(path)
+	if !changed {
+		t.Error("expected same-size edit to be detected by hashing")
+	}
+	want, err := w.computeFileHash(path)
+	if err != nil {
+		t.Fatalf("computeFileHash failed: %v", err)
+	}
+	if current.Hash != want {
+		t.Errorf("expected the edited file's hash to be returned, got %q want %q", current.Hash, want)
+	}
+
+	// Touching the file without changing it is not a change
+	w.updateFileHash(path, current)
+	touched := later.Add(time.Second)
+	if err := os.Chtimes(path, touched, touched); err != nil {
+		t.Fatalf("failed to set mtime: %v", err)
+	}
+	if _, changed := w.hasContentChanged(path); changed {
+		t.Error("expected touched but unchanged file to be reported unchanged")
+	}
+}
+
+func TestHashFilesMatchesSequentialHashing(t *testing.T) {
+	spacePath := createTempSpace(t)
+
+	files := []string{filepath.Join(spacePath, "missing.md")}
+	for _, name := range []string{"a", "b", "c", "d", "e", "f", "g", "h", "i", "j"} {
+		path := filepath.Join(spacePath, name+".md")
+		if err := os.WriteFile(path, []byte("# "+name+"\n"), 0644); err != nil {
+			t.Fatalf("failed to write file: %v", err)
+		}
+		files = append(files, path)
+	}
+
+	w := &Watcher{fileHashes: make(map[string]fileHash)}
+	hashes := w.hashFiles(files)
+
+	if len(hashes) != len(files)-1 {
+		t.Errorf("expected %d hashes (missing file skipped), got %d", len(files)-1, len(hashes))
+	}
+	for _, path := range files[1:] {
+		want, err := w.computeFileHash(path)
+		if err != nil {
+			t.Fatalf("computeFileHash failed: %v", err)
+		}
+		if hashes[path].Hash != want {
+			t.Errorf("%s: got %s, want %s", path, hashes[path].Hash, want)
+		}
+	}
+}
+
+func TestDebounceQueueCoalescesChanges(t *testing.T) {
+	w := &Watcher{
+		debounce: 100 * time.Millisecond,
+		pending:  make(map[string]time.Time),
+		wake:     make(chan struct{}, 1),
+	}
+	start := time.Now()
+
+	w.queueChange("a.md", start)
+	w.queueChange("b.md", start.Add(10*time.Millisecond))
+	// A second change to a.md restarts its debounce window
+	w.queueChange("a.md", start.Add(50*time.Millisecond))
+
+	ready, wait := w.takeReady(start.Add(50 * time.Millisecond))
+	if len(ready) != 0 {
+		t.Errorf("expected nothing due yet, got %v", ready)
+	}
+	if wait != 60*time.Millisecond {
+		t.Errorf("expected to wait 60ms for b.md, got %v", wait)
+	}
+
+	ready, _ = w.takeReady(start.Add(120 * time.Millisecond))
+	if len(ready) != 1 || ready[0] != "b.md" {
+		t.Errorf("expected only b.md to be due, got %v", ready)
+	}
+
+	ready, wait = w.takeReady(start.Add(200 * time.Millisecond))
+	if len(ready) != 1 || ready[0] != "a.md" {
+		t.Errorf("expected a.md to be due once, got %v", ready)
+	}
+	if wait >= 0 || len(w.pending) != 0 || len(w.queue) != 0 {
+		t.Errorf("expected queue to be drained, wait=%v pending=%d queue=%d", wait, len(w.pending), len(w.queue))
+	}
+}
+
+func TestIsIndexablePath(t *testing.T) {
+	tests := []struct {
+		path string
+		want bool
+	}{
+		{"/space/notes.md", true},
+		{"/space/Projects/plan.md", true},
+		{"/space/notes.md.proposal", false},
+		{"/space/notes.rejected.md", false},
+		{"/space/_Proposals/notes.md", false},
+		{"/space/image.png", false},
+		{"/space/Projects", false},
+	}
+	for _, tt := range tests {
+		if got := isIndexablePath(tt.path); got != tt.want {
+			t.Errorf("isIndexablePath(%q) = %v, want %v", tt.path, got, tt.want)
+		}
+	}
+}
+
 func TestSkipsProposalFiles(t *testing.T) {
+	if testing.Short() {
+		t.Skip("skipping full index test in short mode")
+	}
+
 	graphDB, dbPath := createTempDB(t)
 	spacePath := createTempSpace(t)
 
@@ -238,6 +464,10 @@ func TestSkipsProposalFiles(t *testing.T) {
 }
 
 func TestSkipsHiddenDirectories(t *testing.T) {
+	if testing.Short() {
+		t.Skip("skipping full index test in short mode")
+	}
+
 	graphDB, dbPath := createTempDB(t)
 	spacePath := createTempSpace(t)
 
@@ -270,9 +500,7 @@ func TestSkipsHiddenDirectories(t *testing.T) {
 	}
 
 	// Check that the hidden directory is not watched
-	// The watcher should have skipped it during Start()
-	time.Sleep(50 * time.Millisecond)
-
+	// The watcher skipped it synchronously during Start()
 	// This is a bit tricky to test directly, but we can verify
 	// that the initial index doesn't include hidden files
 	_, err = w.InitialIndex(ctx, false)
@@ -291,6 +519,10 @@ func TestSkipsHiddenDirectories(t *testing.T) {
 }
 
 func TestConfigMDHandling(t *testing.T) {
+	if testing.Short() {
+		t.Skip("skipping full index test in short mode")
+	}
+
 	graphDB, dbPath := createTempDB(t)
 	spacePath := createTempSpace(t)
 
@@ -330,6 +562,49 @@ func TestConfigMDHandling(t *testing.T) {
 	}
 }
 
+func TestConfigChangeSkipsUnchangedContent(t *testing.T) {
+	spacePath := createTempSpace(t)
+	dbPath := t.TempDir()
+	configPath := filepath.Join(spacePath, "CONFIG.md")
+	configJSONPath := filepath.Join(dbPath, "space_config.json")
+	if err := os.WriteFile(configPath, []byte("```space-lua\nconfig.set(\"a\", 1)\n```\n"), 0644); err != nil {
+		t.Fatalf("failed to write CONFIG.md: %v", err)
+	}
+
+	w := &Watcher{dbPath: dbPath, logger: slog.Default(), fileHashes: make(map[string]fileHash)}
+	ctx := context.Background()
+
+	w.handleConfigChange(ctx, configPath)
+	if _, err := os.Stat(configJSONPath); err != nil {
+		t.Fatalf("expected config JSON to be written: %v", err)
+	}
+
+	// Unchanged content is not evaluated again
+	if err := os.Remove(configJSONPath); err != nil {
+		t.Fatalf("failed to remove config JSON: %v", err)
+	}
+	w.handleConfigChange(ctx, configPath)
+	if _, err := os.Stat(configJSONPath); !os.IsNotExist(err) {
+		t.Error("expected unchanged CONFIG.md to be skipped")
+	}
+
+	if err := os.WriteFile(configPath, []byte("```space-lua\nconfig.set(\"a\", 2)\n```\n"), 0644); err != nil {
+		t.Fatalf("failed to edit CONFIG.md: %v", err)
+	}
+	later := time.Now().Add(time.Second)
+	if err := os.Chtimes(configPath, later, later); err != nil {
+		t.Fatalf("failed to set mtime: %v", err)
+	}
+	w.handleConfigChange(ctx, configPath)
+	data, err := os.ReadFile(configJSONPath)
+	if err != nil {
+		t.Fatalf("expected edited CONFIG.md to be evaluated: %v", err)
+	}
+	if !strings.Contains(string(data), `"a": 2`) {
+		t.Errorf("expected updated config, got %s", data)
+	}
+}
+
 func TestFileDeletion(t *testing.T) {
 	// Skip this test as it requires concurrent database access which can cause
 	// issues with the LadybugDB CGO library in test environments
@@ -337,6 +612,10 @@ func TestFileDeletion(t *testing.T) {
 }
 
 func TestNestedDirectoryWatching(t *testing.T) {
+	if testing.Short() {
+		t.Skip("skipping full index test in short mode")
+	}
+
 	graphDB, dbPath := createTempDB(t)
 	spacePath := createTempSpace(t)
 
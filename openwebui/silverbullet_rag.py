@@ -8,11 +8,21 @@ license: MIT
 """
 
 import json
+import threading
+import time
+from collections import OrderedDict
 from typing import Any, Dict, Generator, Iterator, List, Optional, Union
 
 import grpc
 from pydantic import BaseModel, Field
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+
 # =============================================================================
 # Embedded protobuf stubs (generated from proto/rag.proto)
 # =============================================================================
@@ -171,6 +181,9 @@ class Pipe:
       the corresponding Silverbullet folder
     """
 
+    # Maximum number of distinct searches kept in the result cache
+    SEARCH_CACHE_SIZE = 256
+
     class Valves(BaseModel):
         """Configuration valves for the pipe (admin settings)."""
 
@@ -188,6 +201,10 @@ class Pipe:
             default=True,
             description="Enable folder-to-page mapping via openwebui-folder frontmatter",
         )
+        SEARCH_CACHE_TTL: int = Field(
+            default=60,
+            description="Seconds to reuse results for a repeated search (0 = disabled)",
+        )
 
     class UserValves(BaseModel):
         """Per-user configurable settings."""
@@ -229,6 +246,10 @@ class Pipe:
         self._stub = None
         # Cache folder context per chat to avoid repeated lookups
         self._folder_context_cache: Dict[str, Dict[str, Any]] = {}
+        # Recent search results keyed by request parameters, least recent first
+        self._search_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # Pipe calls run on a thread pool, so cache access is serialized
+        self._search_cache_lock = threading.Lock()
 
     def _ensure_connected(self):
         """Lazy initialization of gRPC connection."""
@@ -288,19 +309,37 @@ class Pipe:
 
         return "/".join(path_parts) if path_parts else folder_id
 
-    def _get_folder_context(self, folder_path: str) -> Optional[Dict[str, Any]]:
-        """Fetch folder context from the gRPC server.
+    def _start_folder_context(self, folder_path: str) -> Optional[Any]:
+        """Start a non-blocking folder context lookup on the gRPC server.
 
         Args:
             folder_path: Open WebUI folder path
 
         Returns:
-            Dict with page_name, page_content, folder_scope if found, else None
+            A gRPC future for the lookup, or None if it could not be started
         """
         try:
-            response = self._stub.GetFolderContext(
+            return self._stub.GetFolderContext.future(
                 GetFolderContextRequest(folder_path=folder_path)
             )
+        except Exception as e:
+            print(f"GetFolderContext error: {e}")
+        return None
+
+    def _get_folder_context(self, lookup: Optional[Any]) -> Optional[Dict[str, Any]]:
+        """Wait for a folder context lookup started by _start_folder_context.
+
+        Args:
+            lookup: gRPC future returned by _start_folder_context
+
+        Returns:
+            Dict with page_name, page_content, folder_scope if found, else None
+        """
+        if lookup is None:
+            return None
+
+        try:
+            response = lookup.result()
 
             if response.success and response.found:
                 return {
@@ -342,7 +381,7 @@ class Pipe:
         """
         if not value:
             return []
-        return [v.strip() for v in value.split(",") if v.strip()]
+        return [v for v in (part.strip() for part in value.split(",")) if v]
 
     def _truncate_text(self, text: str, max_chars: int) -> str:
         """Truncate text to max characters, ending at word boundary.
@@ -407,14 +446,15 @@ class Pipe:
 
         try:
             # Check for folder context (only on first lookup per chat)
+            folder_lookup = None
             if self.valves.ENABLE_FOLDER_CONTEXT:
                 if chat_id not in self._folder_context_cache:
                     folder_path = self._get_folder_path(body)
                     if folder_path:
-                        folder_context = self._get_folder_context(folder_path)
-                        self._folder_context_cache[chat_id] = folder_context or {
-                            "_checked": True
-                        }
+                        # Resolved after the search so both calls run concurrently
+                        folder_lookup = self._start_folder_context(folder_path)
+                        if folder_lookup is None:
+                            self._folder_context_cache[chat_id] = {"_checked": True}
                     else:
                         self._folder_context_cache[chat_id] = {"_checked": True}
                 else:
@@ -429,9 +469,25 @@ class Pipe:
             include_paths = self._parse_comma_list(uv.include_paths)
             include_tags = self._parse_comma_list(uv.include_tags)
 
-            # Perform search with scope mode handling
-            search_results = self._perform_search(
+            # Perform search; a pending folder lookup may still add a scope
+            results = self._perform_search(
                 query=user_message,
+                scoped=bool(folder_scope) or folder_lookup is not None,
+                scope_mode=uv.scope_mode,
+                include_tags=include_tags,
+            )
+
+            if folder_lookup is not None:
+                folder_context = self._get_folder_context(folder_lookup)
+                self._folder_context_cache[chat_id] = folder_context or {
+                    "_checked": True
+                }
+                if folder_context:
+                    folder_scope = folder_context.get("folder_scope")
+
+            # Apply scope mode handling
+            search_results = self._apply_scope(
+                results,
                 scope=folder_scope,
                 scope_mode=uv.scope_mode,
                 include_paths=include_paths,
@@ -507,99 +563,81 @@ Use this information to provide more informed and personalized responses. Refere
     def _perform_search(
         self,
         query: str,
-        scope: Optional[str] = None,
+        scoped: bool = False,
         scope_mode: str = "prefer",
-        include_paths: Optional[List[str]] = None,
         include_tags: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
-        """Perform search with scope mode and include filters.
+        """Fetch search results, over-fetching when they will be scope filtered.
 
         Args:
             query: Search query
-            scope: Optional folder path to scope results
-            scope_mode: How to handle scoping ('strict', 'prefer', 'none')
-            include_paths: Additional paths to always include
+            scoped: Whether results may be filtered to a folder scope
+            scope_mode: How scoping will be handled ('strict', 'prefer', 'none')
             include_tags: Tags to always include regardless of scope
 
         Returns:
-            List of search results
+            List of search results before scope filtering
         """
-        include_paths = include_paths or []
-        include_tags = include_tags or []
-
         try:
             # Request more results if we need to filter/reorder
             fetch_limit = self.valves.MAX_RESULTS
-            if scope and scope_mode in ("strict", "prefer"):
+            if scoped and scope_mode in ("strict", "prefer"):
                 fetch_limit = self.valves.MAX_RESULTS * 3  # Fetch extra for filtering
 
-            if self.valves.SEARCH_TYPE == "hybrid":
-                response = self._stub.HybridSearch(
-                    HybridSearchRequest(
-                        query=query,
-                        limit=fetch_limit,
-                        filter_tags=list(include_tags) if include_tags else [],
-                    )
-                )
-            elif self.valves.SEARCH_TYPE == "semantic":
-                response = self._stub.SemanticSearch(
-                    SemanticSearchRequest(
-                        query=query,
-                        limit=fetch_limit,
-                        filter_tags=list(include_tags) if include_tags else [],
-                    )
-                )
-            else:  # keyword
-                response = self._stub.Search(
-                    SearchRequest(
-                        keyword=query,
-                        limit=fetch_limit,
-                    )
-                )
+            return self._fetch_results(query, fetch_limit, include_tags or [])
+        except Exception as e:
+            print(f"Search error: {e}")
+
+        return []
+
+    def _apply_scope(
+        self,
+        results: List[Dict[str, Any]],
+        scope: Optional[str] = None,
+        scope_mode: str = "prefer",
+        include_paths: Optional[List[str]] = None,
+        include_tags: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Apply scope mode and include filters to search results.
+
+        Args:
+            results: Search results from _perform_search
+            scope: Optional folder path to scope results
+            scope_mode: How to handle scoping ('strict', 'prefer', 'none')
+            include_paths: Additional paths to always include
+            include_tags: Tags to always include regardless of scope
 
-            if not response.success:
-                print(f"RAG search error: {response.error}")
-                return []
+        Returns:
+            Filtered and ordered search results
+        """
+        if not results:
+            return []
 
-            results = json.loads(response.results_json)
-            if not results:
-                return []
+        include_paths = include_paths or []
+        include_tags = include_tags or []
 
+        try:
             # Apply scope mode filtering
             if scope_mode == "none" or not scope:
                 # No scoping - return results as-is
                 return results[: self.valves.MAX_RESULTS]
 
-            elif scope_mode == "strict":
+            placements = self._scope_placements(
+                results, scope, include_paths, include_tags
+            )
+
+            if scope_mode == "strict":
                 # Only scoped results + include_paths
-                filtered = []
-                for r in results:
-                    if self._result_in_scope(r, scope):
-                        filtered.append(r)
-                    elif self._result_in_include_paths(r, include_paths):
-                        filtered.append(r)
-                    elif self._result_has_include_tags(r, include_tags):
-                        filtered.append(r)
+                filtered = [r for r, p in zip(results, placements) if p < 2]
                 return filtered[: self.valves.MAX_RESULTS]
 
             else:  # prefer
-                # Scoped results first, then others
-                scoped = []
-                included = []
-                other = []
-
-                for r in results:
-                    if self._result_in_scope(r, scope):
-                        scoped.append(r)
-                    elif self._result_in_include_paths(r, include_paths):
-                        included.append(r)
-                    elif self._result_has_include_tags(r, include_tags):
-                        included.append(r)
-                    else:
-                        other.append(r)
+                buckets = ([], [], [])
+                for r, p in zip(results, placements):
+                    buckets[p].append(r)
 
                 # Combine: scoped first, then included, then others
-                combined = scoped + included + other
+                combined = buckets[0] + buckets[1] + buckets[2]
                 return combined[: self.valves.MAX_RESULTS]
 
         except Exception as e:
@@ -607,72 +645,127 @@ Use this information to provide more informed and personalized responses. Refere
 
         return []
 
-    def _result_in_scope(self, result: Dict[str, Any], scope: str) -> bool:
-        """Check if a search result is within the folder scope.
+    def _fetch_results(
+        self, query: str, fetch_limit: int, include_tags: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Run the configured search, reusing recent results for repeat queries.
 
         Args:
-            result: Search result dict
-            scope: Folder scope path
+            query: Search query
+            fetch_limit: Number of results to request
+            include_tags: Tags to pass as the search tag filter
 
         Returns:
-            True if result is in scope
+            Search results before scope filtering
         """
-        # Results are nested under 'col0' from the search response
-        chunk = result.get("col0", result)
-        file_path = chunk.get("file_path", "")
+        ttl = self.valves.SEARCH_CACHE_TTL
+        key = (self.valves.SEARCH_TYPE, query, fetch_limit, tuple(include_tags))
+        if ttl > 0:
+            with self._search_cache_lock:
+                cached = self._search_cache.get(key)
+                if cached and time.monotonic() - cached[0] < ttl:
+                    self._search_cache.move_to_end(key)
+                    return cached[1]
+
+        if self.valves.SEARCH_TYPE == "hybrid":
+            response = self._stub.HybridSearch(
+                HybridSearchRequest(
+                    query=query,
+                    limit=fetch_limit,
+                    filter_tags=list(include_tags) if include_tags else [],
+                )
+            )
+        elif self.valves.SEARCH_TYPE == "semantic":
+            response = self._stub.SemanticSearch(
+                SemanticSearchRequest(
+                    query=query,
+                    limit=fetch_limit,
+                    filter_tags=list(include_tags) if include_tags else [],
+                )
+            )
+        else:  # keyword
+            response = self._stub.Search(
+                SearchRequest(
+                    keyword=query,
+                    limit=fetch_limit,
+                )
+            )
 
-        # Normalize paths and check if file is in scope folder
-        # e.g., scope="Projects/MyProject", file="/space/Projects/MyProject/notes.md"
-        return scope.lower() in file_path.lower()
+        if not response.success:
+            print(f"RAG search error: {response.error}")
+            return []
 
-    def _result_in_include_paths(
-        self, result: Dict[str, Any], include_paths: List[str]
-    ) -> bool:
-        """Check if a search result is in one of the include paths.
+        results = _json_loads(response.results_json) or []
 
-        Args:
-            result: Search result dict
-            include_paths: List of folder paths to include
+        if ttl > 0:
+            with self._search_cache_lock:
+                self._search_cache[key] = (time.monotonic(), results)
+                self._search_cache.move_to_end(key)
+                while len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
 
-        Returns:
-            True if result is in any include path
-        """
-        if not include_paths:
-            return False
+        return results
+
+    @staticmethod
+    def _chunk_key(result: Dict[str, Any]) -> Optional[str]:
+        """Return the key a search result nests its chunk fields under.
 
-        chunk = result.get("col0", result)
-        file_path = chunk.get("file_path", "").lower()
+        The server wraps them under 'chunk'; raw Cypher rows use 'col0'.
+        Returns None when the fields sit on the result itself.
+        """
+        for key in ("chunk", "col0"):
+            if isinstance(result.get(key), dict):
+                return key
+        return None
 
-        for path in include_paths:
-            if path.lower() in file_path:
-                return True
-        return False
+    def _scope_placements(
+        self,
+        results: List[Dict[str, Any]],
+        scope: str,
+        include_paths: List[str],
+        include_tags: List[str],
+    ) -> List[int]:
+        """Place each search result relative to the folder scope.
 
-    def _result_has_include_tags(
-        self, result: Dict[str, Any], include_tags: List[str]
-    ) -> bool:
-        """Check if a search result has any of the include tags.
+        The chunk wrapper is resolved and the filter values are lowercased
+        once per call instead of once per result.
 
         Args:
-            result: Search result dict
-            include_tags: List of tags to include
+            results: Search result dicts
+            scope: Folder scope path
+            include_paths: Folder paths to include
+            include_tags: Tags to include
 
         Returns:
-            True if result has any include tag
+            One entry per result: 0 if in scope, 1 if pulled in by an
+            include path or tag, 2 otherwise
         """
-        if not include_tags:
-            return False
-
-        chunk = result.get("col0", result)
-        result_tags = chunk.get("tags", [])
-        if isinstance(result_tags, str):
-            result_tags = [result_tags]
+        key = self._chunk_key(results[0])
+        scope_lower = scope.lower()
+        paths_lower = [path.lower() for path in include_paths]
+        tags_lower = {tag.lower() for tag in include_tags}
+
+        placements = []
+        for result in results:
+            chunk = result.get(key, result) if key else result
+
+            # e.g., scope="Projects/MyProject", file="/space/Projects/MyProject/notes.md"
+            file_path = chunk.get("file_path", "").lower()
+            if scope_lower in file_path:
+                placements.append(0)
+                continue
+            if any(path in file_path for path in paths_lower):
+                placements.append(1)
+                continue
 
-        result_tags_lower = [t.lower() for t in result_tags]
-        for tag in include_tags:
-            if tag.lower() in result_tags_lower:
-                return True
-        return False
+            result_tags = chunk.get("tags", []) if tags_lower else []
+            if isinstance(result_tags, str):
+                result_tags = [result_tags]
+            if any(tag.lower() in tags_lower for tag in result_tags):
+                placements.append(1)
+            else:
+                placements.append(2)
+        return placements
 
     def _build_context(
         self,
@@ -697,13 +790,19 @@ Use this information to provide more informed and personalized responses. Refere
         seen_sources = set()
         total_chars = 0
 
+        # Every result in a response has the same shape, so work out where
+        # the chunk fields live once rather than on each row
+        key = self._chunk_key(results[0])
+
         for result in results[: self.valves.MAX_RESULTS]:
-            # Results are nested under 'col0' from the search response
-            chunk = result.get("col0", result)
+            chunk = result.get(key, result) if key else result
 
             content = chunk.get("content", "")
             header = chunk.get("header", "Unknown")
-            file_path = chunk.get("file_path", chunk.get("page", ""))
+            if "file_path" in chunk:
+                file_path = chunk["file_path"]
+            else:
+                file_path = chunk.get("page", "")
 
             # Skip if no content
             if not content: